@@ -0,0 +1,307 @@
+"""
+Benchmark reprodutível dos algoritmos de busca e do Algoritmo Genético.
+
+Gera mapas com semente fixa (mesma lógica de geração usada na interface),
+em vários tamanhos e densidades de obstáculos, executa cada algoritmo no
+modo rápido (sem visualização) e grava os resultados em JSON, para que
+execuções diferentes possam ser comparadas.
+
+Exemplos:
+    python benchmark.py --tamanhos 50 200 --saida base.json
+    python benchmark.py --tamanhos 50 200 --comparar base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from game.algoritmo_genetico import AlgoritmoGeneticoAStar
+from game.busca import Buscas
+from game.contexto import ContextoBusca
+from game.mapas import gerar_mapa_aleatorio
+from game.replanejamento import ReplanejadorLPA
+
+TAMANHOS_PADRAO = [50, 200, 500, 1000, 2000]
+DENSIDADES_PADRAO = [0.1, 0.3]
+ALGORITMOS_PADRAO = list(Buscas.ALGORITMOS_RAPIDOS)
+
+# Módulos do núcleo, que devem importar rápido e sem o pygame
+MODULOS_NUCLEO = ["game.grid", "game.busca", "game.algoritmo_genetico", "game.mapas", "game.arquivo_mapa"]
+
+_CODIGO_IMPORTACAO = """
+import sys, time
+inicio = time.perf_counter()
+for modulo in sys.argv[1:]:
+    __import__(modulo)
+print(time.perf_counter() - inicio, "pygame" in sys.modules)
+"""
+
+
+def medir_importacao(modulos: List[str] = MODULOS_NUCLEO) -> dict:
+    """
+    Mede a importação a frio dos módulos em um interpretador novo.
+
+    :return: Tempo de importação e se o pygame acabou sendo carregado
+    """
+    saida = subprocess.run(
+        [sys.executable, "-c", _CODIGO_IMPORTACAO, *modulos],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return {"tempo_s": float(saida[0]), "pygame_importado": saida[1] == "True"}
+
+
+def medir_busca(grid, algoritmo: str, repeticoes: int, memoria: bool) -> dict:
+    """
+    Executa um algoritmo várias vezes no mesmo grid e coleta as métricas.
+
+    As execuções cronometradas compartilham um ContextoBusca, como faria
+    quem consulta o mesmo mapa repetidamente; a de memória usa um novo.
+    Nos A*, uma execução extra mede o pico da fila aberta e os descartes.
+
+    :param grid: Grid já gerado
+    :param algoritmo: Nome do algoritmo (chave de Buscas.ALGORITMOS_RAPIDOS)
+    :param repeticoes: Quantas execuções cronometradas
+    :param memoria: Se True, faz uma execução extra sob tracemalloc
+    :return: Dicionário de métricas
+    """
+    tempos: List[float] = []
+    resultado = None
+    contexto = ContextoBusca(grid)
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = Buscas(grid, contexto=contexto).resolver(algoritmo)
+        tempos.append(time.perf_counter() - inicio)
+
+    pico_fila = descartes = None
+    if algoritmo.startswith("a_estrela") and "bidirecional" not in algoritmo:
+        busca = Buscas(grid, contexto=contexto)
+        busca.medir_fila = True
+        busca.resolver(algoritmo)
+        pico_fila, descartes = busca.pico_fila, busca.descartes
+
+    pico: Optional[int] = None
+    if memoria:
+        # execução separada: o tracemalloc distorce o tempo
+        tracemalloc.start()
+        Buscas(grid).resolver(algoritmo)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    tempo = statistics.median(tempos)
+    return {
+        "algoritmo": algoritmo,
+        "tempo_s": tempo,
+        "tempo_min_s": min(tempos),
+        "passos": resultado["passos"],
+        "visitados": resultado["visitados"],
+        "expansoes_por_s": resultado["passos"] / tempo if tempo > 0 else None,
+        "pico_memoria_bytes": pico,
+        "pico_fila": pico_fila,
+        "descartes": descartes,
+        "encontrado": resultado["encontrado"],
+        "comprimento": len(resultado["caminho"]),
+    }
+
+
+def medir_ag(grid, tamanho_pop: int, geracoes: int, semente: int) -> dict:
+    """
+    Executa o Algoritmo Genético completo (modo rápido) e coleta as métricas.
+    """
+    inicio = time.perf_counter()
+    with AlgoritmoGeneticoAStar(grid, tamanho_pop=tamanho_pop, geracoes=geracoes, semente=semente) as ag:
+        melhor = ag.executar_rapido()
+    tempo = time.perf_counter() - inicio
+
+    return {
+        "algoritmo": "ag",
+        "tempo_s": tempo,
+        "melhor_fitness": melhor["fitness"],
+        "melhor_w": melhor["w"],
+        "melhor_custo": melhor["custo"],
+        "taxa_acerto_cache": ag.cache.taxa_acerto,
+    }
+
+
+def medir_replanejamento(grid, edicoes: int, semente: int) -> dict:
+    """
+    Compara o LPA* com o A* refeito do zero: a cada rodada bloqueia uma
+    célula do caminho atual e replaneja pelos dois métodos.
+
+    O grid é alterado; use um grid descartável.
+    """
+    rng = random.Random(semente)
+    tempo_lpa = tempo_completo = 0.0
+    expansoes_lpa = expansoes_completo = 0
+    rodadas = 0
+
+    with ReplanejadorLPA(grid) as lpa:
+        lpa.replanejar()
+        for _ in range(edicoes):
+            caminho = lpa.caminho()[:-1]  # o objetivo não é bloqueado
+            if not caminho:
+                break
+            grid.add_obstaculo(*rng.choice(caminho))
+
+            inicio = time.perf_counter()
+            lpa.replanejar()
+            tempo_lpa += time.perf_counter() - inicio
+            expansoes_lpa += lpa.reexpandidos
+
+            inicio = time.perf_counter()
+            expansoes_completo += Buscas(grid).resolver("a_estrela")["passos"]
+            tempo_completo += time.perf_counter() - inicio
+            rodadas += 1
+
+    return {
+        "algoritmo": "lpa",
+        "edicoes": rodadas,
+        "tempo_s": tempo_lpa,
+        "reexpandidos": expansoes_lpa,
+        "tempo_a_estrela_s": tempo_completo,
+        "expansoes_a_estrela": expansoes_completo,
+    }
+
+
+def executar(args) -> dict:
+    """
+    Roda o benchmark completo conforme os argumentos da linha de comando.
+
+    :return: Relatório (metadados + lista de resultados)
+    """
+    resultados: List[dict] = []
+
+    for tamanho in args.tamanhos:
+        for densidade in args.densidades:
+            inicio = time.perf_counter()
+            grid = gerar_mapa_aleatorio(tamanho, tamanho, densidade, args.semente)
+            tempo_mapa = time.perf_counter() - inicio
+
+            base = {
+                "tamanho": tamanho,
+                "densidade": densidade,
+                "semente": args.semente,
+                "tempo_geracao_mapa_s": tempo_mapa,
+            }
+
+            # BFS define o comprimento ótimo de referência
+            otimo = len(Buscas(grid).resolver("bfs")["caminho"])
+
+            for algoritmo in args.algoritmos:
+                medida = medir_busca(grid, algoritmo, args.repeticoes, not args.sem_memoria)
+                medida["otimo"] = otimo
+                medida["razao_otimalidade"] = medida["comprimento"] / otimo if otimo else None
+                resultados.append({**base, **medida})
+                fila = ""
+                if medida["pico_fila"] is not None:
+                    fila = f" fila<={medida['pico_fila']} {medida['descartes']} descartes"
+                print(
+                    f"{tamanho}x{tamanho} p={densidade} {algoritmo}: "
+                    f"{medida['tempo_s']:.4f}s {medida['passos']} exp{fila}",
+                    file=sys.stderr
+                )
+
+            if args.replanejamento:
+                copia = gerar_mapa_aleatorio(tamanho, tamanho, densidade, args.semente)
+                medida = medir_replanejamento(copia, args.replanejamento, args.semente)
+                resultados.append({**base, **medida})
+                print(
+                    f"{tamanho}x{tamanho} p={densidade} lpa: {medida['reexpandidos']} exp "
+                    f"vs a_estrela {medida['expansoes_a_estrela']} exp",
+                    file=sys.stderr
+                )
+
+            if args.ag and tamanho <= args.ag_tamanho_max:
+                medida = medir_ag(grid, args.ag_populacao, args.ag_geracoes, args.semente)
+                resultados.append({**base, **medida})
+                print(f"{tamanho}x{tamanho} p={densidade} ag: {medida['tempo_s']:.4f}s", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementacao": platform.python_implementation(),
+            "plataforma": platform.platform(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "argumentos": vars(args),
+            "importacao": medir_importacao(),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual: dict, anterior: dict) -> List[str]:
+    """
+    Compara tempos de dois relatórios, casando por (tamanho, densidade, algoritmo).
+
+    :return: Linhas de texto com a razão atual/anterior de cada medida
+    """
+    def chave(r: dict) -> tuple:
+        return (r["tamanho"], r["densidade"], r["algoritmo"])
+
+    antigos: Dict[tuple, dict] = {chave(r): r for r in anterior["resultados"]}
+    linhas = []
+    for r in atual["resultados"]:
+        antigo = antigos.get(chave(r))
+        if antigo and antigo["tempo_s"] > 0:
+            razao = r["tempo_s"] / antigo["tempo_s"]
+            linhas.append(
+                f"{r['tamanho']}x{r['tamanho']} p={r['densidade']} {r['algoritmo']}: "
+                f"{antigo['tempo_s']:.4f}s -> {r['tempo_s']:.4f}s ({razao:.2f}x)"
+            )
+    return linhas
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="lados dos mapas quadrados")
+    parser.add_argument("--densidades", type=float, nargs="+", default=DENSIDADES_PADRAO,
+                        help="probabilidades de obstáculo")
+    parser.add_argument("--algoritmos", nargs="+", default=ALGORITMOS_PADRAO,
+                        choices=ALGORITMOS_PADRAO)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não mede o pico de memória (evita a execução extra)")
+    parser.add_argument("--ag", action=argparse.BooleanOptionalAction, default=True,
+                        help="inclui o Algoritmo Genético")
+    parser.add_argument("--ag-tamanho-max", type=int, default=200,
+                        help="maior mapa em que o AG é medido")
+    parser.add_argument("--ag-populacao", type=int, default=8)
+    parser.add_argument("--ag-geracoes", type=int, default=3)
+    parser.add_argument("--replanejamento", type=int, default=10, metavar="N",
+                        help="edições de obstáculo para comparar LPA* e A* (0 desliga)")
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument("--comparar", help="relatório JSON anterior para comparação")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = criar_parser().parse_args(argv)
+    relatorio = executar(args)
+
+    texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+        for linha in comparar(relatorio, anterior):
+            print(linha, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
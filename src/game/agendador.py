@@ -0,0 +1,89 @@
+import time
+from typing import Callable, Generator
+
+
+class AgendadorPassos:
+    """
+    Controla quantos passos de um gerador de busca rodam a cada quadro.
+
+    A velocidade é dada em passos por segundo: o tempo decorrido entre
+    quadros vira "crédito" de passos, e cada quadro executa os passos
+    acumulados sem ultrapassar um orçamento de tempo, para que o laço de
+    eventos nunca fique bloqueado.
+    """
+
+    MIN_PASSOS_POR_SEGUNDO = 1.0
+    MAX_PASSOS_POR_SEGUNDO = 1_000_000.0
+
+    def __init__(
+        self,
+        passos_por_segundo: float = 50.0,
+        orcamento_quadro_ms: float = 8.0,
+        relogio: Callable[[], float] = time.perf_counter
+    ) -> None:
+        """
+        Inicializa o agendador.
+
+        :param passos_por_segundo: Velocidade inicial da animação
+        :param orcamento_quadro_ms: Tempo máximo gasto com passos por quadro
+        :param relogio: Fonte de tempo em segundos (substituível em testes)
+        """
+        self.passos_por_segundo: float = passos_por_segundo
+        self.orcamento_quadro: float = orcamento_quadro_ms / 1000.0
+        self.relogio = relogio
+
+        self._credito: float = 0.0
+        self._ultimo: float = relogio()
+
+    def reiniciar(self) -> None:
+        """
+        Descarta o crédito acumulado (usado ao iniciar uma nova busca).
+        """
+        self._credito = 0.0
+        self._ultimo = self.relogio()
+
+    def acelerar(self, fator: float = 2.0) -> None:
+        """
+        Multiplica a velocidade, respeitando o máximo.
+        """
+        self.passos_por_segundo = min(
+            self.passos_por_segundo * fator, self.MAX_PASSOS_POR_SEGUNDO
+        )
+
+    def desacelerar(self, fator: float = 2.0) -> None:
+        """
+        Divide a velocidade, respeitando o mínimo.
+        """
+        self.passos_por_segundo = max(
+            self.passos_por_segundo / fator, self.MIN_PASSOS_POR_SEGUNDO
+        )
+
+    def executar(self, gerador: Generator) -> bool:
+        """
+        Avança o gerador quantos passos couberem neste quadro.
+
+        :param gerador: Gerador de busca (um passo por next)
+        :return: True se o gerador continua, False se terminou
+        """
+        agora = self.relogio()
+        decorrido = agora - self._ultimo
+        self._ultimo = agora
+
+        # limita o acúmulo a 1/4 de segundo para evitar rajadas após pausas
+        self._credito = min(
+            self._credito + decorrido * self.passos_por_segundo,
+            max(1.0, self.passos_por_segundo / 4)
+        )
+
+        prazo = agora + self.orcamento_quadro
+        while self._credito >= 1.0:
+            try:
+                next(gerador)
+            except StopIteration:
+                return False
+            self._credito -= 1.0
+
+            if self.relogio() > prazo:
+                break
+
+        return True
@@ -1,10 +1,179 @@
 import random
-import copy
+import hashlib
+import multiprocessing
+import threading
 from game.busca import Buscas
-from typing import Dict, Generator, List, Optional
+from game.cache import CacheLRU
+from game.contexto import ContextoBusca
+from game.grid import Grid
+from typing import Callable, Dict, Generator, List, Optional, Tuple
 
 
 Individuo = Dict[str, float]
+Genoma = Tuple[float, float]  # (w, custo)
+Orcamento = Tuple[Optional[int], Optional[float]]  # (expansões, segundos)
+
+# multiplicador do fitness quando o A* estoura o orçamento: com limite de
+# expansões L, quem estoura fica com pelo menos 4L, pior do que qualquer
+# busca concluída dentro do limite (no máximo 2L)
+PENALIDADE_ORCAMENTO = 2.0
+
+
+# ================= AVALIAÇÃO (FUNÇÕES DE MÓDULO) =================
+# Ficam fora da classe para poderem ser enviadas aos processos do pool.
+
+def _fitness_visual(
+    grid,
+    genoma: Genoma,
+    contexto: Optional[ContextoBusca] = None
+) -> float:
+    """
+    Fitness do A* incremental (o mesmo exibido na tela). As marcas ficam no
+    contexto, então o grid não é alterado nem precisa ser copiado.
+
+    :param grid: Grid base
+    :param genoma: Par (w, custo)
+    :param contexto: Contexto reaproveitado entre avaliações no mesmo grid
+    :return: Fitness calculado
+    """
+    busca = Buscas(grid, contexto=contexto)
+    busca.valor_caminho = 8  # cor do A*
+
+    # injeta parâmetros no A*
+    busca.w_heuristica, busca.custo_movimento = genoma
+
+    # executa completamente
+    for _ in busca.a_estrela():
+        pass
+
+    caminho = busca.reconstruir_caminho()
+
+    if not caminho:
+        return float("inf")
+    return len(caminho) + 0.3 * busca.visitados_count
+
+
+def _fitness_rapido(grid, genoma: Genoma, orcamento: Orcamento = (None, None)) -> float:
+    """
+    Fitness do A* sem visualização.
+
+    :param grid: Grid base (não é alterado)
+    :param genoma: Par (w, custo)
+    :param orcamento: Limites (expansões, segundos) do A*; estourar é penalizado
+    :return: Fitness calculado
+    """
+    busca = Buscas(grid)
+    busca.w_heuristica, busca.custo_movimento = genoma
+    busca.limite_expansoes, busca.limite_tempo = orcamento
+
+    busca.a_estrela_rapido()
+    return _fitness_de(busca.passos, busca.visitados_count, busca.status)
+
+
+def _fitness_rapido_lote(
+    grid,
+    genomas: List[Genoma],
+    orcamento: Orcamento = (None, None)
+) -> List[float]:
+    """
+    Fitness do A* sem visualização para vários genomas de uma vez, usando
+    Buscas.a_estrela_lote (uma única busca e tabela de heurística).
+
+    :param grid: Grid base (não é alterado)
+    :param genomas: Pares (w, custo)
+    :param orcamento: Limites (expansões, segundos) de cada A*
+    :return: Fitness de cada genoma, na mesma ordem
+    """
+    if not genomas:
+        return []
+
+    busca = Buscas(grid)
+    busca.limite_expansoes, busca.limite_tempo = orcamento
+
+    return [
+        _fitness_de(r["passos"], r["visitados"], r["status"])
+        for r in busca.a_estrela_lote(genomas)
+    ]
+
+
+def _fitness_de(passos: int, visitados: int, status: Optional[str]) -> float:
+    """
+    Fórmula de fitness do A* rápido, com penalidade por estouro de orçamento.
+    """
+    fitness = passos + visitados
+    if status == Buscas.ORCAMENTO_EXCEDIDO:
+        fitness *= PENALIDADE_ORCAMENTO
+    return fitness
+
+
+def _fitness_mapas(
+    mapas: List,
+    genoma: Genoma,
+    corte: float,
+    orcamento: Orcamento = (None, None)
+) -> Tuple[float, bool]:
+    """
+    Fitness rápido acumulado em um conjunto de mapas, com abandono antecipado.
+
+    Assim que a soma parcial passa do corte (pior valor que ainda entra na
+    elite), os mapas restantes são ignorados: o indivíduo já está fora.
+
+    :param mapas: Grids do corpus
+    :param genoma: Par (w, custo)
+    :param corte: Fitness máximo que ainda interessa
+    :param orcamento: Limites do A* em cada mapa
+    :return: (fitness acumulado, True se a avaliação foi abandonada)
+    """
+    total = 0.0
+    for grid in mapas:
+        total += _fitness_rapido(grid, genoma, orcamento)
+        if total > corte:
+            return total, True
+    return total, False
+
+
+# grids de cada processo trabalhador, recebidos uma única vez na criação do pool
+_grid_trabalhador: Optional[Grid] = None
+_mapas_trabalhador: List[Grid] = []
+_orcamento_trabalhador: Orcamento = (None, None)
+_contexto_trabalhador: Optional[ContextoBusca] = None
+
+
+def _iniciar_trabalhador(grids: List[Tuple[int, int, bytes]], orcamento: Orcamento) -> None:
+    """
+    Inicializador do pool: reconstrói o grid base e o corpus de mapas
+    no processo trabalhador.
+
+    :param grids: (linhas, colunas, células) do grid base seguido dos mapas
+    :param orcamento: Limites do A* rápido
+    """
+    global _grid_trabalhador, _mapas_trabalhador, _orcamento_trabalhador
+    global _contexto_trabalhador
+    _orcamento_trabalhador = orcamento
+    _contexto_trabalhador = None
+    reconstruidos = []
+    for linhas, colunas, celulas in grids:
+        grid = Grid(linhas, colunas, bytearray(celulas))
+        reconstruidos.append(grid)
+
+    _grid_trabalhador = reconstruidos[0]
+    _mapas_trabalhador = reconstruidos[1:]
+
+
+def _fitness_visual_trabalhador(genoma: Genoma) -> float:
+    global _contexto_trabalhador
+    if _contexto_trabalhador is None:
+        _contexto_trabalhador = ContextoBusca(_grid_trabalhador)
+    return _fitness_visual(_grid_trabalhador, genoma, _contexto_trabalhador)
+
+
+def _fitness_rapido_trabalhador(genoma: Genoma) -> float:
+    return _fitness_rapido(_grid_trabalhador, genoma, _orcamento_trabalhador)
+
+
+def _fitness_mapas_trabalhador(tarefa: Tuple[Genoma, float]) -> Tuple[float, bool]:
+    genoma, corte = tarefa
+    return _fitness_mapas(_mapas_trabalhador, genoma, corte, _orcamento_trabalhador)
 
 
 class AlgoritmoGeneticoAStar:
@@ -19,23 +188,271 @@ class AlgoritmoGeneticoAStar:
     e na quantidade de nós visitados durante a busca.
     """
 
-    def __init__(self, grid, tamanho_pop: int = 10, geracoes: int = 10) -> None:
+    def __init__(
+        self,
+        grid,
+        tamanho_pop: int = 10,
+        geracoes: int = 10,
+        processos: int = 1,
+        semente: Optional[int] = None,
+        tamanho_cache: int = 4096,
+        quantizacao: Optional[float] = None,
+        mapas: Optional[List] = None,
+        limite_expansoes: Optional[int] = None,
+        limite_tempo: Optional[float] = None,
+        cancelamento=None
+    ) -> None:
         """
         Inicializa o algoritmo genético.
 
         :param grid: Grid base utilizado nas avaliações
         :param tamanho_pop: Tamanho da população
         :param geracoes: Número de gerações
+        :param processos: Processos usados na avaliação (1 = serial)
+        :param semente: Semente do gerador aleatório (None = não determinístico)
+        :param tamanho_cache: Máximo de fitness memorizados (0 desativa)
+        :param quantizacao: Passo de arredondamento dos genes na chave do
+            cache (None = genomas precisam ser idênticos)
+        :param mapas: Corpus de grids para avaliação multi-mapa; quando
+            informado, o fitness é a soma do A* rápido em todos eles
+        :param limite_expansoes: Máximo de expansões do A* rápido por avaliação
+        :param limite_tempo: Tempo máximo (s) do A* rápido por avaliação;
+            estourar qualquer limite resulta em fitness penalizado
+        :param cancelamento: Evento (threading/multiprocessing) que interrompe
+            executar_visual quando sinalizado; por padrão, um evento próprio
         """
         self.grid_original = grid
         self.tamanho_pop: int = tamanho_pop
         self.geracoes: int = geracoes
 
+        # toda a aleatoriedade fica no processo principal, então o resultado
+        # depende só da semente, e não do número de processos
+        self.rng = random.Random(semente)
+        self.processos: int = processos
+        self._pool = None
+        # versões dos grids copiados para os trabalhadores do pool
+        self._versoes_pool: Optional[Tuple[int, ...]] = None
+        self._cancelamento = cancelamento if cancelamento is not None else threading.Event()
+
+        # estado do A* incremental, reaproveitado entre avaliações seriais
+        self._contexto_visual: Optional[ContextoBusca] = None
+
+        # fitness já calculados, por (mapa, tipo de avaliação, genoma)
+        self.cache: CacheLRU[float] = CacheLRU(tamanho_cache)
+        self.quantizacao: Optional[float] = quantizacao
+
+        self.orcamento: Orcamento = (limite_expansoes, limite_tempo)
+
+        self.mapas: List = list(mapas) if mapas else []
+        self._assinatura_mapas: Optional[bytes] = None
+        # (versão do grid, assinatura): o hash do mapa só é refeito após edições
+        self._assinatura_grid: Optional[Tuple[int, bytes]] = None
+        if self.mapas:
+            h = hashlib.blake2b(digest_size=16)
+            for mapa in self.mapas:
+                h.update(mapa.assinatura())
+            self._assinatura_mapas = h.digest()
+
         self.populacao: List[Individuo] = []
         self.melhor: Optional[Individuo] = None
 
         self.geracao_atual: int = 0
 
+    # ================= POOL DE PROCESSOS =================
+
+    def _obter_pool(self):
+        """
+        Cria o pool de processos, enviando o grid e o corpus de mapas a cada
+        trabalhador. Se algum deles foi editado desde então, os trabalhadores
+        têm uma cópia antiga: o pool é fechado e recriado.
+
+        :return: Pool de processos
+        """
+        versoes = tuple(grid.versao for grid in [self.grid_original] + self.mapas)
+        if self._pool is not None and versoes != self._versoes_pool:
+            self.fechar()
+
+        if self._pool is None:
+            self._versoes_pool = versoes
+            grids = [
+                (grid.linhas, grid.colunas, grid.celulas_base())
+                for grid in [self.grid_original] + self.mapas
+            ]
+            self._pool = multiprocessing.Pool(
+                self.processos,
+                initializer=_iniciar_trabalhador,
+                initargs=(grids, self.orcamento)
+            )
+        return self._pool
+
+    def fechar(self) -> None:
+        """
+        Encerra o pool de processos, se existir.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def cancelar(self) -> None:
+        """
+        Pede a interrupção de executar_visual na próxima verificação.
+        """
+        self._cancelamento.set()
+
+    def __enter__(self) -> "AlgoritmoGeneticoAStar":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _executar(self, tarefas: list, serial: Callable, trabalhador: Callable) -> list:
+        """
+        Aplica uma função de avaliação a uma lista de tarefas, usando o pool
+        quando processos > 1. A ordem dos resultados é a das tarefas.
+
+        :param tarefas: Argumentos de cada avaliação
+        :param serial: Função executada no processo principal
+        :param trabalhador: Função equivalente executada no pool
+        :return: Lista de resultados
+        """
+        if self.processos > 1 and len(tarefas) > 1:
+            return self._obter_pool().map(trabalhador, tarefas)
+        return [serial(t) for t in tarefas]
+
+    def _assinatura_atual(self) -> bytes:
+        """
+        Assinatura do grid base, recalculada só quando Grid.versao muda.
+        """
+        versao = self.grid_original.versao
+        if self._assinatura_grid is None or self._assinatura_grid[0] != versao:
+            self._assinatura_grid = (versao, self.grid_original.assinatura())
+        return self._assinatura_grid[1]
+
+    def _avaliar_lote(self, individuos: List[Individuo], tipo: str) -> None:
+        """
+        Avalia vários indivíduos, em paralelo quando processos > 1.
+
+        Genomas já presentes no cache (mesmo mapa e mesmo tipo de avaliação)
+        recebem o fitness memorizado sem rodar o A* novamente.
+
+        :param individuos: Indivíduos a avaliar
+        :param tipo: "visual" (A* incremental) ou "rapido" (A* com orçamento)
+        """
+        if tipo == "visual":
+            if self._contexto_visual is None:
+                self._contexto_visual = ContextoBusca(self.grid_original)
+            fitness = lambda genoma: _fitness_visual(
+                self.grid_original, genoma, self._contexto_visual
+            )
+            fitness_trabalhador = _fitness_visual_trabalhador
+        else:
+            fitness = lambda genoma: _fitness_rapido(
+                self.grid_original, genoma, self.orcamento
+            )
+            fitness_trabalhador = _fitness_rapido_trabalhador
+
+        assinatura = self._assinatura_atual()
+        chaves = [
+            (assinatura, tipo) + self._chave_genoma(ind)
+            for ind in individuos
+        ]
+
+        # só avalia genomas ausentes do cache, cada um uma única vez
+        pendentes: Dict[tuple, Genoma] = {}
+        for ind, chave in zip(individuos, chaves):
+            valor = self.cache.obter(chave)
+            if valor is not None:
+                ind["fitness"] = valor
+            elif chave not in pendentes:
+                pendentes[chave] = (ind["w"], ind["custo"])
+
+        genomas = list(pendentes.values())
+        if tipo == "rapido" and self.processos <= 1:
+            # serial: todos os genomas compartilham uma única busca
+            resultados = _fitness_rapido_lote(
+                self.grid_original, genomas, self.orcamento
+            )
+        else:
+            resultados = self._executar(genomas, fitness, fitness_trabalhador)
+
+        calculados = dict(zip(pendentes, resultados))
+        for chave, valor in calculados.items():
+            self.cache.guardar(chave, valor)
+
+        for ind, chave in zip(individuos, chaves):
+            if chave in calculados:
+                ind["fitness"] = calculados[chave]
+
+    def _avaliar_mapas(self, individuos: List[Individuo]) -> None:
+        """
+        Avalia indivíduos no corpus de mapas, com corrida (racing).
+
+        Primeiro são avaliados por completo indivíduos suficientes para formar
+        a elite (metade da população, que é o que selecionar() mantém); o pior
+        fitness dessa elite vira o corte. Os demais param de ser avaliados
+        assim que a soma parcial passa do corte e ficam com "abortado" = True.
+        Só resultados completos entram no cache.
+
+        :param individuos: Indivíduos a avaliar
+        """
+        tam_elite = max(1, self.tamanho_pop // 2)
+        concluidos: List[float] = []
+        pendentes: List[Tuple[Individuo, tuple]] = []
+
+        for ind in individuos:
+            chave = (self._assinatura_mapas, "mapas") + self._chave_genoma(ind)
+            valor = self.cache.obter(chave)
+            if valor is not None:
+                ind["fitness"] = valor
+                ind["abortado"] = False
+                concluidos.append(valor)
+            else:
+                pendentes.append((ind, chave))
+
+        faltam = max(0, tam_elite - len(concluidos))
+        fases = [(pendentes[:faltam], False), (pendentes[faltam:], True)]
+        resultados: Dict[tuple, Tuple[float, bool]] = {}
+
+        for fase, com_corte in fases:
+            corte = float("inf")
+            if com_corte and len(concluidos) >= tam_elite:
+                corte = sorted(concluidos)[tam_elite - 1]
+
+            # genomas repetidos no lote são avaliados uma vez
+            tarefas: Dict[tuple, Tuple[Genoma, float]] = {}
+            for ind, chave in fase:
+                if chave not in resultados:
+                    tarefas.setdefault(chave, ((ind["w"], ind["custo"]), corte))
+
+            novos = dict(zip(tarefas, self._executar(
+                list(tarefas.values()),
+                lambda t: _fitness_mapas(self.mapas, *t, self.orcamento),
+                _fitness_mapas_trabalhador
+            )))
+
+            for chave, (valor, abortado) in novos.items():
+                if not abortado:
+                    self.cache.guardar(chave, valor)
+                    concluidos.append(valor)
+            resultados.update(novos)
+
+            for ind, chave in fase:
+                ind["fitness"], ind["abortado"] = resultados[chave]
+
+    def _chave_genoma(self, individuo: Individuo) -> Genoma:
+        """
+        Genoma usado como chave do cache, arredondado se houver quantização.
+
+        :param individuo: Indivíduo
+        :return: Par (w, custo) normalizado
+        """
+        w, custo = individuo["w"], individuo["custo"]
+        if self.quantizacao:
+            w = round(w / self.quantizacao)
+            custo = round(custo / self.quantizacao)
+        return (w, custo)
+
     # ================= INICIALIZAÇÃO =================
 
     def inicializar_populacao(self) -> None:
@@ -45,8 +462,8 @@ class AlgoritmoGeneticoAStar:
         self.populacao = []
         for _ in range(self.tamanho_pop):
             individuo: Individuo = {
-                "w": random.uniform(0.5, 3.0),
-                "custo": random.uniform(0.8, 1.5),
+                "w": self.rng.uniform(0.5, 3.0),
+                "custo": self.rng.uniform(0.8, 1.5),
                 "fitness": float("inf")
             }
             self.populacao.append(individuo)
@@ -60,38 +477,17 @@ class AlgoritmoGeneticoAStar:
         :param individuo: Indivíduo a ser avaliado
         :return: Valor de fitness calculado
         """
-        grid_copia = copy.deepcopy(self.grid_original)
-
-        busca = Buscas(grid_copia)
-        busca.valor_caminho = 8  # cor do A*
-
-        # injeta parâmetros no A*
-        busca.w_heuristica = individuo["w"]
-        busca.custo_movimento = individuo["custo"]
-
-        gerador = busca.a_estrela()
-
-        # executa completamente
-        for _ in gerador:
-            pass
-
-        caminho = busca.reconstruir_caminho()
-
-        if not caminho:
-            individuo["fitness"] = float("inf")
-        else:
-            individuo["fitness"] = (
-                len(caminho) + 0.3 * busca.visitados_count
-            )
-
+        self._avaliar_lote([individuo], "visual")
         return individuo["fitness"]
 
     def avaliar_populacao(self) -> None:
         """
         Avalia todos os indivíduos da população.
         """
-        for ind in self.populacao:
-            self.avaliar_individuo(ind)
+        if self.mapas:
+            self._avaliar_mapas(self.populacao)
+        else:
+            self._avaliar_lote(self.populacao, "visual")
 
         self.populacao.sort(key=lambda x: x["fitness"])
         self.melhor = self.populacao[0]
@@ -115,8 +511,8 @@ class AlgoritmoGeneticoAStar:
         :return: Novo indivíduo (filho)
         """
         filho: Individuo = {
-            "w": random.choice([pai1["w"], pai2["w"]]),
-            "custo": random.choice([pai1["custo"], pai2["custo"]]),
+            "w": self.rng.choice([pai1["w"], pai2["w"]]),
+            "custo": self.rng.choice([pai1["custo"], pai2["custo"]]),
             "fitness": float("inf")
         }
         return filho
@@ -130,13 +526,13 @@ class AlgoritmoGeneticoAStar:
         """
         individuo["mutou"] = False
 
-        if random.random() < taxa:
-            individuo["w"] += random.uniform(-0.3, 0.3)
+        if self.rng.random() < taxa:
+            individuo["w"] += self.rng.uniform(-0.3, 0.3)
             individuo["w"] = max(0.1, individuo["w"])
             individuo["mutou"] = True
 
-        if random.random() < taxa:
-            individuo["custo"] += random.uniform(-0.2, 0.2)
+        if self.rng.random() < taxa:
+            individuo["custo"] += self.rng.uniform(-0.2, 0.2)
             individuo["custo"] = max(0.1, individuo["custo"])
             individuo["mutou"] = True
 
@@ -150,7 +546,7 @@ class AlgoritmoGeneticoAStar:
         selecionados = self.selecionar()
 
         while len(nova_pop) < self.tamanho_pop:
-            p1, p2 = random.sample(selecionados, 2)
+            p1, p2 = self.rng.sample(selecionados, 2)
             filho = self.cruzar(p1, p2)
             self.mutar(filho)
             nova_pop.append(filho)
@@ -165,14 +561,41 @@ class AlgoritmoGeneticoAStar:
         Avalia um indivíduo utilizando A* sem visualização,
         focando apenas em desempenho.
 
+        Com orçamento configurado, um A* que estoura o limite de expansões
+        ou de tempo recebe fitness multiplicado por PENALIDADE_ORCAMENTO.
+
         :param individuo: Indivíduo a ser avaliado
         """
-        busca = Buscas(self.grid_original)
-        busca.w_heuristica = individuo["w"]
-        busca.custo_movimento = individuo["custo"]
+        self._avaliar_lote([individuo], "rapido")
+
+    def executar_rapido(self) -> Optional[Individuo]:
+        """
+        Executa todas as gerações sem visualização, avaliando a população
+        inteira em lote (ou no corpus, no modo multi-mapa).
 
-        busca.a_estrela_rapido()
-        individuo["fitness"] = busca.passos + busca.visitados_count
+        Se cancelar() for chamado, para ao fim da geração em andamento.
+
+        :return: Melhor indivíduo encontrado
+        """
+        self.inicializar_populacao()
+
+        for g in range(self.geracoes):
+            if self._cancelamento.is_set():
+                break
+            self.geracao_atual = g
+
+            if self.mapas:
+                self._avaliar_mapas(self.populacao)
+            else:
+                self._avaliar_lote(self.populacao, "rapido")
+
+            self.populacao.sort(key=lambda x: x["fitness"])
+            self.melhor = self.populacao[0]
+
+            self.proxima_geracao()
+
+        self.fechar()
+        return self.melhor
 
     # ================= GERADOR VISUAL =================
 
@@ -181,26 +604,37 @@ class AlgoritmoGeneticoAStar:
         Executa o algoritmo genético de forma incremental,
         permitindo visualização da evolução.
 
+        Se cancelar() for chamado, para entre avaliações sem emitir "fim".
+
         :yield: Eventos de execução (indivíduo, melhor, fim)
         """
         self.inicializar_populacao()
 
         for g in range(self.geracoes):
+            if self._cancelamento.is_set():
+                break
             self.geracao_atual = g
 
-            # avalia indivíduo por indivíduo
-            for i, individuo in enumerate(self.populacao):
+            # apenas o primeiro é visual
+            individuo = self.populacao[0]
+            if self.mapas:
+                # no modo multi-mapa todos usam o mesmo fitness (corpus)
+                self._avaliar_mapas(self.populacao)
+            else:
+                self.avaliar_individuo(individuo)
+            yield {
+                "tipo": "individuo",
+                "geracao": g,
+                "indice": 0,
+                "individuo": individuo
+            }
+
+            if self._cancelamento.is_set():
+                break
 
-                if i == 0:  # apenas o primeiro é visual
-                    self.avaliar_individuo(individuo)
-                    yield {
-                        "tipo": "individuo",
-                        "geracao": g,
-                        "indice": i,
-                        "individuo": individuo
-                    }
-                else:
-                    self.avaliar_rapido(individuo)
+            # os demais são avaliados em lote (em paralelo, se configurado)
+            if not self.mapas:
+                self._avaliar_lote(self.populacao[1:], "rapido")
 
             # seleciona o melhor
             self.populacao.sort(key=lambda x: x["fitness"])
@@ -214,4 +648,6 @@ class AlgoritmoGeneticoAStar:
 
             self.proxima_geracao()
 
-        yield {"tipo": "fim"}
+        self.fechar()
+        if not self._cancelamento.is_set():
+            yield {"tipo": "fim"}
@@ -0,0 +1,290 @@
+"""
+Leitura e escrita de mapas em arquivo.
+
+Formato texto (.txt): uma linha por linha do grid, um caractere por célula:
+    .  livre
+    #  obstáculo
+    I  início
+    O  objetivo
+
+Formato binário (.grid): as células, um byte cada em ordem de linha (o
+mesmo conteúdo de Grid.celulas), seguidas de um rodapé de 32 bytes com
+dimensões, início e objetivo. Como as células começam no byte 0, o
+arquivo pode ser mapeado em memória direto no Grid, sem leitura nem
+conversão; o rodapé no fim evita o alinhamento exigido pelo mmap.
+
+Formato MovingAI (.map e .scen): mapas e cenários do benchmark de
+pathfinding em grid (https://movingai.com/benchmarks/formats.html).
+"""
+
+import mmap
+import os
+import struct
+from typing import List, Optional, Tuple, Union
+
+from game.grid import Grid
+
+Caminho = Union[str, os.PathLike]
+Coordenada = Tuple[int, int]
+
+EXTENSAO_BINARIA = ".grid"
+
+# Rodapé do formato binário: assinatura, versão, linhas, colunas e os nós de
+# início e objetivo (-1 quando ausentes)
+_RODAPE = struct.Struct("<4sB3xIIqq")
+_ASSINATURA = b"GRID"
+_VERSAO = 1
+
+SIMBOLOS = {
+    Grid.LIVRE: ".",
+    Grid.OBSTACULO: "#",
+    Grid.INICIO: "I",
+    Grid.OBJETIVO: "O",
+}
+
+_INVALIDO = 255
+
+# Tabelas de tradução caractere <-> estado da célula
+_TEXTO_PARA_CELULA = bytearray([_INVALIDO]) * 256
+for _estado, _simbolo in SIMBOLOS.items():
+    _TEXTO_PARA_CELULA[ord(_simbolo)] = _estado
+_TEXTO_PARA_CELULA = bytes(_TEXTO_PARA_CELULA)
+
+_CELULA_PARA_TEXTO = bytearray(b".") * 256
+for _estado, _simbolo in SIMBOLOS.items():
+    _CELULA_PARA_TEXTO[_estado] = ord(_simbolo)
+_CELULA_PARA_TEXTO = bytes(_CELULA_PARA_TEXTO)
+
+
+def ler_texto(caminho: Caminho) -> Grid:
+    """
+    Lê um mapa no formato texto.
+
+    :param caminho: Arquivo a ser lido
+    :return: Grid com o conteúdo do arquivo
+    :raises ValueError: Linhas de tamanhos diferentes ou caractere desconhecido
+    """
+    with open(caminho, "rb") as arquivo:
+        linhas = [linha.rstrip() for linha in arquivo.read().splitlines()]
+
+    while linhas and not linhas[-1]:
+        linhas.pop()
+    if not linhas:
+        raise ValueError(f"{caminho}: mapa vazio")
+
+    colunas = len(linhas[0])
+    for numero, linha in enumerate(linhas, 1):
+        if len(linha) != colunas:
+            raise ValueError(
+                f"{caminho}:{numero}: esperadas {colunas} colunas, encontradas {len(linha)}"
+            )
+
+    celulas = b"".join(linhas).translate(_TEXTO_PARA_CELULA)
+    posicao = celulas.find(_INVALIDO)
+    if posicao >= 0:
+        lin, col = divmod(posicao, colunas)
+        simbolo = chr(linhas[lin][col])
+        raise ValueError(f"{caminho}:{lin + 1}: caractere desconhecido {simbolo!r}")
+
+    grid = Grid(len(linhas), colunas)
+    grid.carregar(celulas)
+    return grid
+
+
+def salvar_texto(grid: Grid, caminho: Caminho) -> None:
+    """
+    Grava o mapa no formato texto (marcas de visualização são descartadas).
+
+    :param grid: Grid a ser gravado
+    :param caminho: Arquivo de destino
+    """
+    texto = grid.celulas_base().translate(_CELULA_PARA_TEXTO)
+    colunas = grid.colunas
+
+    with open(caminho, "wb") as arquivo:
+        for inicio in range(0, len(texto), colunas):
+            arquivo.write(texto[inicio:inicio + colunas])
+            arquivo.write(b"\n")
+
+
+# ================= FORMATO BINÁRIO =================
+
+def salvar_binario(grid: Grid, caminho: Caminho) -> None:
+    """
+    Grava o mapa no formato binário (marcas de visualização são descartadas).
+
+    :param grid: Grid a ser gravado
+    :param caminho: Arquivo de destino
+    """
+    celulas = grid.celulas_base()
+    inicio = celulas.find(Grid.INICIO)
+    objetivo = celulas.find(Grid.OBJETIVO)
+
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(celulas)
+        arquivo.write(_RODAPE.pack(
+            _ASSINATURA, _VERSAO, grid.linhas, grid.colunas, inicio, objetivo
+        ))
+
+
+def ler_cabecalho_binario(caminho: Caminho) -> Tuple[int, int, Optional[Coordenada], Optional[Coordenada]]:
+    """
+    Lê apenas o rodapé do formato binário, sem tocar nas células.
+
+    :param caminho: Arquivo a ser lido
+    :return: (linhas, colunas, início, objetivo); início/objetivo podem ser None
+    :raises ValueError: Arquivo que não está no formato binário
+    """
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(0, os.SEEK_END)
+        tamanho = arquivo.tell()
+        if tamanho < _RODAPE.size:
+            raise ValueError(f"{caminho}: arquivo binário de mapa inválido")
+        arquivo.seek(tamanho - _RODAPE.size)
+        dados = arquivo.read(_RODAPE.size)
+
+    assinatura, versao, linhas, colunas, inicio, objetivo = _RODAPE.unpack(dados)
+    if assinatura != _ASSINATURA:
+        raise ValueError(f"{caminho}: arquivo binário de mapa inválido")
+    if versao != _VERSAO:
+        raise ValueError(f"{caminho}: versão {versao} do formato não suportada")
+    if tamanho != linhas * colunas + _RODAPE.size:
+        raise ValueError(f"{caminho}: tamanho não confere com {linhas}x{colunas}")
+
+    def coordenada(no):
+        return divmod(no, colunas) if no >= 0 else None
+
+    return linhas, colunas, coordenada(inicio), coordenada(objetivo)
+
+
+def ler_binario(caminho: Caminho, mapear: bool = True) -> Grid:
+    """
+    Lê um mapa no formato binário.
+
+    Com mapear=True as células são um mmap copy-on-write do arquivo: a
+    carga não depende do tamanho do mapa, as páginas são lidas do disco sob
+    demanda e alterações no grid ficam só na memória do processo.
+
+    :param caminho: Arquivo a ser lido
+    :param mapear: Mapeia o arquivo em memória em vez de lê-lo inteiro
+    :return: Grid carregado
+    """
+    linhas, colunas, _, _ = ler_cabecalho_binario(caminho)
+    n = linhas * colunas
+
+    with open(caminho, "rb") as arquivo:
+        if mapear and n > 0:
+            celulas = mmap.mmap(arquivo.fileno(), n, access=mmap.ACCESS_COPY)
+        else:
+            celulas = bytearray(arquivo.read(n))
+
+    return Grid(linhas, colunas, celulas)
+
+
+# ================= FORMATO MOVINGAI =================
+
+# '.' e 'G' são terreno livre e 'S' (pântano) é passável; '@', 'O', 'T'
+# (árvores) e 'W' (água) são tratados como obstáculo
+_MOVINGAI_PARA_CELULA = bytearray([_INVALIDO]) * 256
+for _simbolo in b".GS":
+    _MOVINGAI_PARA_CELULA[_simbolo] = Grid.LIVRE
+for _simbolo in b"@OTW":
+    _MOVINGAI_PARA_CELULA[_simbolo] = Grid.OBSTACULO
+_MOVINGAI_PARA_CELULA = bytes(_MOVINGAI_PARA_CELULA)
+
+
+def ler_movingai(
+    caminho: Caminho,
+    inicio: Optional[Coordenada] = None,
+    objetivo: Optional[Coordenada] = None
+) -> Grid:
+    """
+    Lê um mapa no formato .map do MovingAI.
+
+    O formato não tem início nem objetivo; eles podem ser informados aqui
+    (por exemplo, a partir de um cenário de ler_cenarios_movingai).
+
+    :param caminho: Arquivo .map
+    :param inicio: Coordenada (linha, coluna) do início
+    :param objetivo: Coordenada (linha, coluna) do objetivo
+    :return: Grid carregado
+    """
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read().splitlines()
+
+    cabecalho = {}
+    for i, linha in enumerate(conteudo):
+        partes = linha.split()
+        if partes == [b"map"]:
+            corpo = conteudo[i + 1:]
+            break
+        if len(partes) == 2:
+            cabecalho[partes[0].decode()] = partes[1].decode()
+    else:
+        raise ValueError(f"{caminho}: seção 'map' não encontrada")
+
+    try:
+        linhas = int(cabecalho["height"])
+        colunas = int(cabecalho["width"])
+    except (KeyError, ValueError):
+        raise ValueError(f"{caminho}: cabeçalho sem height/width válidos") from None
+
+    corpo = [linha.rstrip() for linha in corpo[:linhas]]
+    if len(corpo) != linhas or any(len(linha) != colunas for linha in corpo):
+        raise ValueError(f"{caminho}: mapa não confere com {linhas}x{colunas}")
+
+    celulas = bytearray(b"".join(corpo).translate(_MOVINGAI_PARA_CELULA))
+    posicao = celulas.find(_INVALIDO)
+    if posicao >= 0:
+        lin, col = divmod(posicao, colunas)
+        raise ValueError(f"{caminho}: caractere desconhecido {chr(corpo[lin][col])!r}")
+
+    if inicio is not None:
+        celulas[inicio[0] * colunas + inicio[1]] = Grid.INICIO
+    if objetivo is not None:
+        celulas[objetivo[0] * colunas + objetivo[1]] = Grid.OBJETIVO
+
+    return Grid(linhas, colunas, celulas)
+
+
+def ler_cenarios_movingai(caminho: Caminho) -> List[dict]:
+    """
+    Lê um arquivo de cenários (.scen) do MovingAI.
+
+    :param caminho: Arquivo .scen
+    :return: Para cada cenário: mapa, inicio, objetivo (linha, coluna) e
+        custo ótimo informado pelo benchmark
+    """
+    cenarios = []
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if len(partes) != 9 or partes[0] == "version":
+                continue
+            _, mapa, _, _, xi, yi, xo, yo, otimo = partes
+            cenarios.append({
+                "mapa": mapa,
+                # x é a coluna e y a linha
+                "inicio": (int(yi), int(xi)),
+                "objetivo": (int(yo), int(xo)),
+                "otimo": float(otimo),
+            })
+    return cenarios
+
+
+def carregar_mapa(caminho: Caminho) -> Grid:
+    """
+    Lê um mapa escolhendo o formato pela extensão do arquivo
+    (.txt texto, .grid binário mapeado em memória, .map MovingAI).
+
+    :param caminho: Arquivo a ser lido
+    :return: Grid carregado
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in ("", ".txt"):
+        return ler_texto(caminho)
+    if extensao == EXTENSAO_BINARIA:
+        return ler_binario(caminho)
+    if extensao == ".map":
+        return ler_movingai(caminho)
+    raise ValueError(f"{caminho}: formato de mapa não suportado ({extensao})")
@@ -1,8 +1,16 @@
+from array import array
 from collections import deque
 import heapq
-from typing import Dict, Generator, List, Optional, Tuple
+from itertools import repeat
+from operator import add
+import time
+from typing import Callable, Dict, Generator, List, Optional, Sequence, Tuple
+
+from game.contexto import ContextoBusca
 
 Coordenada = Tuple[int, int]
+No = int  # índice linear da célula: lin * colunas + col
+ResultadoBusca = Dict[str, object]
 
 class Buscas:
     """
@@ -13,32 +21,126 @@ class Buscas:
     - DFS (Busca em Profundidade)
     - Dijkstra
     - A* (com parâmetros ajustáveis)
+    - A* com fila indexada (decrease-key, modo rápido)
+    - JPS (Jump Point Search, variante 4-conectada)
+    - BFS e A* bidirecionais
     
     Todos os algoritmos consideram movimentação apenas
     para cima, baixo, esquerda e direita.
+
+    Cada algoritmo tem duas formas: um gerador incremental, que guarda o
+    estado em um ContextoBusca e marca nele as células visitadas para
+    visualização, e uma versão "_rapido", sem suspensão, usada em
+    processamento em lote. Nenhuma das duas escreve no grid.
+
+    Internamente os nós são identificados pelo índice linear da célula
+    no armazenamento do grid; coordenadas (i, j) só aparecem na interface
+    pública (início, objetivo e caminho reconstruído).
     """
 
-    def __init__(self, grid) -> None:
+    # nome do algoritmo -> método sem visualização
+    ALGORITMOS_RAPIDOS: Dict[str, str] = {
+        "bfs": "bfs_rapido",
+        "dfs": "dfs_rapido",
+        "dijkstra": "dijkstra_rapido",
+        "a_estrela": "a_estrela_rapido",
+        "a_estrela_indexado": "a_estrela_indexado_rapido",
+        "jps": "jps_rapido",
+        "bfs_bidirecional": "bfs_bidirecional_rapido",
+        "a_estrela_bidirecional": "a_estrela_bidirecional_rapido",
+    }
+
+    # situação da última execução no modo rápido
+    ENCONTRADO = "encontrado"
+    SEM_CAMINHO = "sem_caminho"
+    ORCAMENTO_EXCEDIDO = "orcamento_excedido"
+
+    # de quantas em quantas expansões o limite de tempo é conferido
+    INTERVALO_RELOGIO = 1024
+
+    def __init__(
+        self,
+        grid,
+        inicio: Optional[Coordenada] = None,
+        objetivo: Optional[Coordenada] = None,
+        contexto: Optional[ContextoBusca] = None
+    ) -> None:
         """
         Inicializa a classe de buscas.
 
         :param grid: Objeto Grid contendo o mapa e as células
+        :param inicio: Coordenada inicial (padrão: o início marcado no grid)
+        :param objetivo: Coordenada final (padrão: o objetivo marcado no grid)
+        :param contexto: Estado reutilizável das buscas incrementais, por
+            exemplo o mesmo desenhado pelo renderizador (padrão: um novo,
+            criado na primeira busca incremental)
         """
         self.grid = grid
+        self._contexto: Optional[ContextoBusca] = contexto
         self.linhas: int = grid.linhas
         self.colunas: int = grid.colunas
 
-        self.inicio: Optional[Coordenada] = self._encontrar_valor(2)
-        self.objetivo: Optional[Coordenada] = self._encontrar_valor(3)
+        # o grid mantém início/objetivo ao ser editado: a consulta é O(1)
+        self.inicio: Optional[Coordenada] = inicio or self._encontrar_valor(2)
+        self.objetivo: Optional[Coordenada] = objetivo or self._encontrar_valor(3)
+
+        self.no_inicio: Optional[No] = self._para_no(self.inicio)
+        self.no_objetivo: Optional[No] = self._para_no(self.objetivo)
+
+        # máscara de vizinhos passáveis, compartilhada por todas as buscas no grid
+        self._mascaras = grid.vizinhanca()
+        self._desloc: List[Tuple[No, ...]] = self._tabela_deslocamentos()
 
         self.visitados_count: int = 0
         self.valor_caminho: int = 5  # definido externamente na main
 
-        self.pais: Dict[Coordenada, Coordenada] = {}
+        # dicionário no modo rápido; mapa do contexto nas buscas incrementais
+        self.pais: Dict[No, No] = {}
         self.passos: int = 0
 
+        # orçamento opcional do A* rápido (None = sem limite)
+        self.limite_expansoes: Optional[int] = None
+        self.limite_tempo: Optional[float] = None  # segundos
+        self.status: Optional[str] = None
+
+        # fila aberta do último A* rápido: maior tamanho e entradas obsoletas
+        # retiradas (sempre 0 na fila indexada, que não as cria). No A* com
+        # heapq só são contados com medir_fila, que deixa a busca cerca de
+        # 25% mais lenta (1000x1000, p=0.3); desligado, o custo é um teste
+        # de booleano por expansão.
+        self.medir_fila: bool = False
+        self.pico_fila: int = 0
+        self.descartes: int = 0
+
+        # distância Manhattan de cada célula ao objetivo, calculada sob demanda
+        self._tabela_h: Optional[array] = None
+
+        # JPS: resultado dos saltos horizontais já feitos na busca atual,
+        # por sentido (+1/-1) e nó de partida (-1 = sem ponto de salto)
+        self._saltos_horizontais: Dict[int, Dict[No, No]] = {}
+
     # ================= MÉTODOS AUXILIARES =================
 
+    @property
+    def contexto(self) -> ContextoBusca:
+        """
+        Contexto das buscas incrementais, alocado na primeira consulta.
+        """
+        if self._contexto is None:
+            self._contexto = ContextoBusca(self.grid)
+        return self._contexto
+
+    def _iniciar_incremental(self) -> ContextoBusca:
+        """
+        Reinicia o contexto (O(1)) e passa a guardar os pais nele.
+
+        :return: Contexto pronto para a nova execução
+        """
+        contexto = self.contexto
+        contexto.reiniciar()
+        self.pais = contexto.pais
+        return contexto
+
     def _encontrar_valor(self, valor: int) -> Optional[Coordenada]:
         """
         Localiza uma célula com um determinado valor no grid.
@@ -46,62 +148,133 @@ class Buscas:
         :param valor: Valor da célula (ex: 2=início, 3=objetivo)
         :return: Coordenada encontrada ou None
         """
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                if self.grid.celulas[i][j] == valor:
-                    return (i, j)
-        return None
+        return self.grid.encontrar(valor)
 
-    def _vizinhos(self, no: Coordenada) -> List[Coordenada]:
+    def _para_no(self, coord: Optional[Coordenada]) -> Optional[No]:
         """
-        Retorna os vizinhos válidos de uma célula.
+        Converte uma coordenada (i, j) no índice linear do nó.
+
+        :param coord: Coordenada ou None
+        :return: Índice do nó ou None
+        """
+        if coord is None:
+            return None
+        return coord[0] * self.colunas + coord[1]
+
+    def _tabela_deslocamentos(self) -> List[Tuple[No, ...]]:
+        """
+        Para cada máscara de 4 bits, os deslocamentos de índice dos vizinhos
+        passáveis, na ordem cima, baixo, esquerda, direita.
 
-        :param no: Coordenada atual
-        :return: Lista de coordenadas vizinhas acessíveis
+        :return: Lista indexada pela máscara
+        """
+        direcoes = [
+            (self.grid.VIZ_CIMA, -self.colunas),
+            (self.grid.VIZ_BAIXO, self.colunas),
+            (self.grid.VIZ_ESQUERDA, -1),
+            (self.grid.VIZ_DIREITA, 1),
+        ]
+        return [
+            tuple(d for bit, d in direcoes if mascara & bit)
+            for mascara in range(16)
+        ]
+
+    def _vizinhos(self, no: No) -> List[No]:
         """
-        i, j = no
-        movimentos = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        vizinhos: List[Coordenada] = []
+        Retorna os vizinhos válidos de uma célula.
 
-        for di, dj in movimentos:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < self.linhas and 0 <= nj < self.colunas:
-                if self.grid.celulas[ni][nj] != 1:  # não é obstáculo
-                    vizinhos.append((ni, nj))
-        return vizinhos
+        :param no: Nó atual
+        :return: Lista de nós vizinhos acessíveis
+        """
+        return [no + d for d in self._desloc[self._mascaras[no]]]
 
-    def _marcar_visitado(self, no: Coordenada) -> None:
+    def _marcar_visitado(self, no: No) -> None:
         """
-        Marca uma célula como visitada no grid (para visualização).
+        Marca uma célula livre como visitada no contexto (para visualização).
 
-        :param no: Coordenada a ser marcada
+        :param no: Nó a ser marcado
         """
-        if self.grid.celulas[no[0]][no[1]] == 0:
-            self.grid.celulas[no[0]][no[1]] = 4
+        contexto = self.contexto
+        if self.grid.celulas[no] == 0 and no not in contexto.marcas:
+            contexto.marcar(no, self.grid.VISITADO)
             self.visitados_count += 1
 
-    def reconstruir_caminho(self) -> List[Coordenada]:
+    def _caminho_nos(self) -> List[No]:
         """
-        Reconstrói o caminho do objetivo até o início usando o dicionário de pais.
+        Percorre os pais do objetivo até o início, sem alterar o grid.
 
-        :return: Lista de coordenadas representando o caminho
+        :return: Lista de nós do caminho (sem o início) ou lista vazia
         """
-        atual = self.objetivo
-        caminho: List[Coordenada] = []
+        atual = self.no_objetivo
+        caminho: List[No] = []
 
-        while atual != self.inicio:
+        while atual != self.no_inicio:
             caminho.append(atual)
             atual = self.pais.get(atual)
             if atual is None:
                 return []
 
         caminho.reverse()
+        return caminho
+
+    def _reiniciar_contadores(self) -> None:
+        """
+        Zera contadores e pais antes de uma execução no modo rápido.
+        """
+        self.passos = 0
+        self.visitados_count = 0
+        self.pais = {}
 
+    def reconstruir_caminho(self) -> List[Coordenada]:
+        """
+        Reconstrói o caminho do objetivo até o início usando os pais e o
+        marca no contexto com valor_caminho, para visualização.
+
+        :return: Lista de coordenadas representando o caminho
+        """
+        caminho = self._caminho_nos()
+
+        contexto = self.contexto
+        celulas = self.grid.celulas
         for no in caminho:
-            if self.grid.celulas[no[0]][no[1]] in (0, 4):
-                self.grid.celulas[no[0]][no[1]] = self.valor_caminho
+            if celulas[no] == 0:
+                contexto.marcar(no, self.valor_caminho)
 
-        return caminho
+        return [divmod(no, self.colunas) for no in caminho]
+
+    def caminho(self) -> List[Coordenada]:
+        """
+        Retorna o caminho encontrado sem pintá-lo no grid.
+
+        :return: Lista de coordenadas representando o caminho
+        """
+        return [divmod(no, self.colunas) for no in self._caminho_nos()]
+
+    def resolver(self, algoritmo: str) -> ResultadoBusca:
+        """
+        Executa um algoritmo no modo rápido e devolve o resultado completo.
+
+        :param algoritmo: Nome do algoritmo (chave de ALGORITMOS_RAPIDOS)
+        :return: Dicionário com encontrado, caminho, custo, passos e visitados
+        """
+        if algoritmo not in self.ALGORITMOS_RAPIDOS:
+            raise ValueError(f"Algoritmo desconhecido: {algoritmo}")
+
+        encontrado = getattr(self, self.ALGORITMOS_RAPIDOS[algoritmo])()
+        caminho = self.caminho() if encontrado else []
+
+        custo_passo = 1.0
+        if algoritmo.startswith("a_estrela"):
+            custo_passo = getattr(self, "custo_movimento", 1.0)
+
+        return {
+            "encontrado": encontrado,
+            "caminho": caminho,
+            "custo": len(caminho) * custo_passo if encontrado else float("inf"),
+            "passos": self.passos,
+            "visitados": self.visitados_count,
+            "status": self.status,
+        }
 
     # ================= BFS =================
 
@@ -112,14 +285,16 @@ class Buscas:
         :yield: Controle passo a passo para visualização
         :return: True se encontrar o objetivo, False caso contrário
         """
-        fila = deque([self.inicio])
-        visitados = {self.inicio}
+        contexto = self._iniciar_incremental()
+        fila = deque([self.no_inicio])
+        visitados = contexto.visitados
+        visitados.add(self.no_inicio)
 
         while fila:
             atual = fila.popleft()
             self.passos += 1
 
-            if atual == self.objetivo:
+            if atual == self.no_objetivo:
                 return True
 
             for viz in self._vizinhos(atual):
@@ -133,20 +308,53 @@ class Buscas:
 
         return False
 
+    def bfs_rapido(self) -> bool:
+        """
+        Executa a BFS sem visualização (modo rápido).
+
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        self._reiniciar_contadores()
+        objetivo = self.no_objetivo
+        pais = self.pais
+        mascaras, desloc = self._mascaras, self._desloc
+
+        fila = deque([self.no_inicio])
+        visitados = {self.no_inicio}
+
+        while fila:
+            atual = fila.popleft()
+            self.passos += 1
+
+            if atual == objetivo:
+                break
+
+            for d in desloc[mascaras[atual]]:
+                viz = atual + d
+                if viz not in visitados:
+                    visitados.add(viz)
+                    pais[viz] = atual
+                    fila.append(viz)
+
+        self.visitados_count = len(visitados) - 1
+        return objetivo in visitados
+
     # ================= DFS =================
 
     def dfs(self) -> Generator[None, None, bool]:
         """
         Executa Busca em Profundidade (DFS) de forma incremental.
         """
-        pilha = [self.inicio]
-        visitados = {self.inicio}
+        contexto = self._iniciar_incremental()
+        pilha = [self.no_inicio]
+        visitados = contexto.visitados
+        visitados.add(self.no_inicio)
 
         while pilha:
             atual = pilha.pop()
             self.passos += 1
 
-            if atual == self.objetivo:
+            if atual == self.no_objetivo:
                 return True
 
             for viz in self._vizinhos(atual):
@@ -160,20 +368,53 @@ class Buscas:
 
         return False
 
+    def dfs_rapido(self) -> bool:
+        """
+        Executa a DFS sem visualização (modo rápido).
+
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        self._reiniciar_contadores()
+        objetivo = self.no_objetivo
+        pais = self.pais
+        mascaras, desloc = self._mascaras, self._desloc
+
+        pilha = [self.no_inicio]
+        visitados = {self.no_inicio}
+
+        while pilha:
+            atual = pilha.pop()
+            self.passos += 1
+
+            if atual == objetivo:
+                break
+
+            for d in desloc[mascaras[atual]]:
+                viz = atual + d
+                if viz not in visitados:
+                    visitados.add(viz)
+                    pais[viz] = atual
+                    pilha.append(viz)
+
+        self.visitados_count = len(visitados) - 1
+        return objetivo in visitados
+
     # ================= DIJKSTRA =================
 
     def dijkstra(self) -> Generator[None, None, bool]:
         """
         Executa o algoritmo de Dijkstra de forma incremental.
         """
-        fila = [(0, self.inicio)]
-        dist = {self.inicio: 0}
+        contexto = self._iniciar_incremental()
+        fila = [(0, self.no_inicio)]
+        dist = contexto.g
+        dist[self.no_inicio] = 0
 
         while fila:
             custo, atual = heapq.heappop(fila)
             self.passos += 1
 
-            if atual == self.objetivo:
+            if atual == self.no_objetivo:
                 return True
 
             for viz in self._vizinhos(atual):
@@ -188,21 +429,57 @@ class Buscas:
 
         return False
 
+    def dijkstra_rapido(self) -> bool:
+        """
+        Executa o algoritmo de Dijkstra sem visualização (modo rápido).
+
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        self._reiniciar_contadores()
+        objetivo = self.no_objetivo
+        pais = self.pais
+        mascaras, desloc = self._mascaras, self._desloc
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        fila = [(0, self.no_inicio)]
+        dist = {self.no_inicio: 0}
+
+        while fila:
+            custo, atual = heappop(fila)
+            self.passos += 1
+
+            if atual == objetivo:
+                self.visitados_count = len(dist) - 1
+                return True
+
+            novo_custo = custo + 1
+            for d in desloc[mascaras[atual]]:
+                viz = atual + d
+                if viz not in dist or novo_custo < dist[viz]:
+                    dist[viz] = novo_custo
+                    pais[viz] = atual
+                    heappush(fila, (novo_custo, viz))
+
+        self.visitados_count = len(dist) - 1
+        return False
+
     # ================= A* =================
 
     def a_estrela(self) -> Generator[None, None, bool]:
         """
         Executa o algoritmo A* de forma incremental, com visualização.
         """
-        fila: List[Tuple[float, Coordenada]] = []
-        heapq.heappush(fila, (0, self.inicio))
-        g: Dict[Coordenada, float] = {self.inicio: 0}
+        contexto = self._iniciar_incremental()
+        fila: List[Tuple[float, No]] = []
+        heapq.heappush(fila, (0, self.no_inicio))
+        g = contexto.g
+        g[self.no_inicio] = 0
 
         while fila:
             _, atual = heapq.heappop(fila)
             self.passos += 1
 
-            if atual == self.objetivo:
+            if atual == self.no_objetivo:
                 return True
 
             for viz in self._vizinhos(atual):
@@ -226,46 +503,682 @@ class Buscas:
         Executa o algoritmo A* sem visualização (modo rápido),
         utilizado para avaliação de fitness no algoritmo genético.
 
+        Se limite_expansoes ou limite_tempo estiverem definidos, a busca é
+        interrompida ao atingi-los e status passa a ORCAMENTO_EXCEDIDO.
+
         :return: True se encontrar o objetivo, False caso contrário
         """
-        inicio = self.inicio
-        objetivo = self.objetivo
+        w = getattr(self, "w_heuristica", 1.0)
+        custo_mov = getattr(self, "custo_movimento", 1.0)
+        return self._a_estrela_nucleo(w, custo_mov, self._heuristica)
+
+    def a_estrela_indexado_rapido(self) -> bool:
+        """
+        A* rápido sobre a fila indexada do contexto (decrease-key), sem
+        tuplas nem entradas obsoletas na fila aberta. No empate de f, expande
+        primeiro o nó de maior g. Respeita o mesmo orçamento de a_estrela_rapido.
 
-        self.passos = 0
-        self.visitados_count = 0
-        self.pais = {}
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        w = getattr(self, "w_heuristica", 1.0)
+        custo_mov = getattr(self, "custo_movimento", 1.0)
+        return self._a_estrela_indexado_nucleo(w, custo_mov)
+
+    def a_estrela_lote(self, parametros: Sequence[Tuple[float, float]]) -> List[ResultadoBusca]:
+        """
+        Executa o A* rápido para vários pares (w, custo) no mesmo grid.
+
+        Todas as execuções compartilham a máscara de vizinhança e uma tabela
+        de heurística pré-calculada, evitando reconstruir a busca e recalcular
+        a distância Manhattan a cada par. O orçamento (limite_expansoes,
+        limite_tempo) vale para cada execução.
+
+        :param parametros: Lista de pares (w, custo)
+        :return: Para cada par: encontrado, comprimento, passos, visitados e status
+        """
+        h = self.tabela_heuristica().__getitem__
+        resultados: List[ResultadoBusca] = []
+
+        for w, custo_mov in parametros:
+            encontrado = self._a_estrela_nucleo(w, custo_mov, h)
+            resultados.append({
+                "encontrado": encontrado,
+                "comprimento": len(self._caminho_nos()) if encontrado else 0,
+                "passos": self.passos,
+                "visitados": self.visitados_count,
+                "status": self.status,
+            })
+
+        return resultados
+
+    def _a_estrela_nucleo(
+        self,
+        w: float,
+        custo_mov: float,
+        heuristica: Callable[[No], float]
+    ) -> bool:
+        """
+        Laço principal do A* rápido, compartilhado pela execução única e em lote.
+
+        :param w: Peso da heurística
+        :param custo_mov: Custo de cada movimento
+        :param heuristica: Função nó -> estimativa até o objetivo
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        inicio = self.no_inicio
+        objetivo = self.no_objetivo
 
-        fila: List[Tuple[float, Coordenada]] = []
+        self._reiniciar_contadores()
+        self.status = self.SEM_CAMINHO
+        self.pico_fila = self.descartes = 0
+
+        fila: List[Tuple[float, No]] = []
         heapq.heappush(fila, (0, inicio))
 
-        g: Dict[Coordenada, float] = {inicio: 0}
+        g: Dict[No, float] = {inicio: 0}
 
-        w = getattr(self, "w_heuristica", 1.0)
-        custo_mov = getattr(self, "custo_movimento", 1.0)
+        mascaras, desloc = self._mascaras, self._desloc
+
+        limite = self.limite_expansoes
+        prazo = None
+        if self.limite_tempo is not None:
+            prazo = time.perf_counter() + self.limite_tempo
+        medir = self.medir_fila
 
         while fila:
-            _, atual = heapq.heappop(fila)
+            if limite is not None and self.passos >= limite:
+                self.status = self.ORCAMENTO_EXCEDIDO
+                return False
+            if (prazo is not None and self.passos % self.INTERVALO_RELOGIO == 0
+                    and time.perf_counter() > prazo):
+                self.status = self.ORCAMENTO_EXCEDIDO
+                return False
+
+            f, atual = heapq.heappop(fila)
             self.passos += 1
             self.visitados_count += 1
 
+            if medir:
+                if len(fila) >= self.pico_fila:
+                    self.pico_fila = len(fila) + 1
+                # entrada deixada para trás por uma melhora de g: o nó é
+                # expandido de novo, com o g atual
+                if atual != inicio and f != g[atual] + w * heuristica(atual):
+                    self.descartes += 1
+
             if atual == objetivo:
+                self.status = self.ENCONTRADO
                 return True
 
-            for viz in self._vizinhos(atual):
+            for d in desloc[mascaras[atual]]:
+                viz = atual + d
                 novo_g = g[atual] + custo_mov
                 if viz not in g or novo_g < g[viz]:
                     g[viz] = novo_g
-                    f = novo_g + w * self._heuristica(viz)
+                    f = novo_g + w * heuristica(viz)
                     self.pais[viz] = atual
                     heapq.heappush(fila, (f, viz))
 
         return False
 
-    def _heuristica(self, no: Coordenada) -> int:
+    def _a_estrela_indexado_nucleo(self, w: float, custo_mov: float) -> bool:
+        """
+        Laço do A* com fila indexada. Todo o estado (g, pais, posições na
+        fila) fica nos arrays do contexto, reiniciado em O(1): execuções
+        repetidas no mesmo contexto não alocam nada proporcional ao grid.
+        A heurística é calculada na relaxação, e não lida de
+        tabela_heuristica(), que custaria O(linhas x colunas) por busca.
+        As marcas de visualização do contexto são preservadas.
+
+        :param w: Peso da heurística
+        :param custo_mov: Custo de cada movimento
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        contexto = self.contexto
+        contexto.reiniciar(marcas=False)
+        geracao = contexto.geracao
+        inicio = self.no_inicio
+        objetivo = self.no_objetivo
+        colunas = self.colunas
+        oi, oj = self.objetivo
+
+        self.passos = 0
+        self.visitados_count = 0
+        self.descartes = 0
+        self.pais = contexto.pais
+        self.status = self.SEM_CAMINHO
+
+        vistos, g = contexto.g.carimbos, contexto.g.valores
+        pais_carimbos, pais = contexto.pais.carimbos, contexto.pais.valores
+        fila = contexto.fila
+        f = fila.f
+        posicoes = fila.posicoes
+        inserir, diminuir, remover = fila.inserir, fila.diminuir, fila.remover_minimo
+
+        vistos[inicio] = geracao
+        g[inicio] = 0.0
+        f[inicio] = w * self._heuristica(inicio)
+        inserir(inicio)
+
+        mascaras, desloc = self._mascaras, self._desloc
+
+        limite = self.limite_expansoes
+        prazo = None
+        if self.limite_tempo is not None:
+            prazo = time.perf_counter() + self.limite_tempo
+
+        encontrado = False
+        while len(fila):
+            if limite is not None and self.passos >= limite:
+                self.status = self.ORCAMENTO_EXCEDIDO
+                break
+            if (prazo is not None and self.passos % self.INTERVALO_RELOGIO == 0
+                    and time.perf_counter() > prazo):
+                self.status = self.ORCAMENTO_EXCEDIDO
+                break
+
+            atual = remover()
+            self.passos += 1
+
+            if atual == objetivo:
+                self.status = self.ENCONTRADO
+                encontrado = True
+                break
+
+            novo_g = g[atual] + custo_mov
+            for d in desloc[mascaras[atual]]:
+                viz = atual + d
+                if vistos[viz] != geracao or novo_g < g[viz]:
+                    g[viz] = novo_g
+                    i, j = divmod(viz, colunas)
+                    f[viz] = novo_g + w * (abs(i - oi) + abs(j - oj))
+                    pais[viz] = atual
+                    pais_carimbos[viz] = geracao
+                    if posicoes[viz] >= 0:
+                        diminuir(viz)
+                    else:
+                        # primeira descoberta ou reabertura (w > 1)
+                        vistos[viz] = geracao
+                        inserir(viz)
+
+        self.visitados_count = self.passos
+        self.pico_fila = fila.pico
+        return encontrado
+
+    def tabela_heuristica(self) -> array:
+        """
+        Distância Manhattan de todas as células até o objetivo (int32, ordem de linha).
+
+        Calculada uma vez por busca; cada linha é montada em C somando a
+        distância da linha à lista de distâncias das colunas.
+
+        :return: Tabela indexada pelo nó
+        """
+        if self._tabela_h is None:
+            oi, oj = self.objetivo
+            dist_colunas = [abs(j - oj) for j in range(self.colunas)]
+
+            tabela = array("i")
+            for i in range(self.linhas):
+                tabela.extend(map(add, dist_colunas, repeat(abs(i - oi))))
+            self._tabela_h = tabela
+
+        return self._tabela_h
+
+    def _heuristica(self, no: No) -> int:
         """
         Heurística Manhattan utilizada pelo A*.
 
-        :param no: Coordenada atual
+        :param no: Nó atual
         :return: Distância Manhattan até o objetivo
         """
-        return abs(no[0] - self.objetivo[0]) + abs(no[1] - self.objetivo[1])
+        i, j = divmod(no, self.colunas)
+        return abs(i - self.objetivo[0]) + abs(j - self.objetivo[1])
+
+    # ================= JPS =================
+
+    def _saltar_horizontal(self, no: No, d: int) -> No:
+        """
+        Salto horizontal a partir de no (exclusive), no sentido d (+1/-1).
+
+        O resultado vale para toda célula percorrida antes do ponto de
+        salto, então fica guardado para cada uma delas: os saltos feitos a
+        cada passo de um salto vertical não varrem a mesma linha de novo.
+
+        :return: Nó do ponto de salto ou -1 se bater em obstáculo/borda
+        """
+        memo = self._saltos_horizontais[d]
+        mascaras = self._mascaras
+        objetivo = self.no_objetivo
+        grid = self.grid
+        bit = grid.VIZ_DIREITA if d > 0 else grid.VIZ_ESQUERDA
+        lados = grid.VIZ_CIMA | grid.VIZ_BAIXO
+
+        percorridos: List[No] = []
+        while True:
+            resultado = memo.get(no)
+            if resultado is not None:
+                break
+            percorridos.append(no)
+
+            mascara = mascaras[no]
+            if not mascara & bit:
+                resultado = -1
+                break
+            no += d
+            # vizinho forçado: um lado livre aqui e bloqueado na célula anterior
+            if no == objetivo or mascaras[no] & ~mascara & lados:
+                resultado = no
+                break
+
+        for no in percorridos:
+            memo[no] = resultado
+        return resultado
+
+    def _saltar(self, no: No, di: int, dj: int) -> Optional[No]:
+        """
+        Avança em linha reta a partir de no (exclusive), na direção (di, dj),
+        até encontrar um ponto de salto: o objetivo, uma célula com vizinho
+        forçado ou, em movimentos verticais, uma célula da qual um salto
+        horizontal encontra algo. A passabilidade vem da máscara de vizinhos.
+
+        :return: Nó do ponto de salto ou None se bater em obstáculo/borda
+        """
+        if dj != 0:
+            salto = self._saltar_horizontal(no, dj)
+            return salto if salto >= 0 else None
+
+        mascaras = self._mascaras
+        objetivo = self.no_objetivo
+        grid = self.grid
+        bit = grid.VIZ_BAIXO if di > 0 else grid.VIZ_CIMA
+        esquerda, direita = grid.VIZ_ESQUERDA, grid.VIZ_DIREITA
+        d = di * self.colunas
+        horizontal = self._saltar_horizontal
+
+        mascara = mascaras[no]
+        while mascara & bit:
+            no += d
+            anterior, mascara = mascara, mascaras[no]
+            if no == objetivo or mascara & ~anterior & (esquerda | direita):
+                return no
+            # na vertical, qualquer salto horizontal bem-sucedido
+            # torna esta célula um ponto de salto
+            if ((mascara & direita and horizontal(no, 1) >= 0)
+                    or (mascara & esquerda and horizontal(no, -1) >= 0)):
+                return no
+
+        return None
+
+    def _direcoes_jps(self, no: No) -> List[Tuple[int, int]]:
+        """
+        Direções a explorar a partir de um ponto de salto, podadas de acordo
+        com a direção de chegada (sem pai: as quatro).
+        """
+        pai = self.pais.get(no)
+        if pai is None:
+            return [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+        i, j = divmod(no, self.colunas)
+        pi, pj = divmod(pai, self.colunas)
+        di = (i > pi) - (i < pi)
+        dj = (j > pj) - (j < pj)
+
+        if dj != 0:
+            return [(-1, 0), (1, 0), (0, dj)]
+        return [(0, -1), (0, 1), (di, 0)]
+
+    def _expandir_jps(
+        self,
+        atual: No,
+        g: Dict[No, int],
+        fila: List[Tuple[int, No]],
+        fechados: set
+    ) -> List[No]:
+        """
+        Gera os sucessores de um ponto de salto e atualiza g, pais e a fila.
+
+        :return: Pontos de salto descobertos ou melhorados
+        """
+        colunas = self.colunas
+        oi, oj = self.objetivo
+        i, j = divmod(atual, colunas)
+        g_atual = g[atual]
+        pais = self.pais
+        novos: List[No] = []
+
+        for di, dj in self._direcoes_jps(atual):
+            salto = self._saltar(atual, di, dj)
+            if salto is None or salto in fechados:
+                continue
+
+            si, sj = divmod(salto, colunas)
+            novo_g = g_atual + abs(si - i) + abs(sj - j)
+            if salto not in g or novo_g < g[salto]:
+                g[salto] = novo_g
+                pais[salto] = atual
+                heapq.heappush(fila, (novo_g + abs(si - oi) + abs(sj - oj), salto))
+                novos.append(salto)
+
+        return novos
+
+    def _interpolar_caminho_jps(self) -> None:
+        """
+        Preenche os pais das células entre pontos de salto consecutivos,
+        para que reconstruir_caminho devolva o caminho célula a célula.
+        """
+        saltos = [self.no_objetivo]
+        while saltos[-1] != self.no_inicio:
+            saltos.append(self.pais[saltos[-1]])
+
+        for no, pai in zip(saltos, saltos[1:]):
+            passo = 1 if pai > no else -1
+            if pai // self.colunas != no // self.colunas:
+                passo *= self.colunas
+            while no != pai:
+                self.pais[no] = no + passo
+                no += passo
+
+    def jps(self) -> Generator[None, None, bool]:
+        """
+        Executa Jump Point Search (variante 4-conectada) de forma incremental.
+
+        Expande apenas pontos de salto; o caminho tem o mesmo comprimento
+        ótimo de BFS/Dijkstra/A*.
+        """
+        contexto = self._iniciar_incremental()
+        self._saltos_horizontais = {1: {}, -1: {}}
+        fila: List[Tuple[int, No]] = [(0, self.no_inicio)]
+        g = contexto.g
+        g[self.no_inicio] = 0
+        fechados = contexto.fechados
+
+        while fila:
+            _, atual = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            fechados.add(atual)
+            self.passos += 1
+
+            if atual == self.no_objetivo:
+                self._interpolar_caminho_jps()
+                return True
+
+            for salto in self._expandir_jps(atual, g, fila, fechados):
+                self._marcar_visitado(salto)
+
+            yield
+
+        return False
+
+    def jps_rapido(self) -> bool:
+        """
+        Executa Jump Point Search sem visualização (modo rápido).
+
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        self._reiniciar_contadores()
+        self._saltos_horizontais = {1: {}, -1: {}}
+
+        fila: List[Tuple[int, No]] = [(0, self.no_inicio)]
+        g: Dict[No, int] = {self.no_inicio: 0}
+        fechados: set = set()
+
+        while fila:
+            _, atual = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            fechados.add(atual)
+            self.passos += 1
+
+            if atual == self.no_objetivo:
+                self.visitados_count = len(g) - 1
+                self._interpolar_caminho_jps()
+                return True
+
+            self._expandir_jps(atual, g, fila, fechados)
+
+        self.visitados_count = len(g) - 1
+        return False
+
+    # ================= BIDIRECIONAIS =================
+
+    def _heuristica_inicio(self, no: No) -> int:
+        """
+        Heurística Manhattan até o início, usada pela busca reversa.
+
+        :param no: Nó atual
+        :return: Distância Manhattan até o início
+        """
+        i, j = divmod(no, self.colunas)
+        return abs(i - self.inicio[0]) + abs(j - self.inicio[1])
+
+    def _inicio_no_objetivo(self) -> bool:
+        """
+        Início e objetivo no mesmo nó: as duas buscas se encontrariam na
+        semente e o pai do início seria sobrescrito. Como nas buscas
+        unidirecionais, conta a expansão do início e termina sem caminho
+        a percorrer.
+        """
+        if self.no_inicio != self.no_objetivo:
+            return False
+        self.passos += 1
+        return True
+
+    def _unir_caminhos(self, encontro: No, pais_reversos: Dict[No, Optional[No]]) -> None:
+        """
+        Copia para self.pais a metade do caminho encontrada pela busca reversa,
+        do ponto de encontro até o objetivo, invertendo o sentido dos pais.
+
+        :param encontro: Nó onde as duas buscas se encontraram
+        :param pais_reversos: Pais da busca que partiu do objetivo
+        """
+        no = encontro
+        while no != self.no_objetivo:
+            proximo = pais_reversos[no]
+            self.pais[proximo] = no
+            no = proximo
+
+    def _novo_estado_bfs_bidirecional(self) -> dict:
+        """
+        Estado inicial da BFS bidirecional: uma camada por lado. O lado do
+        início guarda os pais em self.pais (o início é pai de si mesmo).
+        """
+        self.pais[self.no_inicio] = self.no_inicio
+        lados = [
+            {"pais": self.pais, "camada": [self.no_inicio], "pos": 0, "proxima": []},
+            {"pais": {self.no_objetivo: None}, "camada": [self.no_objetivo], "pos": 0, "proxima": []},
+        ]
+        return {"lados": lados, "ativo": 0}
+
+    def _passo_bfs_bidirecional(self, estado: dict, marcar: bool) -> Optional[bool]:
+        """
+        Expande um nó da BFS bidirecional.
+
+        Cada lado avança uma camada inteira por vez; ao fim de uma camada,
+        continua o lado cuja próxima camada é menor. O primeiro nó descoberto
+        por um lado que já foi alcançado pelo outro fecha o caminho mínimo.
+
+        :return: True/False ao terminar, None se ainda há trabalho
+        """
+        lados = estado["lados"]
+        lado = lados[estado["ativo"]]
+
+        if lado["pos"] == len(lado["camada"]):
+            for l in lados:
+                if l["pos"] == len(l["camada"]):
+                    l["camada"], l["pos"], l["proxima"] = l["proxima"], 0, []
+                if not l["camada"]:
+                    return False
+            estado["ativo"] = 0 if len(lados[0]["camada"]) <= len(lados[1]["camada"]) else 1
+            lado = lados[estado["ativo"]]
+
+        outro = lados[1 - estado["ativo"]]["pais"]
+        pais = lado["pais"]
+
+        atual = lado["camada"][lado["pos"]]
+        lado["pos"] += 1
+        self.passos += 1
+
+        for d in self._desloc[self._mascaras[atual]]:
+            viz = atual + d
+            if viz not in pais:
+                pais[viz] = atual
+                lado["proxima"].append(viz)
+                if marcar:
+                    self._marcar_visitado(viz)
+                else:
+                    self.visitados_count += 1
+
+                if viz in outro:
+                    self._unir_caminhos(viz, lados[1]["pais"])
+                    return True
+
+        return None
+
+    def bfs_bidirecional(self) -> Generator[None, None, bool]:
+        """
+        Executa a BFS simultaneamente a partir do início e do objetivo,
+        de forma incremental, parando quando as duas buscas se encontram.
+        """
+        self._iniciar_incremental()
+        if self._inicio_no_objetivo():
+            return True
+        estado = self._novo_estado_bfs_bidirecional()
+
+        while True:
+            resultado = self._passo_bfs_bidirecional(estado, marcar=True)
+            if resultado is not None:
+                return resultado
+            yield
+
+    def bfs_bidirecional_rapido(self) -> bool:
+        """
+        Executa a BFS bidirecional sem visualização (modo rápido).
+
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        self._reiniciar_contadores()
+        if self._inicio_no_objetivo():
+            return True
+        estado = self._novo_estado_bfs_bidirecional()
+
+        while True:
+            resultado = self._passo_bfs_bidirecional(estado, marcar=False)
+            if resultado is not None:
+                return resultado
+
+    def _novo_estado_a_estrela_bidirecional(self, g=None, fechados=None) -> dict:
+        """
+        Estado inicial do A* bidirecional: fila, g e fechados de cada lado.
+        O lado do início guarda os pais em self.pais.
+
+        :param g: Custos do lado do início (padrão: dicionário novo)
+        :param fechados: Fechados do lado do início (padrão: conjunto novo)
+        """
+        g = {} if g is None else g
+        g[self.no_inicio] = 0
+        lados = [
+            {"fila": [(0, self.no_inicio)], "g": g,
+             "pais": self.pais, "fechados": set() if fechados is None else fechados,
+             "h": self._heuristica},
+            {"fila": [(0, self.no_objetivo)], "g": {self.no_objetivo: 0},
+             "pais": {}, "fechados": set(), "h": self._heuristica_inicio},
+        ]
+        return {"lados": lados, "melhor": float("inf"), "encontro": None}
+
+    def _passo_a_estrela_bidirecional(self, estado: dict, marcar: bool) -> Optional[bool]:
+        """
+        Expande um nó do A* bidirecional (lado com a menor fila aberta).
+
+        Critério de parada: o melhor caminho já visto (melhor) não é maior
+        que o maior dos dois menores f abertos; como a heurística Manhattan
+        é consistente, nenhum caminho ainda não visto pode ser mais curto
+        (com w = 1).
+
+        :return: True/False ao terminar, None se ainda há trabalho
+        """
+        lados = estado["lados"]
+        frente, tras = lados
+
+        if not frente["fila"] or not tras["fila"]:
+            return self._concluir_a_estrela_bidirecional(estado)
+
+        if estado["melhor"] <= max(frente["fila"][0][0], tras["fila"][0][0]):
+            return self._concluir_a_estrela_bidirecional(estado)
+
+        ativo = 0 if len(frente["fila"]) <= len(tras["fila"]) else 1
+        lado, outro = lados[ativo], lados[1 - ativo]
+
+        _, atual = heapq.heappop(lado["fila"])
+        if atual in lado["fechados"]:
+            return None
+        lado["fechados"].add(atual)
+        self.passos += 1
+
+        w = getattr(self, "w_heuristica", 1.0)
+        custo_mov = getattr(self, "custo_movimento", 1.0)
+        g, g_outro, h = lado["g"], outro["g"], lado["h"]
+        novo_g = g[atual] + custo_mov
+
+        for d in self._desloc[self._mascaras[atual]]:
+            viz = atual + d
+            if viz in lado["fechados"]:
+                continue
+            if viz not in g or novo_g < g[viz]:
+                g[viz] = novo_g
+                lado["pais"][viz] = atual
+                heapq.heappush(lado["fila"], (novo_g + w * h(viz), viz))
+                if marcar:
+                    self._marcar_visitado(viz)
+                else:
+                    self.visitados_count += 1
+
+                if viz in g_outro and novo_g + g_outro[viz] < estado["melhor"]:
+                    estado["melhor"] = novo_g + g_outro[viz]
+                    estado["encontro"] = viz
+
+        return None
+
+    def _concluir_a_estrela_bidirecional(self, estado: dict) -> bool:
+        """
+        Monta o caminho pelo ponto de encontro, se houver.
+        """
+        encontro = estado["encontro"]
+        if encontro is None:
+            return False
+
+        self._unir_caminhos(encontro, estado["lados"][1]["pais"])
+        return True
+
+    def a_estrela_bidirecional(self) -> Generator[None, None, bool]:
+        """
+        Executa o A* simultaneamente a partir do início e do objetivo,
+        de forma incremental.
+        """
+        contexto = self._iniciar_incremental()
+        if self._inicio_no_objetivo():
+            return True
+        estado = self._novo_estado_a_estrela_bidirecional(contexto.g, contexto.fechados)
+
+        while True:
+            resultado = self._passo_a_estrela_bidirecional(estado, marcar=True)
+            if resultado is not None:
+                return resultado
+            yield
+
+    def a_estrela_bidirecional_rapido(self) -> bool:
+        """
+        Executa o A* bidirecional sem visualização (modo rápido).
+
+        :return: True se encontrar o objetivo, False caso contrário
+        """
+        self._reiniciar_contadores()
+        if self._inicio_no_objetivo():
+            return True
+        estado = self._novo_estado_a_estrela_bidirecional()
+
+        while True:
+            resultado = self._passo_a_estrela_bidirecional(estado, marcar=False)
+            if resultado is not None:
+                return resultado
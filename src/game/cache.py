@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+Valor = TypeVar("Valor")
+
+
+class CacheLRU(Generic[Valor]):
+    """
+    Cache de tamanho limitado com descarte do item usado há mais tempo (LRU).
+
+    Mantém contadores de acertos e falhas para medir a eficácia do cache.
+    """
+
+    def __init__(self, capacidade: int = 1024) -> None:
+        """
+        Inicializa o cache.
+
+        :param capacidade: Número máximo de itens guardados (0 desativa o cache)
+        """
+        self.capacidade: int = capacidade
+        self._itens: "OrderedDict[Hashable, Valor]" = OrderedDict()
+
+        self.acertos: int = 0
+        self.falhas: int = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._itens
+
+    def obter(self, chave: Hashable) -> Optional[Valor]:
+        """
+        Busca um item, marcando-o como usado recentemente.
+
+        :param chave: Chave do item
+        :return: Valor guardado ou None se não estiver no cache
+        """
+        valor = self._itens.get(chave)
+        if valor is None:
+            self.falhas += 1
+            return None
+
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave: Hashable, valor: Valor) -> None:
+        """
+        Guarda um item, descartando o menos usado se o cache estiver cheio.
+
+        :param chave: Chave do item
+        :param valor: Valor a guardar
+        """
+        if self.capacidade <= 0:
+            return
+
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+
+        while len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def limpar(self, contadores: bool = True) -> None:
+        """
+        Remove todos os itens e, por padrão, zera os contadores.
+
+        :param contadores: Se False, mantém acertos e falhas (útil quando o
+            cache é invalidado, mas a medição deve continuar)
+        """
+        self._itens.clear()
+        if contadores:
+            self.acertos = 0
+            self.falhas = 0
+
+    @property
+    def taxa_acerto(self) -> float:
+        """
+        Fração das consultas atendidas pelo cache.
+        """
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
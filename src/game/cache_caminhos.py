@@ -0,0 +1,73 @@
+from typing import Hashable, Optional, Tuple
+
+from game.busca import Buscas, Coordenada, ResultadoBusca
+from game.cache import CacheLRU
+
+
+class CacheCaminhos:
+    """
+    Cache de consultas de caminho na frente de Buscas.resolver.
+
+    A chave é (versão do grid, algoritmo, parâmetros, início, objetivo).
+    Como Grid.versao muda a cada edição do mapa e nunca se repete entre
+    grids, resultados de um mapa editado simplesmente deixam de ser
+    encontrados e saem pelo descarte LRU, sem invalidação explícita.
+    """
+
+    def __init__(self, capacidade: int = 1024) -> None:
+        """
+        :param capacidade: Máximo de resultados guardados
+        """
+        self.cache: CacheLRU[ResultadoBusca] = CacheLRU(capacidade)
+
+    @property
+    def acertos(self) -> int:
+        return self.cache.acertos
+
+    @property
+    def falhas(self) -> int:
+        return self.cache.falhas
+
+    @property
+    def taxa_acerto(self) -> float:
+        return self.cache.taxa_acerto
+
+    def resolver(
+        self,
+        grid,
+        algoritmo: str,
+        inicio: Optional[Coordenada] = None,
+        objetivo: Optional[Coordenada] = None,
+        **parametros
+    ) -> ResultadoBusca:
+        """
+        Resolve (ou devolve do cache) a consulta no modo rápido.
+
+        :param grid: Grid do mapa
+        :param algoritmo: Nome do algoritmo (chave de Buscas.ALGORITMOS_RAPIDOS)
+        :param inicio: Coordenada inicial (padrão: o início marcado no grid)
+        :param objetivo: Coordenada final (padrão: o objetivo marcado no grid)
+        :param parametros: Atributos aplicados à busca antes de rodar, por
+            exemplo w_heuristica, custo_movimento ou limite_expansoes
+        :return: Mesmo resultado de Buscas.resolver
+        """
+        inicio = inicio or grid.encontrar(grid.INICIO)
+        objetivo = objetivo or grid.encontrar(grid.OBJETIVO)
+        chave: Tuple[Hashable, ...] = (
+            grid.versao, algoritmo, tuple(sorted(parametros.items())), inicio, objetivo
+        )
+        resultado: Optional[ResultadoBusca] = self.cache.obter(chave)
+
+        if resultado is None:
+            busca = Buscas(grid, inicio, objetivo)
+            for nome, valor in parametros.items():
+                setattr(busca, nome, valor)
+            resultado = busca.resolver(algoritmo)
+
+            # resultados interrompidos pelo limite de tempo não se repetem
+            if (resultado["status"] != Buscas.ORCAMENTO_EXCEDIDO
+                    or parametros.get("limite_tempo") is None):
+                self.cache.guardar(chave, resultado)
+
+        # cópia do caminho: quem chama pode alterá-lo sem afetar o cache
+        return dict(resultado, caminho=list(resultado["caminho"]))
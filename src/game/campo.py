@@ -0,0 +1,187 @@
+"""
+Campos de distância: uma busca reversa a partir do(s) objetivo(s) responde
+ao caminho de qualquer ponto de partida.
+
+Quando muitas unidades vão para o mesmo objetivo, uma BFS do objetivo sobre
+o grid inteiro custa o mesmo que uma única busca, e depois cada caminho sai
+por descida de gradiente no campo em O(comprimento do caminho).
+"""
+
+from array import array
+from typing import Iterable, List, Optional, Sequence
+
+from game.busca import Buscas, Coordenada, No
+from game.cache import CacheLRU
+
+INALCANCAVEL = -1
+
+
+class CampoDistancia:
+    """
+    Distância (em passos) de cada célula ao objetivo mais próximo.
+
+    As distâncias ficam em um array int32 em ordem de linha, com
+    INALCANCAVEL para obstáculos e células sem caminho até um objetivo.
+
+    O campo guarda a versão do grid em que foi calculado; se o mapa for
+    editado depois, a próxima consulta refaz o campo antes de responder.
+    """
+
+    def __init__(self, grid, objetivos: Optional[Sequence[Coordenada]] = None) -> None:
+        """
+        Calcula o campo com uma BFS reversa por camadas a partir dos objetivos.
+
+        :param grid: Grid do mapa
+        :param objetivos: Uma ou mais coordenadas de destino (padrão: todos
+            os objetivos marcados no grid)
+        """
+        self.grid = grid
+        self.linhas: int = grid.linhas
+        self.colunas: int = grid.colunas
+        self.objetivos: List[Coordenada] = list(
+            objetivos if objetivos is not None else grid.objetivos()
+        )
+        self._calcular()
+
+    def _calcular(self) -> None:
+        """
+        BFS reversa no estado atual do grid.
+        """
+        grid = self.grid
+        busca = Buscas(grid)
+        self.versao: int = grid.versao
+        # máscara viva do grid: a versão acima acusa qualquer edição
+        self._mascaras = busca._mascaras
+        self._desloc = busca._desloc
+
+        dist = array("i", [INALCANCAVEL]) * len(grid.celulas)
+        camada: List[No] = []
+        for i, j in self.objetivos:
+            no = i * self.colunas + j
+            if grid.celulas[no] != grid.OBSTACULO and dist[no] < 0:
+                dist[no] = 0
+                camada.append(no)
+
+        mascaras = self._mascaras
+        desloc = self._desloc
+        distancia = 0
+        while camada:
+            distancia += 1
+            proxima: List[No] = []
+            for no in camada:
+                for d in desloc[mascaras[no]]:
+                    viz = no + d
+                    if dist[viz] < 0:
+                        dist[viz] = distancia
+                        proxima.append(viz)
+            camada = proxima
+
+        self.distancias: array = dist
+
+    def _conferir(self) -> None:
+        # grid editado desde o cálculo: as distâncias não valem mais
+        if self.grid.versao != self.versao:
+            self._calcular()
+
+    def distancia(self, coord: Coordenada) -> Optional[int]:
+        """
+        :param coord: Coordenada de partida
+        :return: Passos até o objetivo mais próximo, ou None se inalcançável
+        """
+        self._conferir()
+        d = self.distancias[coord[0] * self.colunas + coord[1]]
+        return d if d >= 0 else None
+
+    def caminho(self, inicio: Coordenada) -> List[Coordenada]:
+        """
+        Caminho mínimo de inicio até o objetivo mais próximo, seguindo a cada
+        passo um vizinho com distância uma unidade menor.
+
+        Mesmo formato de Buscas.caminho: sem o início, terminando no objetivo.
+
+        :param inicio: Coordenada de partida
+        :return: Lista de coordenadas (vazia se inalcançável ou já no objetivo)
+        """
+        self._conferir()
+        dist = self.distancias
+        mascaras = self._mascaras
+        desloc = self._desloc
+
+        atual = inicio[0] * self.colunas + inicio[1]
+        d = dist[atual]
+        if d < 0:
+            return []
+
+        caminho: List[No] = []
+        while d > 0:
+            d -= 1
+            for passo in desloc[mascaras[atual]]:
+                if dist[atual + passo] == d:
+                    atual += passo
+                    break
+            caminho.append(atual)
+
+        return [divmod(no, self.colunas) for no in caminho]
+
+
+class CacheCampos:
+    """
+    Campos de distância por objetivo, com descarte LRU.
+
+    O cache observa o grid: qualquer edição (set_celula, limpar, carregar)
+    invalida todos os campos guardados.
+    """
+
+    def __init__(self, grid, capacidade: int = 16) -> None:
+        """
+        :param grid: Grid do mapa
+        :param capacidade: Máximo de campos guardados (cada um ocupa 4 bytes por célula)
+        """
+        self.grid = grid
+        self.cache: CacheLRU[CampoDistancia] = CacheLRU(capacidade)
+        grid.observar(self._ao_alterar)
+
+    def fechar(self) -> None:
+        """
+        Deixa de observar o grid.
+        """
+        self.grid.deixar_de_observar(self._ao_alterar)
+
+    def __enter__(self) -> "CacheCampos":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _ao_alterar(self, no: Optional[No]) -> None:
+        self.cache.limpar(contadores=False)
+
+    def campo(self, objetivos: Iterable[Coordenada]) -> CampoDistancia:
+        """
+        Campo de distância para o conjunto de objetivos, calculado só na
+        primeira consulta.
+
+        :param objetivos: Uma ou mais coordenadas de destino
+        :return: Campo de distância
+        """
+        chave = tuple(sorted(objetivos))
+        campo = self.cache.obter(chave)
+        if campo is None:
+            campo = CampoDistancia(self.grid, chave)
+            self.cache.guardar(chave, campo)
+        return campo
+
+    def caminhos(
+        self,
+        inicios: Iterable[Coordenada],
+        objetivo: Coordenada
+    ) -> List[List[Coordenada]]:
+        """
+        Caminhos de várias unidades até o mesmo objetivo.
+
+        :param inicios: Coordenadas de partida
+        :param objetivo: Coordenada de destino
+        :return: Um caminho por início (vazio se inalcançável)
+        """
+        campo = self.campo([objetivo])
+        return [campo.caminho(inicio) for inicio in inicios]
@@ -0,0 +1,203 @@
+"""
+Estado de busca reutilizável, fora do grid.
+
+As buscas incrementais guardavam visitados, pais e custos em conjuntos e
+dicionários novos a cada execução e pintavam as células visitadas no
+próprio grid, que depois precisava ser varrido inteiro para limpar. Aqui
+esse estado fica em arrays planos alocados uma vez por grid, indexados
+pelo nó. Cada entrada carrega o carimbo da geração em que foi escrita:
+reiniciar() só avança a geração, e tudo que foi escrito antes passa a
+contar como ausente, sem tocar nos arrays.
+"""
+
+from array import array
+from typing import Optional, Set
+
+from game.fila_indexada import FilaIndexada
+from game.grid import CelulasAlteradas, Grid
+
+No = int
+
+# carimbo máximo de array("I"); ao chegar nele, os carimbos são zerados
+_GERACAO_MAXIMA = (1 << 32) - 1
+
+
+class ConjuntoCarimbado:
+    """
+    Conjunto de nós sobre um array de carimbos: o nó pertence ao conjunto
+    se o seu carimbo é a geração atual do contexto.
+
+    Laços quentes podem ler e gravar carimbos (e valores, no mapa) direto;
+    nesse caso len() não conta as entradas gravadas assim.
+    """
+
+    def __init__(self, contexto, n: int) -> None:
+        """
+        :param contexto: Dono da geração (contexto ou geração das marcas)
+        :param n: Quantidade de nós
+        """
+        self._contexto = contexto
+        self.carimbos = array("I", [0]) * n
+        self._tamanho = 0
+        self._geracao = contexto.geracao
+
+    def _zerar_se_antigo(self) -> None:
+        # o tamanho é da geração em que foi contado
+        if self._geracao != self._contexto.geracao:
+            self._geracao = self._contexto.geracao
+            self._tamanho = 0
+
+    def __contains__(self, no: No) -> bool:
+        return self.carimbos[no] == self._contexto.geracao
+
+    def __len__(self) -> int:
+        self._zerar_se_antigo()
+        return self._tamanho
+
+    def add(self, no: No) -> None:
+        geracao = self._contexto.geracao
+        if self.carimbos[no] != geracao:
+            self._zerar_se_antigo()
+            self.carimbos[no] = geracao
+            self._tamanho += 1
+
+
+class MapaCarimbado(ConjuntoCarimbado):
+    """
+    Dicionário nó -> número sobre dois arrays planos (valores e carimbos),
+    com a mesma interface usada pelas buscas: in, [], []= e get.
+    """
+
+    def __init__(self, contexto, n: int, tipo: str) -> None:
+        """
+        :param contexto: Contexto dono da geração
+        :param n: Quantidade de nós
+        :param tipo: Código de tipo do array de valores ("i", "d", "B")
+        """
+        super().__init__(contexto, n)
+        self.valores = array(tipo, [0]) * n
+
+    def __getitem__(self, no: No):
+        if self.carimbos[no] != self._contexto.geracao:
+            raise KeyError(no)
+        return self.valores[no]
+
+    def __setitem__(self, no: No, valor) -> None:
+        self.add(no)
+        self.valores[no] = valor
+
+    def get(self, no: No, padrao=None):
+        if self.carimbos[no] != self._contexto.geracao:
+            return padrao
+        return self.valores[no]
+
+
+class _GeracaoMarcas:
+    """
+    Geração própria das marcas: o A* rápido reinicia o estado da busca
+    sem apagar o que está desenhado.
+    """
+
+    def __init__(self) -> None:
+        self.geracao: int = 1
+
+
+class ContextoBusca:
+    """
+    Visitados, pais, custos e marcas de visualização de uma busca,
+    reaproveitados de uma execução para a outra no mesmo grid.
+
+    As marcas (visitado, caminho) substituem a escrita nas células: o grid
+    continua só com o mapa, e o renderizador desenha a marca por cima das
+    células livres. Como no grid, alteracoes() devolve as células cujas
+    marcas mudaram, para o desenho incremental.
+    """
+
+    def __init__(self, grid) -> None:
+        """
+        Aloca os arrays para todas as células do grid.
+
+        :param grid: Grid do mapa (o tamanho não muda depois, nem em carregar)
+        """
+        self.grid = grid
+        self.geracao: int = 1
+        n = len(grid.celulas)
+
+        self.visitados = ConjuntoCarimbado(self, n)
+        self.fechados = ConjuntoCarimbado(self, n)
+        self.pais = MapaCarimbado(self, n, "i")
+        self.g = MapaCarimbado(self, n, "d")
+        self._geracao_marcas = _GeracaoMarcas()
+        self.marcas = MapaCarimbado(self._geracao_marcas, n, "B")
+
+        # marcas alteradas desde a última consulta de alteracoes(); a
+        # primeira devolve None (redesenho completo)
+        self._alteradas = CelulasAlteradas(n)
+
+        self._fila: Optional[FilaIndexada] = None
+
+    @property
+    def fila(self) -> FilaIndexada:
+        """
+        Fila indexada do A*, sobre os custos de g; alocada na primeira
+        consulta e esvaziada a cada reiniciar().
+        """
+        if self._fila is None:
+            self._fila = FilaIndexada(len(self.grid.celulas), self.g.valores)
+        return self._fila
+
+    def reiniciar(self, marcas: bool = True) -> None:
+        """
+        Descarta o estado da execução anterior em O(1), avançando a geração.
+        As marcas somem da tela no próximo desenho.
+
+        :param marcas: Se False, mantém as marcas de visualização (buscas
+            que não desenham, como o A* rápido, num contexto da tela)
+        """
+        if self.geracao == _GERACAO_MAXIMA:
+            # uma vez a cada 4 bilhões de reinícios: zera de verdade
+            for estrutura in (self.visitados, self.fechados, self.pais, self.g):
+                estrutura.carimbos = array("I", [0]) * len(estrutura.carimbos)
+            self.geracao = 0
+        self.geracao += 1
+        if self._fila is not None:
+            self._fila.limpar()
+
+        if marcas:
+            geracao = self._geracao_marcas
+            if geracao.geracao == _GERACAO_MAXIMA:
+                self.marcas.carimbos = array("I", [0]) * len(self.marcas.carimbos)
+                geracao.geracao = 0
+            geracao.geracao += 1
+            self._alteradas.redesenhar_tudo()
+
+    def marcar(self, no: No, valor: int) -> None:
+        """
+        Marca uma célula para visualização (Grid.VISITADO ou cor de caminho).
+
+        :param no: Nó marcado
+        :param valor: Estado exibido no lugar da célula livre
+        """
+        self.marcas[no] = valor
+        self._alteradas.sujar(no)
+
+    def estado(self, no: No) -> int:
+        """
+        Estado exibido para a célula: a marca, se a célula estiver livre e
+        marcada nesta geração, ou o valor da própria célula.
+
+        :param no: Nó consultado
+        :return: Estado da célula (constantes de Grid)
+        """
+        celula = self.grid.celulas[no]
+        if celula == Grid.LIVRE:
+            return self.marcas.get(no, celula)
+        return celula
+
+    def alteracoes(self) -> Optional[Set[No]]:
+        """
+        Células com marcas alteradas desde a última chamada.
+
+        :return: Conjunto de índices ou None se tudo deve ser redesenhado
+        """
+        return self._alteradas.consumir()
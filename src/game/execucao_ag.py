@@ -0,0 +1,126 @@
+import multiprocessing
+import queue
+import threading
+from typing import Optional
+
+from game.algoritmo_genetico import AlgoritmoGeneticoAStar
+from game.grid import Grid
+
+
+def _executar_ag(linhas: int, colunas: int, celulas: bytes, parametros: dict, fila, cancelamento) -> None:
+    """
+    Corpo do trabalhador: roda o AG completo e publica cada evento na fila.
+
+    Fica no nível do módulo para poder ser alvo de um multiprocessing.Process.
+
+    :param linhas: Linhas do grid
+    :param colunas: Colunas do grid
+    :param celulas: Conteúdo do grid (sem marcas de visualização)
+    :param parametros: Argumentos repassados a AlgoritmoGeneticoAStar
+    :param fila: Fila onde os eventos são publicados
+    :param cancelamento: Evento que, quando sinalizado, interrompe o AG
+    """
+    grid = Grid(linhas, colunas, bytearray(celulas))
+
+    ag = AlgoritmoGeneticoAStar(grid, cancelamento=cancelamento, **parametros)
+    try:
+        for evento in ag.executar_visual():
+            if cancelamento.is_set():
+                break
+            fila.put(evento)
+    finally:
+        ag.fechar()
+
+
+class ExecucaoAG:
+    """
+    Executa o Algoritmo Genético em segundo plano (thread ou processo).
+
+    Os eventos de executar_visual ("individuo", "melhor", "fim") chegam por
+    uma fila que o laço principal consome sem bloquear, de modo que a janela
+    continua respondendo enquanto cada geração é avaliada.
+    """
+
+    def __init__(self, grid, modo: str = "thread", **parametros) -> None:
+        """
+        Prepara a execução (sem iniciá-la).
+
+        :param grid: Grid base; o AG trabalha sobre uma cópia
+        :param modo: "thread" ou "processo"
+        :param parametros: Argumentos de AlgoritmoGeneticoAStar
+            (tamanho_pop, geracoes, processos, semente, ...)
+        """
+        if modo not in ("thread", "processo"):
+            raise ValueError(f"Modo desconhecido: {modo}")
+
+        self.modo: str = modo
+        self._dados = (grid.linhas, grid.colunas, grid.celulas_base())
+        self._parametros = parametros
+
+        if modo == "thread":
+            self._fila = queue.Queue()
+            self._cancelamento = threading.Event()
+        else:
+            self._fila = multiprocessing.Queue()
+            self._cancelamento = multiprocessing.Event()
+
+        self._trabalhador = None
+        self.terminou: bool = False
+
+    def iniciar(self) -> None:
+        """
+        Dispara o trabalhador em segundo plano.
+        """
+        args = self._dados + (self._parametros, self._fila, self._cancelamento)
+
+        if self.modo == "thread":
+            self._trabalhador = threading.Thread(
+                target=_executar_ag, args=args, daemon=True
+            )
+        else:
+            # não-daemon: o AG pode criar o próprio pool de processos
+            self._trabalhador = multiprocessing.Process(target=_executar_ag, args=args)
+
+        self._trabalhador.start()
+
+    @property
+    def em_execucao(self) -> bool:
+        """
+        Indica se o trabalhador ainda está rodando.
+        """
+        return self._trabalhador is not None and self._trabalhador.is_alive()
+
+    def proximo_evento(self) -> Optional[dict]:
+        """
+        Retira o próximo evento da fila, sem bloquear.
+
+        :return: Evento ou None se nenhum estiver disponível
+        """
+        if self._cancelamento.is_set():
+            return None
+
+        try:
+            evento = self._fila.get_nowait()
+        except queue.Empty:
+            return None
+
+        if evento["tipo"] == "fim":
+            self.terminou = True
+        return evento
+
+    def cancelar(self) -> None:
+        """
+        Pede a interrupção do AG; ele para na próxima verificação
+        (entre gerações ou entre avaliações), sem bloquear quem chamou.
+        """
+        self._cancelamento.set()
+
+    def encerrar(self, timeout: Optional[float] = None) -> None:
+        """
+        Cancela e aguarda o trabalhador terminar.
+
+        :param timeout: Tempo máximo de espera em segundos
+        """
+        self.cancelar()
+        if self._trabalhador is not None:
+            self._trabalhador.join(timeout)
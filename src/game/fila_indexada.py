@@ -0,0 +1,135 @@
+"""
+Fila de prioridade indexada (heap binário com decrease-key) para o A*.
+
+Com heapq, cada melhora de custo empilha uma nova tupla (f, nó) e a entrada
+antiga fica na fila até sair como descarte: a fila cresce a cada relaxação
+e cada inserção aloca uma tupla. Aqui o heap guarda só índices de nós, as
+prioridades ficam em arrays planos e a posição de cada nó no heap é
+conhecida, então melhorar o custo de um nó já aberto só o move para cima.
+Cada nó aparece no máximo uma vez e nunca há entradas obsoletas.
+"""
+
+from array import array
+from typing import List
+
+No = int
+
+
+class FilaIndexada:
+    """
+    Heap binário mínimo de nós, ordenado por f e, no empate, pelo maior g
+    (o nó mais perto do objetivo sai primeiro).
+
+    As prioridades são lidas dos arrays f e g: quem chama atualiza os
+    valores e depois avisa a fila com inserir() ou diminuir().
+    """
+
+    def __init__(self, n: int, g: array) -> None:
+        """
+        :param n: Quantidade de nós do grid
+        :param g: Custos desde o início, indexados pelo nó (desempate)
+        """
+        self.f: array = array("d", [0.0]) * n
+        self.g: array = g
+        self._heap: List[No] = []
+        # posição de cada nó no heap (-1 = fora da fila); laços quentes
+        # podem consultá-la direto em vez de usar "no in fila"
+        self.posicoes: array = array("i", [-1]) * n
+        self.pico: int = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, no: No) -> bool:
+        return self.posicoes[no] >= 0
+
+    def limpar(self) -> None:
+        """
+        Esvazia a fila em O(tamanho atual), sem realocar os arrays.
+        """
+        pos = self.posicoes
+        for no in self._heap:
+            pos[no] = -1
+        self._heap.clear()
+        self.pico = 0
+
+    def inserir(self, no: No) -> None:
+        """
+        Insere um nó que não está na fila, com f[no] e g[no] já definidos.
+        """
+        heap = self._heap
+        heap.append(no)
+        if len(heap) > self.pico:
+            self.pico = len(heap)
+        self._subir(len(heap) - 1)
+
+    def diminuir(self, no: No) -> None:
+        """
+        Reposiciona um nó da fila cujo f acabou de diminuir (decrease-key).
+        """
+        self._subir(self.posicoes[no])
+
+    def remover_minimo(self) -> No:
+        """
+        Remove e devolve o nó de menor f (maior g no empate).
+        """
+        heap = self._heap
+        pos = self.posicoes
+        primeiro = heap[0]
+        ultimo = heap.pop()
+        pos[primeiro] = -1
+        if heap:
+            heap[0] = ultimo
+            self._descer(0)
+        return primeiro
+
+    def _subir(self, i: int) -> None:
+        heap, pos, f, g = self._heap, self.posicoes, self.f, self.g
+        no = heap[i]
+        f_no, g_no = f[no], g[no]
+
+        while i > 0:
+            pai = (i - 1) >> 1
+            outro = heap[pai]
+            f_outro = f[outro]
+            if f_no < f_outro or (f_no == f_outro and g_no > g[outro]):
+                heap[i] = outro
+                pos[outro] = i
+                i = pai
+            else:
+                break
+
+        heap[i] = no
+        pos[no] = i
+
+    def _descer(self, i: int) -> None:
+        heap, pos, f, g = self._heap, self.posicoes, self.f, self.g
+        tamanho = len(heap)
+        no = heap[i]
+        f_no, g_no = f[no], g[no]
+
+        while True:
+            filho = 2 * i + 1
+            if filho >= tamanho:
+                break
+
+            # o menor dos dois filhos
+            escolhido = heap[filho]
+            f_escolhido = f[escolhido]
+            if filho + 1 < tamanho:
+                direito = heap[filho + 1]
+                f_direito = f[direito]
+                if f_direito < f_escolhido or (f_direito == f_escolhido
+                                               and g[direito] > g[escolhido]):
+                    filho += 1
+                    escolhido, f_escolhido = direito, f_direito
+
+            if f_escolhido < f_no or (f_escolhido == f_no and g[escolhido] > g_no):
+                heap[i] = escolhido
+                pos[escolhido] = i
+                i = filho
+            else:
+                break
+
+        heap[i] = no
+        pos[no] = i
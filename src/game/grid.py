@@ -1,4 +1,48 @@
-import pygame
+import hashlib
+import itertools
+
+# Fonte das versões de todos os grids do processo: cada edição recebe um
+# número nunca usado antes, então a versão sozinha identifica o conteúdo
+_versoes = itertools.count(1)
+
+
+class CelulasAlteradas:
+    """
+    Células alteradas desde a última consulta, para o desenho incremental;
+    usado pelo grid (edições do mapa) e pelo ContextoBusca (marcas).
+    """
+
+    def __init__(self, total):
+        """
+        :param total: Quantidade de células (acima de um quarto alteradas,
+            vale mais redesenhar tudo)
+        """
+        self._limite = total // 4
+        # None = rastreamento desligado ou redesenho completo pendente
+        self._sujas = None
+
+    def sujar(self, no):
+        sujas = self._sujas
+        if sujas is not None:
+            sujas.add(no)
+            # muitas alterações: sai mais barato redesenhar tudo
+            if len(sujas) > self._limite:
+                self._sujas = None
+
+    def redesenhar_tudo(self):
+        self._sujas = None
+
+    def consumir(self):
+        """
+        Devolve as células alteradas e recomeça a contagem. A primeira
+        chamada liga o rastreamento.
+
+        :return: Conjunto de índices ou None se tudo deve ser redesenhado
+        """
+        sujas = self._sujas
+        self._sujas = set()
+        return sujas
+
 
 class Grid:
     # Estados das células (evita números mágicos)
@@ -11,34 +55,114 @@ class Grid:
     CAM_DFS   = 6
     CAM_DIJK  = 7
     CAM_ASTAR = 8
+    CAM_JPS   = 9
 
-    # Mapeamento de cores
-    CORES = {
-        LIVRE:     (220, 220, 220),
-        OBSTACULO: (50, 50, 50),
-        INICIO:    (0, 0, 255),
-        OBJETIVO:  (0, 200, 0),
-        VISITADO:  (255, 200, 0),
-        CAM_BFS:   (255, 0, 0),
-        CAM_DFS:   (0, 0, 255),
-        CAM_DIJK:  (160, 32, 240),
-        CAM_ASTAR: (0, 150, 0),
-    }
-
-    def __init__(self, linhas, colunas):
+    # Bits da máscara de vizinhança: vizinho livre em cada direção
+    VIZ_CIMA     = 1
+    VIZ_BAIXO    = 2
+    VIZ_ESQUERDA = 4
+    VIZ_DIREITA  = 8
+
+    # Tabela de tradução célula -> 1 se passável, 0 se obstáculo
+    _PASSAVEL = b"\x01" * OBSTACULO + b"\x00" + b"\x01" * (255 - OBSTACULO)
+
+    def __init__(self, linhas, colunas, celulas=None):
         self.linhas = linhas
         self.colunas = colunas
-        self.celulas = [
-            [self.LIVRE for _ in range(colunas)]
-            for _ in range(linhas)
-        ]
+        # Um byte por célula, em ordem de linha: o nó (lin, col)
+        # é o índice lin * colunas + col. Um buffer já pronto e gravável
+        # (por exemplo, um mmap de arquivo) pode ser adotado sem cópia.
+        if celulas is None:
+            celulas = bytearray(linhas * colunas)
+        elif len(celulas) != linhas * colunas:
+            raise ValueError(
+                f"esperadas {linhas * colunas} células, recebidas {len(celulas)}"
+            )
+        self.celulas = celulas
+        # Máscara de 4 bits por célula, construída sob demanda
+        self._vizinhanca = None
+
+        # Nós marcados como início e como objetivo, mantidos por set_celula
+        # (None = ainda não levantados; o levantamento é feito na primeira
+        # consulta, para não percorrer um mapa recém-mapeado de arquivo)
+        self._inicios = None
+        self._objetivos = None
+
+        # Células alteradas desde a última consulta de alteracoes()
+        self._alteradas = CelulasAlteradas(len(celulas))
+
+        # Funções chamadas a cada edição do mapa (ver observar)
+        self._observadores = []
+
+        # Muda a cada edição do mapa (set_celula, limpar, carregar).
+        # Serve de chave para caches.
+        self.versao = next(_versoes)
+
+    def indice(self, lin, col):
+        return lin * self.colunas + col
+
+    def coordenada(self, no):
+        return divmod(no, self.colunas)
 
     def dentro_do_grid(self, lin, col):
         return 0 <= lin < self.linhas and 0 <= col < self.colunas
 
+    def get_celula(self, lin, col):
+        return self.celulas[lin * self.colunas + col]
+
     def set_celula(self, lin, col, valor):
         if self.dentro_do_grid(lin, col):
-            self.celulas[lin][col] = valor
+            no = lin * self.colunas + col
+            antigo = self.celulas[no]
+            self.celulas[no] = valor
+            self._alteradas.sujar(no)
+
+            if self._inicios is not None:
+                if antigo == self.INICIO:
+                    self._inicios.discard(no)
+                elif antigo == self.OBJETIVO:
+                    self._objetivos.discard(no)
+                if valor == self.INICIO:
+                    self._inicios.add(no)
+                elif valor == self.OBJETIVO:
+                    self._objetivos.add(no)
+
+            if (self._vizinhanca is not None
+                    and (antigo == self.OBSTACULO) != (valor == self.OBSTACULO)):
+                self._atualizar_vizinhanca(lin, col, valor != self.OBSTACULO)
+
+            self._notificar(no)
+
+    def observar(self, funcao):
+        """
+        Registra uma função chamada a cada edição do mapa, já com a máscara
+        de vizinhança atualizada. Ela recebe o índice da célula alterada por
+        set_celula, ou None quando o mapa inteiro muda (limpar, carregar).
+
+        :param funcao: Função de um argumento
+        """
+        self._observadores.append(funcao)
+
+    def deixar_de_observar(self, funcao):
+        if funcao in self._observadores:
+            self._observadores.remove(funcao)
+
+    def _notificar(self, no):
+        self.versao = next(_versoes)
+        for funcao in self._observadores:
+            funcao(no)
+
+    def alteracoes(self):
+        """
+        Células alteradas desde a última chamada, para desenho incremental.
+
+        A primeira chamada liga o rastreamento. Devolve None quando o grid
+        inteiro deve ser redesenhado (primeira chamada, limpeza, carga de
+        outro mapa ou alterações demais).
+
+        :return: Conjunto de índices alterados ou None
+        """
+        return self._alteradas.consumir()
 
     def add_obstaculo(self, lin, col):
         self.set_celula(lin, col, self.OBSTACULO)
@@ -49,25 +173,138 @@ class Grid:
     def add_objetivo(self, lin, col):
         self.set_celula(lin, col, self.OBJETIVO)
 
-    def draw(self, screen, cell_size):
-        for lin in range(self.linhas):
-            for col in range(self.colunas):
-                x = col * cell_size
-                y = lin * cell_size
-
-                estado = self.celulas[lin][col]
-                cor = self.CORES.get(estado, (255, 255, 255))
-
-                pygame.draw.rect(
-                    screen,
-                    cor,
-                    (x, y, cell_size, cell_size)
-                )
-
-                # Desenho da grade
-                pygame.draw.rect(
-                    screen,
-                    (100, 100, 100),
-                    (x, y, cell_size, cell_size),
-                    1
-                )
+    def encontrar(self, valor):
+        # Início e objetivo vêm dos conjuntos mantidos por set_celula (o
+        # primeiro em ordem de linha, como na varredura); o resto, varrendo
+        if valor == self.INICIO or valor == self.OBJETIVO:
+            nos = self._extremos(valor)
+            return self.coordenada(min(nos)) if nos else None
+
+        no = self.celulas.find(bytes((valor,)))
+        if no < 0:
+            return None
+        return self.coordenada(no)
+
+    def objetivos(self):
+        """
+        Todos os objetivos marcados no grid, em ordem de linha.
+
+        :return: Lista de coordenadas
+        """
+        return [self.coordenada(no) for no in sorted(self._extremos(self.OBJETIVO))]
+
+    def _extremos(self, valor):
+        if self._inicios is None:
+            self._inicios = self._levantar(self.INICIO)
+            self._objetivos = self._levantar(self.OBJETIVO)
+        return self._inicios if valor == self.INICIO else self._objetivos
+
+    def _levantar(self, valor):
+        alvo = bytes((valor,))
+        nos = set()
+        no = self.celulas.find(alvo)
+        while no >= 0:
+            nos.add(no)
+            no = self.celulas.find(alvo, no + 1)
+        return nos
+
+    def carregar(self, celulas):
+        """
+        Substitui todas as células de uma vez (mapa gerado ou lido de
+        arquivo). A máscara de vizinhança é reconstruída sob demanda.
+
+        :param celulas: Um byte por célula, em ordem de linha
+        """
+        if len(celulas) != len(self.celulas):
+            raise ValueError(
+                f"esperadas {len(self.celulas)} células, recebidas {len(celulas)}"
+            )
+        self.celulas[:] = celulas
+        self._vizinhanca = None
+        self._inicios = self._objetivos = None
+        self._alteradas.redesenhar_tudo()
+        self._notificar(None)
+
+    def limpar(self):
+        self.celulas[:] = bytes(len(self.celulas))
+        self._vizinhanca = None
+        self._inicios, self._objetivos = set(), set()
+        self._alteradas.redesenhar_tudo()
+        self._notificar(None)
+
+    def vizinhanca(self):
+        """
+        Máscara de vizinhos passáveis de cada célula (bits VIZ_*).
+
+        É construída uma vez e mantida por set_celula enquanto apenas
+        células isoladas mudam; buscas sucessivas no mesmo grid a reutilizam.
+        """
+        if self._vizinhanca is None:
+            self._vizinhanca = self._construir_vizinhanca()
+        return self._vizinhanca
+
+    def _construir_vizinhanca(self):
+        # Cada byte de "livre" vale 0 ou 1; tratando o buffer como um inteiro
+        # grande, deslocar em bytes equivale a olhar o vizinho, e todas as
+        # direções são calculadas de uma vez em C.
+        n = len(self.celulas)
+        if n == 0:
+            return bytearray()
+
+        colunas = self.colunas
+        livre = int.from_bytes(self._traduzir(self._PASSAVEL), "little")
+        tudo = (1 << (8 * n)) - 1
+
+        sem_primeira = int.from_bytes((b"\x00" + b"\x01" * (colunas - 1)) * self.linhas, "little")
+        sem_ultima = int.from_bytes((b"\x01" * (colunas - 1) + b"\x00") * self.linhas, "little")
+
+        cima = (livre << (8 * colunas)) & tudo
+        baixo = livre >> (8 * colunas)
+        esquerda = (livre << 8) & sem_primeira
+        direita = (livre >> 8) & sem_ultima
+
+        mascara = (
+            cima * self.VIZ_CIMA
+            | baixo * self.VIZ_BAIXO
+            | esquerda * self.VIZ_ESQUERDA
+            | direita * self.VIZ_DIREITA
+        )
+        return bytearray(mascara.to_bytes(n, "little"))
+
+    def _atualizar_vizinhanca(self, lin, col, passavel):
+        # A célula (lin, col) mudou de passabilidade: ajusta o bit que cada
+        # vizinho usa para apontar para ela
+        mascara = self._vizinhanca
+        no = lin * self.colunas + col
+        vizinhos = (
+            (lin > 0, no - self.colunas, self.VIZ_BAIXO),
+            (lin < self.linhas - 1, no + self.colunas, self.VIZ_CIMA),
+            (col > 0, no - 1, self.VIZ_DIREITA),
+            (col < self.colunas - 1, no + 1, self.VIZ_ESQUERDA),
+        )
+        for existe, viz, bit in vizinhos:
+            if existe:
+                if passavel:
+                    mascara[viz] |= bit
+                else:
+                    mascara[viz] &= ~bit
+
+    def _traduzir(self, tabela):
+        # bytearray traduz direto; outros buffers (mmap) passam por bytes
+        celulas = self.celulas
+        if not isinstance(celulas, (bytes, bytearray)):
+            celulas = bytes(celulas)
+        return celulas.translate(tabela)
+
+    def celulas_base(self):
+        # Cópia das células (o grid só guarda o mapa; as marcas das buscas
+        # ficam no ContextoBusca)
+        return bytes(self.celulas)
+
+    def assinatura(self):
+        # Impressão digital do mapa (dimensões + células)
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.linhas.to_bytes(4, "little"))
+        h.update(self.colunas.to_bytes(4, "little"))
+        h.update(self.celulas_base())
+        return h.digest()
@@ -0,0 +1,463 @@
+"""
+Busca hierárquica (HPA*) para mapas grandes com muitas consultas.
+
+O grid é dividido em clusters quadrados. Em cada fronteira entre dois
+clusters vizinhos, cada trecho contínuo de passagem vira uma ou duas
+entradas; as distâncias entre as entradas de um mesmo cluster são
+calculadas uma vez. Uma consulta liga início e objetivo às entradas dos
+seus clusters, roda o A* nesse grafo abstrato (pequeno) e só então refina
+cada trecho do caminho com buscas locais, dentro de um único cluster.
+
+Edições do grid (set_celula) marcam apenas o cluster da célula; ele e os
+vizinhos afetados são reconstruídos na consulta seguinte.
+"""
+
+from collections import deque
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+from game.busca import Coordenada, No
+from game.grid import Grid
+
+Cluster = int
+
+# Trechos de fronteira a partir deste comprimento ganham duas entradas
+# (nas pontas) em vez de uma no meio
+TRECHO_LONGO = 6
+
+# Tabelas que apagam um bit de direção da máscara (bordas do cluster)
+_SEM = {
+    bit: bytes(m & ~bit for m in range(256))
+    for bit in (Grid.VIZ_CIMA, Grid.VIZ_BAIXO, Grid.VIZ_ESQUERDA, Grid.VIZ_DIREITA)
+}
+
+
+class _Local:
+    """
+    Máscara de vizinhança de um cluster em coordenadas locais, com as
+    passagens para fora do cluster removidas.
+    """
+
+    def __init__(self, grid, mascaras, lin0: int, col0: int, lin1: int, col1: int) -> None:
+        colunas = grid.colunas
+        self.lin0, self.col0 = lin0, col0
+        self.largura = largura = col1 - col0
+
+        mascara = bytearray(b"".join(
+            mascaras[lin * colunas + col0:lin * colunas + col1]
+            for lin in range(lin0, lin1)
+        ))
+        mascara[:largura] = mascara[:largura].translate(_SEM[Grid.VIZ_CIMA])
+        mascara[-largura:] = mascara[-largura:].translate(_SEM[Grid.VIZ_BAIXO])
+        mascara[0::largura] = mascara[0::largura].translate(_SEM[Grid.VIZ_ESQUERDA])
+        mascara[largura - 1::largura] = mascara[largura - 1::largura].translate(_SEM[Grid.VIZ_DIREITA])
+        self.mascara = mascara
+
+        direcoes = (
+            (Grid.VIZ_CIMA, -largura), (Grid.VIZ_BAIXO, largura),
+            (Grid.VIZ_ESQUERDA, -1), (Grid.VIZ_DIREITA, 1),
+        )
+        self.desloc = [
+            tuple(d for bit, d in direcoes if m & bit) for m in range(16)
+        ]
+        self._colunas = colunas
+
+    def para_local(self, no: No) -> int:
+        lin, col = divmod(no, self._colunas)
+        return (lin - self.lin0) * self.largura + (col - self.col0)
+
+    def para_global(self, local: int) -> No:
+        lin, col = divmod(local, self.largura)
+        return (lin + self.lin0) * self._colunas + col + self.col0
+
+    def distancias(self, origem: No) -> List[int]:
+        """
+        BFS dentro do cluster.
+
+        :return: Distância local de cada célula do cluster (-1 = inalcançável)
+        """
+        mascara = self.mascara
+        desloc = self.desloc
+        dist = [-1] * len(mascara)
+        inicio = self.para_local(origem)
+        dist[inicio] = 0
+        fila = deque([inicio])
+        while fila:
+            atual = fila.popleft()
+            proximo = dist[atual] + 1
+            for d in desloc[mascara[atual]]:
+                viz = atual + d
+                if dist[viz] < 0:
+                    dist[viz] = proximo
+                    fila.append(viz)
+        return dist
+
+    def caminho(self, origem: No, destino: No) -> List[No]:
+        """
+        Caminho mínimo dentro do cluster (sem a origem, terminando no destino).
+        """
+        mascara = self.mascara
+        desloc = self.desloc
+        inicio = self.para_local(origem)
+        fim = self.para_local(destino)
+
+        pais = {inicio: inicio}
+        fila = deque([inicio])
+        while fila:
+            atual = fila.popleft()
+            if atual == fim:
+                break
+            for d in desloc[mascara[atual]]:
+                viz = atual + d
+                if viz not in pais:
+                    pais[viz] = atual
+                    fila.append(viz)
+
+        if fim not in pais:
+            return []
+        caminho = []
+        atual = fim
+        while atual != inicio:
+            caminho.append(self.para_global(atual))
+            atual = pais[atual]
+        caminho.reverse()
+        return caminho
+
+
+class BuscaHierarquica:
+    """
+    HPA* sobre um Grid, com abstração construída sob demanda e mantida
+    sob edições.
+
+    O caminho é quase ótimo (as entradas são pontos fixos das fronteiras),
+    mas sempre existe quando há caminho no grid.
+
+    Atributos de medição (última consulta):
+    - expandidos: nós do grafo abstrato expandidos
+    - refinados: trechos refinados por busca local (os demais vêm do cache)
+    - clusters_reconstruidos: clusters refeitos antes da consulta
+    """
+
+    def __init__(self, grid, tamanho_cluster: int = 16) -> None:
+        """
+        :param grid: Grid do mapa
+        :param tamanho_cluster: Lado (em células) de cada cluster
+        """
+        self.grid = grid
+        self.tamanho_cluster: int = tamanho_cluster
+        self.clusters_lin: int = -(-grid.linhas // tamanho_cluster)
+        self.clusters_col: int = -(-grid.colunas // tamanho_cluster)
+
+        self.expandidos: int = 0
+        self.refinados: int = 0
+        self.clusters_reconstruidos: int = 0
+
+        # entradas por fronteira (c1 < c2): pares (nó em c1, nó em c2)
+        self._fronteiras: Dict[Tuple[Cluster, Cluster], List[Tuple[No, No]]] = {}
+        # nós abstratos de cada cluster e distâncias entre eles
+        self._nos: Dict[Cluster, Set[No]] = {}
+        self._intra: Dict[Cluster, Dict[No, Dict[No, int]]] = {}
+        # trechos já refinados entre entradas, por cluster (os que começam
+        # ou terminam no início/objetivo de uma consulta não se repetem)
+        self._trechos: Dict[Cluster, Dict[Tuple[No, No], List[No]]] = {}
+        self._locais: Dict[Cluster, _Local] = {}
+
+        self._sujos: Set[Cluster] = set()
+        self._reconstruir_tudo = True
+        grid.observar(self._ao_alterar)
+
+    # ================= CICLO DE VIDA =================
+
+    def fechar(self) -> None:
+        """
+        Deixa de observar o grid.
+        """
+        self.grid.deixar_de_observar(self._ao_alterar)
+
+    def __enter__(self) -> "BuscaHierarquica":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _ao_alterar(self, no: Optional[No]) -> None:
+        if no is None:
+            self._reconstruir_tudo = True
+        else:
+            self._sujos.add(self.cluster_de(no))
+
+    # ================= CLUSTERS =================
+
+    def cluster_de(self, no: No) -> Cluster:
+        lin, col = divmod(no, self.grid.colunas)
+        k = self.tamanho_cluster
+        return (lin // k) * self.clusters_col + col // k
+
+    def _limites(self, c: Cluster) -> Tuple[int, int, int, int]:
+        ci, cj = divmod(c, self.clusters_col)
+        k = self.tamanho_cluster
+        return (
+            ci * k, cj * k,
+            min((ci + 1) * k, self.grid.linhas), min((cj + 1) * k, self.grid.colunas),
+        )
+
+    def _vizinhos_cluster(self, c: Cluster) -> List[Cluster]:
+        ci, cj = divmod(c, self.clusters_col)
+        vizinhos = []
+        if ci > 0:
+            vizinhos.append(c - self.clusters_col)
+        if ci < self.clusters_lin - 1:
+            vizinhos.append(c + self.clusters_col)
+        if cj > 0:
+            vizinhos.append(c - 1)
+        if cj < self.clusters_col - 1:
+            vizinhos.append(c + 1)
+        return vizinhos
+
+    def _construir_fronteira(self, c1: Cluster, c2: Cluster) -> None:
+        """
+        Cria as entradas da fronteira entre c1 e c2 (c2 abaixo ou à direita).
+        """
+        grid = self.grid
+        colunas = grid.colunas
+        celulas = grid.celulas
+        obstaculo = grid.OBSTACULO
+        l0, c0, l1, c1_ = self._limites(c1)
+
+        if c1 // self.clusters_col == c2 // self.clusters_col:
+            # fronteira vertical: coluna c1_-1 (em c1) e c1_ (em c2)
+            pares = [
+                (lin * colunas + c1_ - 1, lin * colunas + c1_) for lin in range(l0, l1)
+            ]
+        else:
+            # fronteira horizontal: linha l1-1 (em c1) e l1 (em c2)
+            pares = [
+                ((l1 - 1) * colunas + col, l1 * colunas + col) for col in range(c0, c1_)
+            ]
+
+        entradas: List[Tuple[No, No]] = []
+        trecho: List[Tuple[No, No]] = []
+        for par in pares + [None]:
+            if par is not None and celulas[par[0]] != obstaculo and celulas[par[1]] != obstaculo:
+                trecho.append(par)
+                continue
+            if trecho:
+                if len(trecho) >= TRECHO_LONGO:
+                    entradas.extend((trecho[0], trecho[-1]))
+                else:
+                    entradas.append(trecho[len(trecho) // 2])
+                trecho = []
+
+        self._fronteiras[(c1, c2)] = entradas
+
+    def _construir_cluster(self, c: Cluster) -> None:
+        """
+        Recalcula os nós abstratos do cluster e as distâncias entre eles.
+        """
+        nos: Set[No] = set()
+        for v in self._vizinhos_cluster(c):
+            chave = (c, v) if c < v else (v, c)
+            lado = 0 if c < v else 1
+            nos.update(par[lado] for par in self._fronteiras.get(chave, ()))
+
+        local = _Local(self.grid, self._mascaras, *self._limites(c))
+        indices = {no: local.para_local(no) for no in nos}
+        intra: Dict[No, Dict[No, int]] = {}
+        for no in nos:
+            dist = local.distancias(no)
+            intra[no] = {
+                outro: dist[i]
+                for outro, i in indices.items()
+                if outro != no and dist[i] >= 0
+            }
+
+        self._nos[c] = nos
+        self._intra[c] = intra
+        self._locais[c] = local
+        self._trechos[c] = {}
+
+    def _atualizar(self) -> None:
+        """
+        Constrói a abstração (primeira vez ou mapa trocado) ou reconstrói
+        só os clusters editados e os vizinhos que dividem fronteira com eles.
+        """
+        total = self.clusters_lin * self.clusters_col
+        self._mascaras = self.grid.vizinhanca()
+
+        if self._reconstruir_tudo:
+            self._fronteiras.clear()
+            for c in range(total):
+                for v in self._vizinhos_cluster(c):
+                    if v > c:
+                        self._construir_fronteira(c, v)
+            afetados = set(range(total))
+        elif self._sujos:
+            afetados = set(self._sujos)
+            for c in self._sujos:
+                for v in self._vizinhos_cluster(c):
+                    self._construir_fronteira(min(c, v), max(c, v))
+                    afetados.add(v)
+        else:
+            self.clusters_reconstruidos = 0
+            return
+
+        for c in afetados:
+            self._construir_cluster(c)
+
+        self.clusters_reconstruidos = len(afetados)
+        self._sujos.clear()
+        self._reconstruir_tudo = False
+
+    def _entre_clusters(self, no: No) -> List[No]:
+        """
+        Parceiros de um nó abstrato do outro lado das fronteiras do seu cluster.
+        """
+        c = self.cluster_de(no)
+        parceiros = []
+        for v in self._vizinhos_cluster(c):
+            chave, lado = ((c, v), 0) if c < v else ((v, c), 1)
+            for par in self._fronteiras.get(chave, ()):
+                if par[lado] == no:
+                    parceiros.append(par[1 - lado])
+        return parceiros
+
+    # ================= CONSULTA =================
+
+    def _ligacoes(self, no: No) -> Dict[No, int]:
+        """
+        Distâncias de um nó qualquer às entradas do seu cluster.
+        """
+        c = self.cluster_de(no)
+        local = self._locais[c]
+        dist = local.distancias(no)
+        return {
+            outro: dist[local.para_local(outro)]
+            for outro in self._nos[c]
+            if dist[local.para_local(outro)] >= 0
+        }
+
+    def caminho(
+        self,
+        inicio: Optional[Coordenada] = None,
+        objetivo: Optional[Coordenada] = None
+    ) -> List[Coordenada]:
+        """
+        Caminho entre início e objetivo (por padrão, os marcados no grid),
+        no mesmo formato de Buscas.caminho: sem o início, terminando no
+        objetivo.
+
+        :param inicio: Coordenada inicial
+        :param objetivo: Coordenada final
+        :return: Lista de coordenadas (vazia se não houver caminho)
+        """
+        self._atualizar()
+        self.expandidos = 0
+        self.refinados = 0
+
+        inicio = inicio or self.grid.encontrar(Grid.INICIO)
+        objetivo = objetivo or self.grid.encontrar(Grid.OBJETIVO)
+        if inicio is None or objetivo is None:
+            return []
+
+        colunas = self.grid.colunas
+        s = inicio[0] * colunas + inicio[1]
+        t = objetivo[0] * colunas + objetivo[1]
+        if s == t:
+            return []
+        celulas = self.grid.celulas
+        if celulas[s] == Grid.OBSTACULO or celulas[t] == Grid.OBSTACULO:
+            return []
+
+        abstrato = self._buscar_abstrato(s, t)
+        if not abstrato:
+            return []
+        return [divmod(no, colunas) for no in self._refinar(abstrato)]
+
+    def _buscar_abstrato(self, s: No, t: No) -> List[No]:
+        """
+        A* no grafo de entradas, com início e objetivo ligados temporariamente.
+
+        :return: Sequência de nós abstratos de s a t (vazia se não houver)
+        """
+        colunas = self.grid.colunas
+        ti, tj = divmod(t, colunas)
+
+        def h(no: No) -> int:
+            i, j = divmod(no, colunas)
+            return abs(i - ti) + abs(j - tj)
+
+        saida_s = self._ligacoes(s)
+        chegada_t = self._ligacoes(t)
+        if self.cluster_de(s) == self.cluster_de(t):
+            saida_s.update(self._ligacoes_diretas(s, t))
+
+        g: Dict[No, int] = {s: 0}
+        pais: Dict[No, No] = {}
+        fila = [(h(s), 0, s)]
+        fechados: Set[No] = set()
+
+        while fila:
+            _, custo, atual = heapq.heappop(fila)
+            if atual in fechados:
+                continue
+            if atual == t:
+                break
+            fechados.add(atual)
+            self.expandidos += 1
+
+            c = self.cluster_de(atual)
+            if atual == s:
+                vizinhos = list(saida_s.items())
+            else:
+                vizinhos = list(self._intra[c].get(atual, {}).items())
+            if atual != s or s in self._nos[c]:
+                # o início também pode ser uma entrada: segue as arestas dela
+                if atual == s:
+                    vizinhos.extend(self._intra[c].get(s, {}).items())
+                vizinhos.extend((p, 1) for p in self._entre_clusters(atual))
+                if atual in chegada_t:
+                    vizinhos.append((t, chegada_t[atual]))
+
+            for viz, peso in vizinhos:
+                novo = custo + peso
+                if novo < g.get(viz, novo + 1):
+                    g[viz] = novo
+                    pais[viz] = atual
+                    heapq.heappush(fila, (novo + h(viz), novo, viz))
+
+        if t not in pais:
+            return []
+        sequencia = [t]
+        while sequencia[-1] != s:
+            sequencia.append(pais[sequencia[-1]])
+        sequencia.reverse()
+        return sequencia
+
+    def _ligacoes_diretas(self, s: No, t: No) -> Dict[No, int]:
+        # início e objetivo no mesmo cluster: distância local entre eles
+        local = self._locais[self.cluster_de(s)]
+        d = local.distancias(s)[local.para_local(t)]
+        return {t: d} if d >= 0 else {}
+
+    def _refinar(self, abstrato: List[No]) -> List[No]:
+        """
+        Expande a sequência abstrata em células, um trecho por vez.
+        """
+        caminho: List[No] = []
+        for a, b in zip(abstrato, abstrato[1:]):
+            ca, cb = self.cluster_de(a), self.cluster_de(b)
+            if ca != cb:
+                # aresta entre clusters: as células são vizinhas
+                caminho.append(b)
+                continue
+
+            trechos = self._trechos[ca]
+            trecho = trechos.get((a, b))
+            if trecho is None:
+                trecho = self._locais[ca].caminho(a, b)
+                nos = self._nos[ca]
+                if a in nos and b in nos:
+                    trechos[(a, b)] = trecho
+                self.refinados += 1
+            caminho.extend(trecho)
+        return caminho
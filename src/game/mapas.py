@@ -0,0 +1,220 @@
+"""
+Geração de mapas sem interface gráfica.
+
+Os mapas são reprodutíveis (mesma semente, mesmo mapa) e gerados sobre o
+buffer plano de células do Grid: o campo de obstáculos sai de um único
+bloco de bytes aleatórios traduzido por tabela, sem sorteio célula a
+célula, e o caminho garantido usa índices inteiros em vez de tuplas.
+"""
+
+import random
+from array import array
+from itertools import permutations
+from typing import List, Optional, Tuple
+
+from game.grid import Grid
+
+Coordenada = Tuple[int, int]
+
+# Ordens possíveis dos 4 vizinhos (cima, baixo, esquerda, direita); um byte
+# aleatório por célula escolhe a ordem, substituindo o shuffle por nó.
+_ORDENS = list(permutations(range(4)))
+
+# byte aleatório -> índice da ordem. 256 não é múltiplo de 24: os bytes de
+# 240 em diante são rejeitados (_REJEITADO) e a célula sorteia de novo,
+# para que as 24 ordens tenham a mesma probabilidade.
+_REJEITADO = 255
+_ORDEM_DO_BYTE = bytes(
+    b % len(_ORDENS) if b < 240 else _REJEITADO for b in range(256)
+)
+
+
+def _tabela_obstaculos(prob_obstaculo: float) -> bytes:
+    # byte aleatório (0..255) -> OBSTACULO se < limite, senão LIVRE.
+    # A probabilidade efetiva é arredondada para múltiplos de 1/256.
+    limite = max(0, min(256, round(prob_obstaculo * 256)))
+    return bytes([Grid.OBSTACULO]) * limite + bytes([Grid.LIVRE]) * (256 - limite)
+
+
+def _caminho_dfs_nos(
+    linhas: int,
+    colunas: int,
+    inicio: int,
+    fim: int,
+    rng: random.Random
+) -> List[int]:
+    """
+    DFS com ordem de vizinhos aleatória sobre índices planos.
+
+    :return: Nós do início ao fim (vazia se impossível)
+    """
+    # Trabalha num grid com uma borda de sentinelas já visitadas: assim o
+    # laço não precisa testar os limites do mapa
+    largura = colunas + 2
+    visitados = bytearray(b"\x01") * (largura * (linhas + 2))
+    livre = bytes(colunas)
+    for lin in range(linhas):
+        base = (lin + 1) * largura + 1
+        visitados[base:base + colunas] = livre
+
+    pais = array("i", [-1]) * len(visitados)
+    aleatorio = rng.randbytes(len(visitados)).translate(_ORDEM_DO_BYTE)
+
+    desloc = (-largura, largura, -1, 1)
+    ordens = [tuple(desloc[d] for d in ordem) for ordem in _ORDENS]
+
+    def com_borda(no):
+        lin, col = divmod(no, colunas)
+        return (lin + 1) * largura + col + 1
+
+    origem = com_borda(inicio)
+    destino = com_borda(fim)
+
+    pilha = [origem]
+    visitados[origem] = 1
+
+    while pilha:
+        atual = pilha.pop()
+        if atual == destino:
+            break
+
+        ordem = aleatorio[atual]
+        if ordem == _REJEITADO:
+            ordem = rng.randrange(len(ordens))
+        for d in ordens[ordem]:
+            v = atual + d
+            if not visitados[v]:
+                visitados[v] = 1
+                pais[v] = atual
+                pilha.append(v)
+
+    if origem != destino and pais[destino] < 0:
+        return []
+
+    caminho = [fim]
+    atual = destino
+    while atual != origem:
+        atual = pais[atual]
+        lin, col = divmod(atual, largura)
+        caminho.append((lin - 1) * colunas + col - 1)
+
+    caminho.reverse()
+    return caminho
+
+
+def gerar_caminho_dfs(
+    linhas: int,
+    colunas: int,
+    inicio: Coordenada,
+    fim: Coordenada,
+    rng: Optional[random.Random] = None
+) -> List[Coordenada]:
+    """
+    Gera um caminho aleatório entre início e fim usando uma DFS com
+    vizinhos embaralhados. Esse caminho é mantido livre de obstáculos,
+    garantindo que o mapa gerado tenha solução.
+
+    :param linhas: Linhas do grid
+    :param colunas: Colunas do grid
+    :param inicio: Coordenada inicial
+    :param fim: Coordenada final
+    :param rng: Gerador aleatório (None = sem semente)
+    :return: Lista de coordenadas do início ao fim (vazia se impossível)
+    """
+    rng = rng or random.Random()
+
+    nos = _caminho_dfs_nos(
+        linhas, colunas,
+        inicio[0] * colunas + inicio[1],
+        fim[0] * colunas + fim[1],
+        rng
+    )
+    return [divmod(no, colunas) for no in nos]
+
+
+def gerar_celulas(
+    linhas: int,
+    colunas: int,
+    prob_obstaculo: float,
+    inicio: Coordenada,
+    fim: Coordenada,
+    rng: Optional[random.Random] = None
+) -> bytearray:
+    """
+    Gera o buffer de células (um byte por célula, em ordem de linha) com
+    obstáculos aleatórios, início, objetivo e um caminho livre entre eles.
+
+    :param linhas: Linhas do grid
+    :param colunas: Colunas do grid
+    :param prob_obstaculo: Probabilidade de cada célula virar obstáculo
+    :param inicio: Coordenada inicial
+    :param fim: Coordenada final
+    :param rng: Gerador aleatório (None = sem semente)
+    :return: Células prontas para Grid.carregar
+    """
+    rng = rng or random.Random()
+
+    no_inicio = inicio[0] * colunas + inicio[1]
+    no_fim = fim[0] * colunas + fim[1]
+    caminho = _caminho_dfs_nos(linhas, colunas, no_inicio, no_fim, rng)
+
+    n = linhas * colunas
+    celulas = bytearray(rng.randbytes(n).translate(_tabela_obstaculos(prob_obstaculo)))
+
+    livre = Grid.LIVRE
+    for no in caminho:
+        celulas[no] = livre
+
+    celulas[no_inicio] = Grid.INICIO
+    celulas[no_fim] = Grid.OBJETIVO
+    return celulas
+
+
+def gerar_mapa(grid: Grid, prob_obstaculo: float, rng: Optional[random.Random] = None) -> None:
+    """
+    Preenche o grid com obstáculos aleatórios, preservando início e objetivo
+    já marcados e um caminho livre entre eles.
+
+    :param grid: Grid com início (2) e objetivo (3) definidos
+    :param prob_obstaculo: Probabilidade de cada célula virar obstáculo
+    :param rng: Gerador aleatório (None = sem semente)
+    """
+    inicio = grid.encontrar(Grid.INICIO)
+    fim = grid.encontrar(Grid.OBJETIVO)
+    if not inicio or not fim:
+        return
+
+    grid.carregar(
+        gerar_celulas(grid.linhas, grid.colunas, prob_obstaculo, inicio, fim, rng)
+    )
+
+
+def gerar_mapa_aleatorio(
+    linhas: int,
+    colunas: int,
+    prob_obstaculo: float,
+    semente: Optional[int] = None,
+    inicio: Optional[Coordenada] = None,
+    objetivo: Optional[Coordenada] = None
+) -> Grid:
+    """
+    Cria um grid novo e reprodutível: mesma semente, mesmo mapa.
+
+    :param linhas: Linhas do grid
+    :param colunas: Colunas do grid
+    :param prob_obstaculo: Probabilidade de obstáculo por célula
+    :param semente: Semente do gerador aleatório
+    :param inicio: Início (padrão: canto superior esquerdo)
+    :param objetivo: Objetivo (padrão: canto inferior direito)
+    :return: Grid gerado
+    """
+    grid = Grid(linhas, colunas)
+    grid.carregar(
+        gerar_celulas(
+            linhas, colunas, prob_obstaculo,
+            inicio or (0, 0),
+            objetivo or (linhas - 1, colunas - 1),
+            random.Random(semente)
+        )
+    )
+    return grid
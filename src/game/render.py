@@ -0,0 +1,103 @@
+"""
+Desenho do grid com pygame.
+
+É a única parte do pacote que depende do pygame: grid, buscas, AG e
+ferramentas de linha de comando funcionam sem ele instalado.
+"""
+
+import pygame
+
+from game.grid import Grid
+
+
+class RenderizadorGrid:
+    # Mapeamento de cores
+    CORES = {
+        Grid.LIVRE:     (220, 220, 220),
+        Grid.OBSTACULO: (50, 50, 50),
+        Grid.INICIO:    (0, 0, 255),
+        Grid.OBJETIVO:  (0, 200, 0),
+        Grid.VISITADO:  (255, 200, 0),
+        Grid.CAM_BFS:   (255, 0, 0),
+        Grid.CAM_DFS:   (0, 0, 255),
+        Grid.CAM_DIJK:  (160, 32, 240),
+        Grid.CAM_ASTAR: (0, 150, 0),
+        Grid.CAM_JPS:   (255, 105, 180),
+    }
+
+    COR_GRADE = (100, 100, 100)
+
+    def __init__(self, grid, cell_size, contexto=None):
+        self.grid = grid
+        self.cell_size = cell_size
+        # Contexto de busca cujas marcas (visitados, caminho) são desenhadas
+        # sobre as células livres; sem ele, só o mapa
+        self.contexto = contexto
+        # Superfície persistente com o grid desenhado
+        self._superficie = None
+
+    def _estado(self):
+        # Função nó -> estado exibido
+        if self.contexto is not None:
+            return self.contexto.estado
+        return self.grid.celulas.__getitem__
+
+    def draw(self, screen):
+        grid = self.grid
+        cell_size = self.cell_size
+        estado_de = self._estado()
+        for lin in range(grid.linhas):
+            base = lin * grid.colunas
+            for col in range(grid.colunas):
+                x = col * cell_size
+                y = lin * cell_size
+
+                estado = estado_de(base + col)
+                cor = self.CORES.get(estado, (255, 255, 255))
+
+                pygame.draw.rect(
+                    screen,
+                    cor,
+                    (x, y, cell_size, cell_size)
+                )
+
+                # Desenho da grade
+                pygame.draw.rect(
+                    screen,
+                    self.COR_GRADE,
+                    (x, y, cell_size, cell_size),
+                    1
+                )
+
+    def draw_incremental(self, screen):
+        # Mantém o grid desenhado em uma superfície própria e, a cada quadro,
+        # repinta só as células alteradas. O preenchimento fica 1 pixel para
+        # dentro, preservando as linhas da grade desenhadas uma única vez.
+        grid = self.grid
+        cell_size = self.cell_size
+        sujas = grid.alteracoes()
+        if self.contexto is not None:
+            marcadas = self.contexto.alteracoes()
+            if sujas is not None and marcadas is not None:
+                sujas |= marcadas
+            else:
+                sujas = None
+
+        if self._superficie is None or sujas is None:
+            self._superficie = pygame.Surface(
+                (grid.colunas * cell_size, grid.linhas * cell_size)
+            )
+            self.draw(self._superficie)
+        elif sujas:
+            superficie = self._superficie
+            interno = cell_size - 2
+            estado_de = self._estado()
+            for no in sujas:
+                lin, col = divmod(no, grid.colunas)
+                cor = self.CORES.get(estado_de(no), (255, 255, 255))
+                superficie.fill(
+                    cor,
+                    (col * cell_size + 1, lin * cell_size + 1, interno, interno)
+                )
+
+        screen.blit(self._superficie, (0, 0))
@@ -0,0 +1,251 @@
+"""
+Replanejamento incremental com LPA* (Lifelong Planning A*).
+
+Depois da primeira busca, edições de obstáculos no grid (set_celula) não
+exigem refazer o A* do zero: o LPA* guarda g (custo conhecido) e rhs
+(custo previsto pelos vizinhos) de cada nó e, a cada mudança, reabre só
+os nós cuja distância ao início realmente mudou.
+"""
+
+from array import array
+import heapq
+from typing import List, Optional, Set, Tuple
+
+from game.busca import Buscas, Coordenada, No
+
+INFINITO = 1 << 30
+
+Chave = Tuple[int, int]
+
+
+class ReplanejadorLPA:
+    """
+    Caminho mínimo entre início e objetivo mantido sob edições do grid.
+
+    Registra-se como observador do grid: cada set_celula só anota a célula
+    alterada, e o reparo acontece na próxima chamada a replanejar(). Mudar
+    o início ou o objetivo de lugar, limpar ou carregar outro mapa reinicia
+    a busca do zero.
+
+    Atributos de medição:
+    - reexpandidos: nós expandidos na última chamada a replanejar()
+    - passos: nós expandidos desde a criação (ou último reinício)
+    """
+
+    def __init__(self, grid) -> None:
+        """
+        :param grid: Grid com início e objetivo definidos
+        """
+        self.grid = grid
+        self.reexpandidos: int = 0
+        self.passos: int = 0
+        self.encontrado: bool = False
+
+        self.inicio: Optional[Coordenada] = None
+        self.objetivo: Optional[Coordenada] = None
+        self.no_inicio: Optional[No] = None
+        self.no_objetivo: Optional[No] = None
+
+        self._pendentes: Set[No] = set()
+        self._reiniciar_busca = True
+
+        grid.observar(self._ao_alterar)
+
+    # ================= CICLO DE VIDA =================
+
+    def fechar(self) -> None:
+        """
+        Deixa de observar o grid.
+        """
+        self.grid.deixar_de_observar(self._ao_alterar)
+
+    def __enter__(self) -> "ReplanejadorLPA":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _ao_alterar(self, no: Optional[No]) -> None:
+        if no is None:
+            self._reiniciar_busca = True
+        else:
+            self._pendentes.add(no)
+
+    def _inicializar(self) -> None:
+        """
+        Descarta o estado e prepara uma busca do zero no grid atual.
+        """
+        busca = Buscas(self.grid)
+        self.inicio = busca.inicio
+        self.objetivo = busca.objetivo
+        self.no_inicio = busca.no_inicio
+        self.no_objetivo = busca.no_objetivo
+
+        self._mascaras = busca._mascaras
+        self._desloc = busca._desloc
+        self._h = busca.tabela_heuristica() if busca.objetivo else None
+
+        n = len(self.grid.celulas)
+        self._g = array("i", [INFINITO]) * n
+        self._rhs = array("i", [INFINITO]) * n
+        self._fila: List[Tuple[int, int, No]] = []
+
+        self.passos = 0
+        self._pendentes.clear()
+        self._reiniciar_busca = False
+
+        if self.no_inicio is not None and self.no_objetivo is not None:
+            self._rhs[self.no_inicio] = 0
+            heapq.heappush(self._fila, (self._h[self.no_inicio], 0, self.no_inicio))
+
+    # ================= LPA* =================
+
+    def _chave(self, no: No) -> Chave:
+        menor = min(self._g[no], self._rhs[no])
+        return (menor + self._h[no], menor)
+
+    def _atualizar_no(self, no: No) -> None:
+        """
+        Recalcula rhs do nó a partir dos vizinhos e o (re)enfileira se ficou
+        inconsistente. Entradas antigas na fila são descartadas ao sair.
+        """
+        g = self._g
+        if no != self.no_inicio:
+            melhor = INFINITO
+            if self.grid.celulas[no] != self.grid.OBSTACULO:
+                for d in self._desloc[self._mascaras[no]]:
+                    custo = g[no + d] + 1
+                    if custo < melhor:
+                        melhor = custo
+            self._rhs[no] = melhor
+
+        if g[no] != self._rhs[no]:
+            chave = self._chave(no)
+            heapq.heappush(self._fila, (chave[0], chave[1], no))
+
+    def _calcular_caminho(self) -> int:
+        """
+        Expande nós até o objetivo ficar consistente e com chave mínima.
+
+        :return: Quantidade de nós expandidos
+        """
+        g = self._g
+        rhs = self._rhs
+        fila = self._fila
+        desloc = self._desloc
+        mascaras = self._mascaras
+        objetivo = self.no_objetivo
+        expandidos = 0
+
+        while fila:
+            k1, k2, no = fila[0]
+            if (k1, k2) >= self._chave(objetivo) and rhs[objetivo] == g[objetivo]:
+                break
+            heapq.heappop(fila)
+
+            # entrada obsoleta: nó já consistente ou chave desatualizada
+            if g[no] == rhs[no]:
+                continue
+            atual = self._chave(no)
+            if (k1, k2) < atual:
+                heapq.heappush(fila, (atual[0], atual[1], no))
+                continue
+
+            expandidos += 1
+            if g[no] > rhs[no]:
+                g[no] = rhs[no]
+                for d in desloc[mascaras[no]]:
+                    self._atualizar_no(no + d)
+            else:
+                g[no] = INFINITO
+                self._atualizar_no(no)
+                for d in desloc[mascaras[no]]:
+                    self._atualizar_no(no + d)
+
+        return expandidos
+
+    def _aplicar_pendentes(self) -> None:
+        """
+        Leva as edições anotadas desde o último replanejamento para o LPA*:
+        a célula alterada e seus vizinhos têm o rhs recalculado.
+        """
+        celulas = self.grid.celulas
+        colunas = self.grid.colunas
+        n = len(celulas)
+        extremos = (self.grid.INICIO, self.grid.OBJETIVO)
+
+        for no in self._pendentes:
+            # início/objetivo em outro lugar: o estado atual não serve mais
+            if (celulas[no] in extremos) != (no in (self.no_inicio, self.no_objetivo)):
+                self._inicializar()
+                return
+
+        for no in self._pendentes:
+            self._atualizar_no(no)
+            col = no % colunas
+            if no >= colunas:
+                self._atualizar_no(no - colunas)
+            if no + colunas < n:
+                self._atualizar_no(no + colunas)
+            if col > 0:
+                self._atualizar_no(no - 1)
+            if col < colunas - 1:
+                self._atualizar_no(no + 1)
+
+        self._pendentes.clear()
+
+    def replanejar(self) -> bool:
+        """
+        Atualiza o caminho mínimo considerando as edições feitas no grid
+        desde a última chamada (na primeira, faz a busca completa).
+
+        :return: True se existe caminho entre início e objetivo
+        """
+        if self._reiniciar_busca:
+            self._inicializar()
+        elif self._pendentes:
+            self._aplicar_pendentes()
+
+        if self.no_inicio is None or self.no_objetivo is None:
+            self.reexpandidos = 0
+            self.encontrado = False
+            return False
+
+        self.reexpandidos = self._calcular_caminho()
+        self.passos += self.reexpandidos
+        self.encontrado = self._g[self.no_objetivo] < INFINITO
+        return self.encontrado
+
+    # ================= RESULTADO =================
+
+    def custo(self) -> float:
+        """
+        :return: Comprimento do caminho mínimo (inf se não houver)
+        """
+        if not self.encontrado:
+            return float("inf")
+        return float(self._g[self.no_objetivo])
+
+    def caminho(self) -> List[Coordenada]:
+        """
+        Caminho do último replanejamento, no mesmo formato de Buscas.caminho
+        (sem o início, terminando no objetivo). Segue, a partir do objetivo,
+        o vizinho de menor g até chegar ao início.
+
+        :return: Lista de coordenadas (vazia se não houver caminho)
+        """
+        if not self.encontrado:
+            return []
+
+        g = self._g
+        desloc = self._desloc
+        mascaras = self._mascaras
+        atual = self.no_objetivo
+        caminho: List[No] = []
+
+        while atual != self.no_inicio:
+            caminho.append(atual)
+            atual = min((atual + d for d in desloc[mascaras[atual]]), key=g.__getitem__)
+
+        caminho.reverse()
+        return [divmod(no, self.grid.colunas) for no in caminho]
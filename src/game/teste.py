@@ -1,9 +1,30 @@
 #aqui iremos fazer teste para os algoritmos, basicamente iremos testar se o algoritmo deles retorna um caminnho valido (len(caminho))
 
+import json
+import random
+import time
+from array import array
+from collections import Counter
+
 import pytest
 from grid import Grid
 from busca import Buscas
 from algoritmo_genetico import AlgoritmoGeneticoAStar
+from cache import CacheLRU
+from cache_caminhos import CacheCaminhos
+from contexto import ContextoBusca
+from fila_indexada import FilaIndexada
+from campo import CacheCampos, CampoDistancia
+from agendador import AgendadorPassos
+from execucao_ag import ExecucaoAG
+from mapas import _ORDEM_DO_BYTE, _ORDENS, _REJEITADO, gerar_caminho_dfs, gerar_mapa_aleatorio
+from replanejamento import ReplanejadorLPA
+from hierarquico import BuscaHierarquica
+from arquivo_mapa import (
+    ler_binario, ler_cabecalho_binario, ler_cenarios_movingai, ler_movingai,
+    ler_texto, salvar_binario, salvar_texto
+)
+
 
 @pytest.fixture
 def grid_simples():
@@ -13,7 +34,6 @@ def grid_simples():
     return grid
 
 
-
 def test_bfs_encontra_caminho(grid_simples):
     busca = Buscas(grid_simples)
     gen = busca.bfs()
@@ -24,6 +44,7 @@ def test_bfs_encontra_caminho(grid_simples):
     caminho = busca.reconstruir_caminho()
     assert len(caminho) > 0
 
+
 def test_dfs_encontra_caminho(grid_simples):
     busca = Buscas(grid_simples)
     gen = busca.dfs()
@@ -34,6 +55,7 @@ def test_dfs_encontra_caminho(grid_simples):
     caminho = busca.reconstruir_caminho()
     assert caminho
 
+
 def test_a_estrela_encontra_caminho(grid_simples):
     busca = Buscas(grid_simples)
     busca.w_heuristica = 1.0
@@ -47,6 +69,7 @@ def test_a_estrela_encontra_caminho(grid_simples):
     assert caminho
     assert caminho[-1] == busca.objetivo
 
+
 def test_ag_fitness_valido():
     grid = Grid(10, 10)
     grid.add_inicio(0, 0)
@@ -59,6 +82,7 @@ def test_ag_fitness_valido():
     assert ag.melhor is not None
     assert ag.melhor["fitness"] >= 0
 
+
 def test_ag_melhora_fitness():
     grid = Grid(10, 10)
     grid.add_inicio(0, 0)
@@ -74,4 +98,865 @@ def test_ag_melhora_fitness():
         ag.proxima_geracao()
         ag.avaliar_populacao()
 
-    assert ag.melhor["fitness"] <= fitness_inicial
\ No newline at end of file
+    assert ag.melhor["fitness"] <= fitness_inicial
+
+
+def test_grid_armazenamento_linear():
+    grid = Grid(3, 4)
+    grid.add_obstaculo(1, 2)
+    grid.add_obstaculo(5, 5)  # fora do grid, ignorado
+
+    assert len(grid.celulas) == 12
+    assert grid.celulas[grid.indice(1, 2)] == Grid.OBSTACULO
+    assert grid.get_celula(1, 2) == Grid.OBSTACULO
+    assert grid.coordenada(grid.indice(2, 3)) == (2, 3)
+    assert sum(grid.celulas) == Grid.OBSTACULO
+
+
+def test_bfs_contorna_parede():
+    grid = Grid(5, 5)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(0, 4)
+    for i in range(4):
+        grid.add_obstaculo(i, 2)
+
+    busca = Buscas(grid)
+    for _ in busca.bfs():
+        pass
+
+    caminho = busca.reconstruir_caminho()
+    assert len(caminho) == 12
+    assert all(grid.get_celula(i, j) != Grid.OBSTACULO for i, j in caminho)
+
+
+@pytest.mark.parametrize("algoritmo", ["bfs", "dfs", "dijkstra", "a_estrela"])
+def test_resolver_nao_altera_grid(grid_simples, algoritmo):
+    grid_simples.add_obstaculo(2, 2)
+    antes = bytes(grid_simples.celulas)
+
+    resultado = Buscas(grid_simples).resolver(algoritmo)
+
+    assert bytes(grid_simples.celulas) == antes
+    assert resultado["encontrado"]
+    assert resultado["caminho"][-1] == (4, 4)
+    assert resultado["passos"] > 0
+
+
+def test_bfs_rapido_igual_ao_visual(grid_simples):
+    grid_simples.add_obstaculo(1, 1)
+    grid_simples.add_obstaculo(3, 2)
+
+    rapido = Buscas(grid_simples).resolver("bfs")
+
+    busca = Buscas(grid_simples)
+    for _ in busca.bfs():
+        pass
+
+    assert rapido["caminho"] == busca.reconstruir_caminho()
+    assert rapido["custo"] == 8
+
+
+def test_vizinhanca_atualizada_por_set_celula():
+    grid = Grid(6, 7)
+    grid.add_obstaculo(2, 3)
+    mascaras = grid.vizinhanca()
+
+    grid.add_obstaculo(0, 0)
+    grid.add_obstaculo(5, 6)
+    grid.set_celula(2, 3, Grid.LIVRE)
+
+    recalculada = Grid(6, 7)
+    recalculada.celulas[:] = grid.celulas
+    assert grid.vizinhanca() is mascaras
+    assert mascaras == recalculada.vizinhanca()
+    assert mascaras[grid.indice(0, 1)] == Grid.VIZ_BAIXO | Grid.VIZ_DIREITA
+
+
+def test_ag_paralelo_deterministico():
+    grid = Grid(12, 12)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(11, 11)
+    for i in range(1, 11):
+        grid.add_obstaculo(i, 6)
+
+    historicos = []
+    for processos in (1, 2):
+        with AlgoritmoGeneticoAStar(grid, tamanho_pop=6, processos=processos, semente=7) as ag:
+            ag.inicializar_populacao()
+            historico = []
+            for _ in range(3):
+                ag.avaliar_populacao()
+                historico.append([(i["w"], i["custo"], i["fitness"]) for i in ag.populacao])
+                ag.proxima_geracao()
+        historicos.append(historico)
+
+    assert historicos[0] == historicos[1]
+
+
+def test_ag_paralelo_refaz_pool_apos_edicao():
+    grid = Grid(12, 12)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(11, 11)
+    genomas = [{"w": 1.2, "custo": 1.0}, {"w": 2.5, "custo": 1.0}]
+
+    def pontuar(ag):
+        ag.populacao = [dict(g, fitness=float("inf")) for g in genomas]
+        ag.avaliar_populacao()
+        return [i["fitness"] for i in ag.populacao]
+
+    with AlgoritmoGeneticoAStar(grid, tamanho_pop=2, processos=2, semente=1) as ag:
+        pontuar(ag)
+        for i in range(1, 11):
+            grid.add_obstaculo(i, 6)
+        editado = pontuar(ag)
+
+    with AlgoritmoGeneticoAStar(grid, tamanho_pop=2, semente=1) as serial:
+        assert editado == pontuar(serial)
+
+
+def test_cache_lru_descarta_menos_usado():
+    cache = CacheLRU(2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obter("a") == 1
+    cache.guardar("c", 3)
+
+    assert "b" not in cache
+    assert cache.obter("b") is None
+    assert (cache.acertos, cache.falhas) == (1, 1)
+
+
+def test_ag_cache_evita_reavaliacao(grid_simples):
+    ag = AlgoritmoGeneticoAStar(grid_simples, tamanho_pop=4, semente=1)
+    ag.populacao = [
+        {"w": 1.5, "custo": 1.0, "fitness": float("inf")},
+        {"w": 1.5, "custo": 1.0, "fitness": float("inf")},
+        {"w": 2.0, "custo": 1.0, "fitness": float("inf")},
+    ]
+    ag.avaliar_populacao()
+    assert ag.cache.falhas == 3 and len(ag.cache) == 2
+
+    repetido = {"w": 2.0, "custo": 1.0, "fitness": float("inf")}
+    ag.avaliar_individuo(repetido)
+    assert ag.cache.acertos == 1
+    original = next(i for i in ag.populacao if i["w"] == 2.0)
+    assert repetido["fitness"] == original["fitness"]
+
+
+def test_ag_assinatura_so_recalculada_apos_edicao(grid_simples, monkeypatch):
+    ag = AlgoritmoGeneticoAStar(grid_simples, tamanho_pop=4, semente=1)
+    chamadas = []
+    original = grid_simples.assinatura
+    monkeypatch.setattr(grid_simples, "assinatura", lambda: chamadas.append(1) or original())
+
+    for _ in range(3):
+        ag.avaliar_rapido({"w": 1.5, "custo": 1.0, "fitness": float("inf")})
+    assert len(chamadas) == 1 and ag.cache.acertos == 2
+
+    grid_simples.add_obstaculo(2, 2)
+    ag.avaliar_rapido({"w": 1.5, "custo": 1.0, "fitness": float("inf")})
+    assert len(chamadas) == 2 and ag.cache.acertos == 2
+
+
+def _corpus_mapas(quantidade):
+    mapas = []
+    for k in range(quantidade):
+        grid = Grid(8, 8)
+        grid.add_inicio(0, k % 8)
+        grid.add_objetivo(7, 7 - k % 8)
+        for j in range(1, 7):
+            grid.add_obstaculo(3 + k % 2, j)
+        mapas.append(grid)
+    return mapas
+
+
+def test_ag_multimapa_soma_fitness_dos_mapas(grid_simples):
+    mapas = _corpus_mapas(4)
+    ag = AlgoritmoGeneticoAStar(grid_simples, tamanho_pop=2, mapas=mapas)
+    ag.populacao = [{"w": 1.2, "custo": 1.0, "fitness": float("inf")}]
+    ag.avaliar_populacao()
+
+    esperado = 0.0
+    for mapa in mapas:
+        busca = Buscas(mapa)
+        busca.w_heuristica, busca.custo_movimento = 1.2, 1.0
+        busca.a_estrela_rapido()
+        esperado += busca.passos + busca.visitados_count
+
+    assert ag.melhor["fitness"] == esperado
+    assert not ag.melhor["abortado"]
+
+
+def test_ag_multimapa_abandona_pior_que_elite(grid_simples):
+    ag = AlgoritmoGeneticoAStar(grid_simples, tamanho_pop=2, mapas=_corpus_mapas(6))
+    ag.populacao = [
+        {"w": 1.0, "custo": 1.0, "fitness": float("inf")},
+        {"w": 0.1, "custo": 3.0, "fitness": float("inf")},
+    ]
+    ag.avaliar_populacao()
+
+    bom, ruim = ag.populacao
+    assert not bom["abortado"]
+    assert ruim["abortado"] and ruim["fitness"] > bom["fitness"]
+
+
+def test_a_estrela_rapido_respeita_limite_de_expansoes():
+    grid = Grid(30, 30)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(29, 29)
+
+    busca = Buscas(grid)
+    busca.w_heuristica = 0.0
+    busca.limite_expansoes = 50
+
+    assert not busca.a_estrela_rapido()
+    assert busca.status == Buscas.ORCAMENTO_EXCEDIDO
+    assert busca.passos == 50
+
+    busca.limite_expansoes = None
+    assert busca.a_estrela_rapido()
+    assert busca.status == Buscas.ENCONTRADO
+
+
+def test_ag_penaliza_orcamento_excedido():
+    grid = Grid(30, 30)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(29, 29)
+
+    ag = AlgoritmoGeneticoAStar(grid, limite_expansoes=100)
+    lento = {"w": 0.0, "custo": 1.0, "fitness": float("inf")}
+    rapido = {"w": 2.0, "custo": 1.0, "fitness": float("inf")}
+    ag.avaliar_rapido(lento)
+    ag.avaliar_rapido(rapido)
+
+    assert lento["fitness"] == 4 * 100
+    assert rapido["fitness"] < lento["fitness"]
+
+
+def test_a_estrela_lote_igual_execucoes_individuais():
+    grid = Grid(15, 15)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(14, 10)
+    for i in range(12):
+        grid.add_obstaculo(i, 5)
+        grid.add_obstaculo(14 - i, 9)
+
+    parametros = [(1.0, 1.0), (2.5, 1.0), (0.5, 1.3)]
+    lote = Buscas(grid).a_estrela_lote(parametros)
+
+    for (w, custo), resultado in zip(parametros, lote):
+        busca = Buscas(grid)
+        busca.w_heuristica, busca.custo_movimento = w, custo
+        assert busca.a_estrela_rapido() == resultado["encontrado"]
+        assert len(busca.caminho()) == resultado["comprimento"]
+        assert busca.passos == resultado["passos"]
+
+
+def test_tabela_heuristica_manhattan(grid_simples):
+    busca = Buscas(grid_simples)
+    tabela = busca.tabela_heuristica()
+
+    assert len(tabela) == 25
+    assert tabela[grid_simples.indice(0, 0)] == 8
+    assert tabela[grid_simples.indice(3, 4)] == 1
+
+
+def test_jps_mesmo_comprimento_que_bfs():
+    grid = Grid(12, 12)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(11, 11)
+    for j in range(10):
+        grid.add_obstaculo(3, j)
+        grid.add_obstaculo(7, 11 - j)
+    grid.add_obstaculo(9, 4)
+
+    bfs = Buscas(grid).resolver("bfs")
+    jps = Buscas(grid).resolver("jps")
+
+    assert jps["encontrado"]
+    assert len(jps["caminho"]) == len(bfs["caminho"])
+    assert jps["passos"] < bfs["passos"]
+
+
+def test_jps_visual_reconstroi_caminho_continuo(grid_simples):
+    grid_simples.add_obstaculo(1, 0)
+    busca = Buscas(grid_simples)
+    busca.valor_caminho = Grid.CAM_JPS
+    for _ in busca.jps():
+        pass
+
+    caminho = [busca.inicio] + busca.reconstruir_caminho()
+    assert len(caminho) == 9
+    for (i1, j1), (i2, j2) in zip(caminho, caminho[1:]):
+        assert abs(i1 - i2) + abs(j1 - j2) == 1
+
+
+def test_jps_otimo_em_mapas_aleatorios():
+    # saltos horizontais reaproveitados entre os passos dos saltos verticais
+    for semente in range(40):
+        grid = gerar_mapa_aleatorio(20, 17, 0.1 + 0.01 * semente, semente=semente, objetivo=(9, 16))
+        bfs = Buscas(grid).resolver("bfs")
+        jps = Buscas(grid).resolver("jps")
+        assert jps["encontrado"] == bfs["encontrado"]
+        assert len(jps["caminho"]) == len(bfs["caminho"])
+
+
+@pytest.mark.parametrize("algoritmo", ["bfs_bidirecional", "a_estrela_bidirecional"])
+def test_bidirecional_caminho_otimo(algoritmo):
+    grid = Grid(20, 20)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(19, 19)
+    for i in range(17):
+        grid.add_obstaculo(i, 6)
+        grid.add_obstaculo(19 - i, 13)
+
+    bfs = Buscas(grid).resolver("bfs")
+    bidirecional = Buscas(grid).resolver(algoritmo)
+
+    assert len(bidirecional["caminho"]) == len(bfs["caminho"])
+    assert bidirecional["caminho"][-1] == (19, 19)
+    assert bidirecional["passos"] < bfs["passos"]
+
+
+@pytest.mark.parametrize("algoritmo", ["bfs_bidirecional", "a_estrela_bidirecional"])
+def test_bidirecional_inicio_igual_ao_objetivo(grid_simples, algoritmo):
+    bfs = Buscas(grid_simples, inicio=(2, 2), objetivo=(2, 2)).resolver("bfs")
+    bidirecional = Buscas(grid_simples, inicio=(2, 2), objetivo=(2, 2)).resolver(algoritmo)
+    assert bidirecional == bfs
+
+    busca = Buscas(grid_simples, inicio=(2, 2), objetivo=(2, 2))
+    passos = list(getattr(busca, algoritmo)())
+    assert passos == [] and busca.reconstruir_caminho() == []
+
+
+def test_agendador_executa_passos_pelo_tempo():
+    agora = [0.0]
+    agendador = AgendadorPassos(100, orcamento_quadro_ms=1000, relogio=lambda: agora[0])
+    executados = []
+
+    def gerador():
+        for i in range(25):
+            executados.append(i)
+            yield
+
+    gen = gerador()
+    agora[0] = 0.1  # 100 passos/s * 0.1 s = 10 passos
+    assert agendador.executar(gen)
+    assert len(executados) == 10
+
+    agendador.acelerar()
+    agora[0] = 0.2  # agora 200 passos/s: sobra mais que o necessário
+    assert not agendador.executar(gen)
+    assert len(executados) == 25
+
+
+def _esperar_eventos(execucao, limite_s=10.0):
+    eventos = []
+    fim = time.monotonic() + limite_s
+    while time.monotonic() < fim and not execucao.terminou:
+        evento = execucao.proximo_evento()
+        if evento is None:
+            time.sleep(0.01)
+        else:
+            eventos.append(evento)
+    return eventos
+
+
+def test_execucao_ag_em_segundo_plano(grid_simples):
+    execucao = ExecucaoAG(grid_simples, tamanho_pop=4, geracoes=3, semente=2)
+    execucao.iniciar()
+
+    eventos = _esperar_eventos(execucao)
+    execucao.encerrar(timeout=5)
+
+    tipos = [e["tipo"] for e in eventos]
+    assert tipos.count("melhor") == 3
+    assert tipos[-1] == "fim"
+
+
+def test_execucao_ag_cancelada_para_sem_fim():
+    grid = Grid(60, 60)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(59, 59)
+
+    execucao = ExecucaoAG(grid, tamanho_pop=6, geracoes=1000)
+    execucao.iniciar()
+    execucao.encerrar(timeout=10)
+
+    assert not execucao.em_execucao
+    assert execucao.proximo_evento() is None
+    assert not execucao.terminou
+
+
+def test_mapa_aleatorio_reprodutivel_e_com_solucao():
+    a = gerar_mapa_aleatorio(30, 30, 0.4, semente=7)
+    b = gerar_mapa_aleatorio(30, 30, 0.4, semente=7)
+    c = gerar_mapa_aleatorio(30, 30, 0.4, semente=8)
+
+    assert a.celulas == b.celulas
+    assert a.celulas != c.celulas
+    assert Buscas(a).resolver("bfs")["encontrado"]
+
+
+def test_caminho_dfs_gerado_e_continuo():
+    caminho = gerar_caminho_dfs(20, 15, (3, 4), (17, 0), random.Random(1))
+
+    assert caminho[0] == (3, 4)
+    assert caminho[-1] == (17, 0)
+    for (l1, c1), (l2, c2) in zip(caminho, caminho[1:]):
+        assert abs(l1 - l2) + abs(c1 - c2) == 1
+
+
+def test_ordens_de_vizinhos_equiprovaveis():
+    contagem = Counter(b for b in _ORDEM_DO_BYTE if b != _REJEITADO)
+    assert len(_ORDENS) == 24
+    assert sorted(contagem) == list(range(24))
+    assert set(contagem.values()) == {10}
+
+
+def test_mapa_texto_ida_e_volta(tmp_path):
+    grid = gerar_mapa_aleatorio(12, 17, 0.3, semente=3)
+
+    arquivo = tmp_path / "mapa.txt"
+    salvar_texto(grid, arquivo)
+    lido = ler_texto(arquivo)
+
+    assert (lido.linhas, lido.colunas) == (12, 17)
+    assert lido.celulas == grid.celulas_base()
+
+
+def test_mapa_texto_rejeita_caractere_desconhecido(tmp_path):
+    arquivo = tmp_path / "mapa.txt"
+    arquivo.write_text("I..\n.x.\n..O\n")
+
+    with pytest.raises(ValueError):
+        ler_texto(arquivo)
+
+
+def test_ag_executar_rapido_devolve_melhor(grid_simples):
+    ag = AlgoritmoGeneticoAStar(grid_simples, tamanho_pop=6, geracoes=3, semente=1)
+    melhor = ag.executar_rapido()
+
+    assert melhor is ag.melhor
+    assert melhor["fitness"] < float("inf")
+
+
+def test_resolver_lote_por_arquivo(tmp_path):
+    import resolver_lote
+
+    arquivo = tmp_path / "mapa.txt"
+    salvar_texto(gerar_mapa_aleatorio(20, 20, 0.3, semente=5), arquivo)
+
+    config = {"algoritmo": "bfs"}
+    resultado = resolver_lote.resolver_mapa(str(arquivo), config)
+    assert resultado["encontrado"]
+    assert resultado["comprimento"] > 0
+
+    ausente = resolver_lote.resolver_mapa(str(tmp_path / "nao_existe.txt"), config)
+    assert "erro" in ausente
+
+
+def test_mapa_binario_mapeado_em_memoria(tmp_path):
+    grid = gerar_mapa_aleatorio(40, 25, 0.3, semente=9)
+    arquivo = tmp_path / "mapa.grid"
+    salvar_binario(grid, arquivo)
+
+    assert ler_cabecalho_binario(arquivo) == (40, 25, (0, 0), (39, 24))
+
+    lido = ler_binario(arquivo)
+    assert lido.celulas_base() == grid.celulas_base()
+    assert Buscas(lido).resolver("bfs")["caminho"] == Buscas(grid).resolver("bfs")["caminho"]
+
+    # alterações no grid mapeado não voltam para o arquivo
+    livre = lido.celulas_base().find(Grid.LIVRE)
+    lido.set_celula(*lido.coordenada(livre), Grid.OBSTACULO)
+    assert ler_binario(arquivo).celulas[livre] == Grid.LIVRE
+
+
+def test_mapa_movingai_e_cenarios(tmp_path):
+    mapa = tmp_path / "teste.map"
+    mapa.write_text("type octile\nheight 3\nwidth 4\nmap\n..@.\n.T..\nG..S\n")
+    cenarios = tmp_path / "teste.map.scen"
+    cenarios.write_text("version 1\n0\tteste.map\t4\t3\t0\t0\t3\t2\t5.00000000\n")
+
+    cenario = ler_cenarios_movingai(cenarios)[0]
+    assert cenario["inicio"] == (0, 0)
+    assert cenario["objetivo"] == (2, 3)
+
+    grid = ler_movingai(mapa, cenario["inicio"], cenario["objetivo"])
+    assert grid.get_celula(0, 2) == Grid.OBSTACULO
+    assert grid.get_celula(2, 3) == Grid.OBJETIVO
+    assert len(Buscas(grid).resolver("bfs")["caminho"]) == cenario["otimo"]
+
+
+def test_resolver_lote_com_cenarios_movingai(tmp_path):
+    import resolver_lote
+
+    mapa = tmp_path / "teste.map"
+    mapa.write_text("type octile\nheight 3\nwidth 4\nmap\n..@.\n.T..\nG..S\n")
+    cenarios = tmp_path / "teste.map.scen"
+    cenarios.write_text(
+        "version 1\n"
+        "0\tmaps/teste.map\t4\t3\t0\t0\t3\t2\t5.00000000\n"
+        "0\tteste.map\t4\t3\t0\t0\t0\t1\t1.00000000\n"
+    )
+    saida = tmp_path / "resultado.jsonl"
+
+    resolver_lote.main([
+        "--cenarios", str(cenarios), "--algoritmo", "bfs",
+        "--processos", "1", "--saida", str(saida),
+    ])
+
+    resultados = [json.loads(linha) for linha in saida.read_text().splitlines()]
+    # o caminho do cenário é tentado antes, e depois só o nome ao lado do .scen
+    assert [r["comprimento"] for r in resultados] == [5, 1]
+    assert [r["otimo"] for r in resultados] == [5.0, 1.0]
+
+    sem_cenario = resolver_lote.resolver_mapa(str(mapa), {"algoritmo": "bfs"})
+    assert "--cenarios" in sem_cenario["erro"]
+
+
+LIMITE_IMPORTACAO_S = 0.5
+
+
+def test_nucleo_importa_rapido_e_sem_pygame():
+    import benchmark
+
+    medida = benchmark.medir_importacao()
+
+    assert not medida["pygame_importado"]
+    assert medida["tempo_s"] < LIMITE_IMPORTACAO_S
+
+
+def test_lpa_repara_caminho_apos_edicoes():
+    grid = gerar_mapa_aleatorio(40, 40, 0.25, semente=4)
+    rng = random.Random(4)
+
+    with ReplanejadorLPA(grid) as lpa:
+        assert lpa.replanejar()
+        completo = lpa.reexpandidos
+
+        for _ in range(10):
+            bloqueada = rng.choice(lpa.caminho()[:-1])
+            grid.add_obstaculo(*bloqueada)
+            encontrado = lpa.replanejar()
+
+            referencia = Buscas(grid).resolver("bfs")
+            assert encontrado == referencia["encontrado"]
+            assert len(lpa.caminho()) == len(referencia["caminho"])
+            # bloquear uma célula não reexpande o mapa inteiro
+            assert lpa.reexpandidos < completo
+
+        # remover o obstáculo também é reparado
+        grid.set_celula(*bloqueada, Grid.LIVRE)
+        assert lpa.replanejar()
+        assert len(lpa.caminho()) == len(Buscas(grid).resolver("bfs")["caminho"])
+
+    assert not grid._observadores
+
+
+def test_campo_distancia_caminhos_otimos():
+    grid = gerar_mapa_aleatorio(30, 30, 0.3, semente=11)
+    referencia = Buscas(grid).resolver("bfs")["caminho"]
+
+    campo = CampoDistancia(grid, [grid.encontrar(Grid.OBJETIVO)])
+    caminho = campo.caminho(grid.encontrar(Grid.INICIO))
+
+    assert len(caminho) == len(referencia)
+    assert caminho[-1] == grid.encontrar(Grid.OBJETIVO)
+    assert campo.distancia(grid.encontrar(Grid.INICIO)) == len(referencia)
+
+
+def test_campo_multiplos_objetivos_usa_o_mais_proximo():
+    grid = Grid(1, 10)
+    campo = CampoDistancia(grid, [(0, 0), (0, 9)])
+
+    assert campo.distancia((0, 2)) == 2
+    assert campo.distancia((0, 7)) == 2
+    assert campo.caminho((0, 7)) == [(0, 8), (0, 9)]
+
+
+def test_campo_refeito_apos_edicao(grid_simples):
+    campo = CampoDistancia(grid_simples)
+    assert campo.distancia((0, 0)) == 8
+
+    # parede com uma única passagem em (4, 2)
+    for lin in range(4):
+        grid_simples.add_obstaculo(lin, 2)
+    caminho = campo.caminho((0, 0))
+
+    assert campo.distancia((0, 0)) == 8
+    assert (4, 2) in caminho
+    assert all(grid_simples.get_celula(i, j) != Grid.OBSTACULO for i, j in caminho)
+
+    grid_simples.add_obstaculo(4, 2)
+    assert campo.caminho((0, 0)) == []
+
+
+def test_cache_campos_reutiliza_e_invalida_na_edicao(grid_simples):
+    with CacheCampos(grid_simples, capacidade=2) as cache:
+        cache.caminhos([(0, 0), (2, 2)], (4, 4))
+        cache.caminhos([(1, 0)], (4, 4))
+        assert cache.cache.acertos == 1
+
+        grid_simples.add_obstaculo(3, 4)
+        assert len(cache.cache) == 0
+        assert cache.caminhos([(4, 3)], (4, 4)) == [[(4, 4)]]
+
+
+def _caminho_valido(grid, caminho):
+    anterior = grid.encontrar(Grid.INICIO)
+    for celula in caminho:
+        assert abs(anterior[0] - celula[0]) + abs(anterior[1] - celula[1]) == 1
+        assert grid.get_celula(*celula) != Grid.OBSTACULO
+        anterior = celula
+    assert anterior == grid.encontrar(Grid.OBJETIVO)
+
+
+def test_hpa_encontra_caminho_e_reconstroi_so_o_cluster_editado():
+    grid = gerar_mapa_aleatorio(48, 48, 0.25, semente=2)
+
+    with BuscaHierarquica(grid, tamanho_cluster=8) as hpa:
+        caminho = hpa.caminho()
+        _caminho_valido(grid, caminho)
+        assert hpa.clusters_reconstruidos == 36
+        assert len(caminho) >= len(Buscas(grid).resolver("bfs")["caminho"])
+
+        # célula no meio de um cluster: ele e os 4 vizinhos
+        grid.add_obstaculo(*caminho[len(caminho) // 2])
+        caminho = hpa.caminho()
+        assert hpa.clusters_reconstruidos <= 5
+        assert bool(caminho) == Buscas(grid).resolver("bfs")["encontrado"]
+        if caminho:
+            _caminho_valido(grid, caminho)
+
+
+def test_hpa_sem_caminho(grid_simples):
+    for lin in range(5):
+        grid_simples.add_obstaculo(lin, 2)
+
+    assert BuscaHierarquica(grid_simples, tamanho_cluster=2).caminho() == []
+
+
+def test_hpa_inicio_e_objetivo_nas_fronteiras():
+    linha = Grid(1, 4)
+    linha.add_inicio(0, 1)
+    linha.add_objetivo(0, 3)
+    assert BuscaHierarquica(linha, 2).caminho() == [(0, 2), (0, 3)]
+
+    grid = gerar_mapa_aleatorio(24, 24, 0.25, semente=3)
+    borda = [
+        (i, j) for i in range(24) for j in range(24)
+        if (i % 4 in (0, 3) or j % 4 in (0, 3)) and grid.get_celula(i, j) != Grid.OBSTACULO
+    ]
+    with BuscaHierarquica(grid, tamanho_cluster=4) as hpa:
+        for inicio, objetivo in zip(borda[::7], borda[3::7]):
+            if inicio == objetivo:
+                continue
+            referencia = Buscas(grid, inicio, objetivo).resolver("bfs")["caminho"]
+            caminho = hpa.caminho(inicio, objetivo)
+            assert bool(caminho) == bool(referencia)
+            assert len(caminho) >= len(referencia)
+
+        # só trechos entre entradas ficam guardados
+        for c, trechos in hpa._trechos.items():
+            assert all(a in hpa._nos[c] and b in hpa._nos[c] for a, b in trechos)
+
+
+def test_grid_alteracoes_para_desenho_incremental():
+    grid = Grid(8, 8)
+    assert grid.alteracoes() is None  # primeira chamada liga o rastreamento
+    assert grid.alteracoes() == set()
+
+    grid.add_obstaculo(1, 2)
+    grid.set_celula(3, 3, Grid.INICIO)
+    assert grid.alteracoes() == {grid.indice(1, 2), grid.indice(3, 3)}
+    assert grid.alteracoes() == set()
+
+    grid.limpar()
+    assert grid.alteracoes() is None
+    grid.carregar(bytearray(64))
+    assert grid.alteracoes() is None
+
+    # mais de um quarto das células: redesenho completo
+    for no in range(17):
+        grid.set_celula(*grid.coordenada(no), Grid.OBSTACULO)
+    assert grid.alteracoes() is None
+
+
+def test_contexto_alteracoes_das_marcas_de_busca():
+    # o que o renderizador junta às alterações do grid a cada quadro
+    grid = Grid(8, 8)
+    grid.add_inicio(0, 0)
+    grid.add_objetivo(0, 3)
+    contexto = ContextoBusca(grid)
+    assert contexto.alteracoes() is None
+    grid.alteracoes()
+
+    contexto.marcar(grid.indice(5, 5), Grid.VISITADO)
+    contexto.marcar(grid.indice(6, 6), Grid.CAM_BFS)
+    assert contexto.alteracoes() == {grid.indice(5, 5), grid.indice(6, 6)}
+    assert grid.alteracoes() == set()  # marcas não tocam o mapa
+
+    busca = Buscas(grid, contexto=contexto)
+    for _ in busca.bfs():
+        pass
+    busca.reconstruir_caminho()
+    assert contexto.alteracoes() is None  # reiniciar() pede redesenho completo
+    busca.reconstruir_caminho()
+    assert contexto.alteracoes() == {grid.indice(0, j) for j in (1, 2)}
+
+    for no in range(17):
+        contexto.marcar(no, Grid.VISITADO)
+    assert contexto.alteracoes() is None
+
+
+def test_grid_versao_muda_so_com_edicoes(grid_simples):
+    versao = grid_simples.versao
+
+    ContextoBusca(grid_simples).marcar(grid_simples.indice(1, 1), Grid.VISITADO)
+    assert grid_simples.versao == versao
+
+    grid_simples.add_obstaculo(2, 2)
+    assert grid_simples.versao != versao
+    assert Grid(5, 5).versao != grid_simples.versao
+
+
+def test_cache_caminhos_por_versao_e_parametros(grid_simples):
+    cache = CacheCaminhos(capacidade=8)
+
+    primeiro = cache.resolver(grid_simples, "a_estrela", w_heuristica=1.5)
+    primeiro["caminho"].clear()
+    repetido = cache.resolver(grid_simples, "a_estrela", w_heuristica=1.5)
+    assert repetido["caminho"]
+    assert (cache.acertos, cache.falhas) == (1, 1)
+
+    cache.resolver(grid_simples, "a_estrela", w_heuristica=2.0)
+    assert cache.falhas == 2
+
+    grid_simples.add_obstaculo(*repetido["caminho"][0])
+    depois = cache.resolver(grid_simples, "a_estrela", w_heuristica=1.5)
+    assert cache.falhas == 3
+    assert repetido["caminho"][0] not in depois["caminho"]
+    assert cache.taxa_acerto == 0.25
+
+
+def test_grid_acompanha_inicio_e_objetivos(grid_simples):
+    assert grid_simples.encontrar(Grid.INICIO) == (0, 0)
+
+    grid_simples.add_objetivo(2, 3)
+    assert grid_simples.objetivos() == [(2, 3), (4, 4)]
+    assert grid_simples.encontrar(Grid.OBJETIVO) == (2, 3)
+
+    grid_simples.set_celula(2, 3, Grid.LIVRE)
+    grid_simples.set_celula(0, 0, Grid.LIVRE)
+    assert grid_simples.encontrar(Grid.OBJETIVO) == (4, 4)
+    assert grid_simples.encontrar(Grid.INICIO) is None
+
+    grid_simples.limpar()
+    assert grid_simples.objetivos() == []
+
+    campo = CampoDistancia(gerar_mapa_aleatorio(6, 6, 0.0, semente=1))
+    assert campo.distancia((0, 0)) == 10
+
+
+def test_busca_com_extremos_explicitos(grid_simples):
+    resultado = Buscas(grid_simples, inicio=(4, 0), objetivo=(0, 4)).resolver("a_estrela")
+
+    assert resultado["caminho"][-1] == (0, 4)
+    assert len(resultado["caminho"]) == 8
+
+
+@pytest.mark.parametrize("algoritmo", [
+    "bfs", "dfs", "dijkstra", "a_estrela", "jps", "bfs_bidirecional", "a_estrela_bidirecional"
+])
+def test_busca_incremental_marca_no_contexto(grid_simples, algoritmo):
+    grid_simples.add_obstaculo(2, 2)
+    antes = bytes(grid_simples.celulas)
+    contexto = ContextoBusca(grid_simples)
+
+    busca = Buscas(grid_simples, contexto=contexto)
+    for _ in getattr(busca, algoritmo)():
+        pass
+    caminho = busca.reconstruir_caminho()
+
+    assert bytes(grid_simples.celulas) == antes
+    assert caminho[-1] == (4, 4)
+    assert contexto.estado(grid_simples.indice(*caminho[0])) == busca.valor_caminho
+    assert contexto.estado(grid_simples.indice(2, 2)) == Grid.OBSTACULO
+    if algoritmo != "dfs":
+        assert len(caminho) == len(Buscas(grid_simples).resolver(algoritmo)["caminho"])
+
+
+def test_contexto_reiniciar_descarta_estado(grid_simples):
+    contexto = ContextoBusca(grid_simples)
+    contagens = []
+
+    for _ in range(3):
+        busca = Buscas(grid_simples, contexto=contexto)
+        for _ in busca.bfs():
+            pass
+        busca.reconstruir_caminho()
+        contagens.append((busca.visitados_count, len(contexto.visitados)))
+
+    assert contagens[0] == contagens[1] == contagens[2]
+
+    contexto.reiniciar()
+    assert len(contexto.visitados) == 0
+    assert all(contexto.estado(no) == grid_simples.celulas[no] for no in range(25))
+    assert contexto.alteracoes() is None
+
+
+def test_fila_indexada_ordem_e_decrease_key():
+    g = array("d", [0.0, 3.0, 1.0, 2.0, 5.0])
+    fila = FilaIndexada(5, g)
+    for no, f in [(0, 9.0), (1, 7.0), (2, 7.0), (3, 8.0), (4, 6.5)]:
+        fila.f[no] = f
+        fila.inserir(no)
+
+    fila.f[0] = 1.0
+    fila.diminuir(0)
+
+    # menor f primeiro; no empate (nós 1 e 2), o de maior g
+    assert [fila.remover_minimo() for _ in range(5)] == [0, 4, 1, 2, 3]
+    assert fila.pico == 5 and len(fila) == 0 and 3 not in fila
+
+
+def test_a_estrela_indexado_otimo_e_sem_descartes():
+    for semente in range(15):
+        grid = gerar_mapa_aleatorio(30, 30, 0.3, semente=semente)
+        referencia = Buscas(grid).resolver("bfs")
+
+        busca = Buscas(grid, contexto=ContextoBusca(grid))
+        for _ in range(2):  # contexto reaproveitado dá o mesmo resultado
+            resultado = busca.resolver("a_estrela_indexado")
+            assert len(resultado["caminho"]) == len(referencia["caminho"])
+            assert busca.descartes == 0
+            assert 0 < busca.pico_fila <= busca.passos * 4
+
+        busca.w_heuristica, busca.custo_movimento = 1.8, 1.3
+        ponderado = busca.resolver("a_estrela_indexado")
+        _caminho_valido(grid, ponderado["caminho"])
+
+
+def test_a_estrela_indexado_preserva_marcas_do_contexto(grid_simples):
+    contexto = ContextoBusca(grid_simples)
+    for _ in Buscas(grid_simples, contexto=contexto).bfs():
+        pass
+    desenho = [contexto.estado(no) for no in range(25)]
+    contexto.alteracoes()
+
+    Buscas(grid_simples, contexto=contexto).resolver("a_estrela_indexado")
+
+    assert [contexto.estado(no) for no in range(25)] == desenho
+    assert contexto.alteracoes() == set()
+
+
+def test_a_estrela_mede_fila_so_sob_demanda(grid_simples):
+    busca = Buscas(grid_simples)
+    busca.resolver("a_estrela")
+    assert busca.pico_fila == 0
+
+    busca.medir_fila = True
+    busca.resolver("a_estrela")
+    assert busca.pico_fila > 0
@@ -1,9 +1,12 @@
 import pygame
-import random
 
+from game import mapas
 from game.grid import Grid
+from game.render import RenderizadorGrid
 from game.busca import Buscas
-from game.algoritmo_genetico import AlgoritmoGeneticoAStar
+from game.contexto import ContextoBusca
+from game.agendador import AgendadorPassos
+from game.execucao_ag import ExecucaoAG
 
 pygame.init()
 
@@ -15,15 +18,20 @@ LARGURA = COLUNAS * TAM_CELULA
 ALTURA = LINHAS * TAM_CELULA
 
 PROB_OBSTACULO = 0.30
-DELAY_PASSO_MS = 20
+PASSOS_POR_SEGUNDO = 50      # velocidade inicial da animação (+/- ajustam)
+ORCAMENTO_QUADRO_MS = 8      # tempo máximo de busca por quadro
 
 #inicializando o pygame
 screen = pygame.display.set_mode((LARGURA, ALTURA))
 pygame.display.set_caption("IA Aplicada a Jogos - AV2")
 clock = pygame.time.Clock()
+agendador = AgendadorPassos(PASSOS_POR_SEGUNDO, ORCAMENTO_QUADRO_MS)
 
 # ================= GRID =================
 grid = Grid(LINHAS, COLUNAS)
+# estado das buscas (visitados, caminho), desenhado por cima do grid
+contexto = ContextoBusca(grid)
+renderizador = RenderizadorGrid(grid, TAM_CELULA, contexto)
 
 # ================= ETAPAS =================
 ETAPA_INICIO = 0
@@ -37,92 +45,33 @@ busca = None
 gerador = None
 
 # ================= AG =================
-ag = None
-ag_gerador = None
+execucao_ag = None   # AG rodando em segundo plano
 executando_individuo = False
 
 # ================= FUNCOES =================
+def atualizar_titulo():
+    pygame.display.set_caption(
+        f"IA Aplicada a Jogos - AV2 ({agendador.passos_por_segundo:.0f} passos/s)"
+    )
+
 def pos_mouse_para_celula(pos):
     x, y = pos
     return y // TAM_CELULA, x // TAM_CELULA
 
 def limpar_grid():
-    for i in range(LINHAS):
-        for j in range(COLUNAS):
-            grid.celulas[i][j] = 0
+    grid.limpar()
 
 def limpar_visitados():
-    for i in range(LINHAS):
-        for j in range(COLUNAS):
-            if grid.celulas[i][j] >= 4:
-                grid.celulas[i][j] = 0
+    contexto.reiniciar()
 
 def encontrar(valor):
-    for i in range(LINHAS):
-        for j in range(COLUNAS):
-            if grid.celulas[i][j] == valor:
-                return (i, j)
-    return None
-
-# ---------- GERA CAMINHO GARANTIDO ----------
-def gerar_caminho_dfs(inicio, fim):
-    pilha = [inicio]
-    pais = {}
-    visitados = {inicio}
-
-    while pilha:
-        atual = pilha.pop()
-        if atual == fim:
-            break
-
-        i, j = atual
-        vizinhos = []
-        for di, dj in [(-1,0),(1,0),(0,-1),(0,1)]:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < LINHAS and 0 <= nj < COLUNAS:
-                if (ni, nj) not in visitados:
-                    vizinhos.append((ni, nj))
-
-        random.shuffle(vizinhos)
-
-        for v in vizinhos:
-            visitados.add(v)
-            pais[v] = atual
-            pilha.append(v)
-
-    caminho = []
-    atual = fim
-    while atual != inicio:
-        caminho.append(atual)
-        atual = pais.get(atual)
-        if atual is None:
-            return []
-
-    caminho.append(inicio)
-    caminho.reverse()
-    return caminho
+    return grid.encontrar(valor)
 
 def gerar_mapa():
-    inicio = encontrar(2)
-    fim = encontrar(3)
-    if not inicio or not fim:
-        return
-
-    caminho = gerar_caminho_dfs(inicio, fim)
-    caminho_set = set(caminho)
-
-    limpar_grid()
-    grid.add_inicio(*inicio)
-    grid.add_objetivo(*fim)
-
-    for i in range(LINHAS):
-        for j in range(COLUNAS):
-            if (i, j) in caminho_set:
-                continue
-            if random.random() < PROB_OBSTACULO:
-                grid.add_obstaculo(i, j)
+    mapas.gerar_mapa(grid, PROB_OBSTACULO)
 
 # ================= LOOP PRINCIPAL =================
+atualizar_titulo()
 running = True
 while running:
     clock.tick(60)
@@ -138,48 +87,76 @@ while running:
             # RESET
             if event.key == pygame.K_r:
                 grid = Grid(LINHAS, COLUNAS)
+                contexto = ContextoBusca(grid)
+                renderizador = RenderizadorGrid(grid, TAM_CELULA, contexto)
                 etapa_atual = ETAPA_INICIO
                 busca = None
                 gerador = None
-                ag = None
-                ag_gerador = None
+                if execucao_ag is not None:
+                    execucao_ag.cancelar()
+                    execucao_ag = None
+
+            # VELOCIDADE
+            if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                agendador.acelerar()
+                atualizar_titulo()
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                agendador.desacelerar()
+                atualizar_titulo()
 
             # BUSCAS MANUAIS
-            if etapa_atual == ETAPA_GERADO and gerador is None and ag_gerador is None:
+            if etapa_atual == ETAPA_GERADO and gerador is None and execucao_ag is None:
 
                 limpar_visitados()
 
                 if event.key == pygame.K_1:
-                    busca = Buscas(grid)
+                    busca = Buscas(grid, contexto=contexto)
                     busca.valor_caminho = 5  # BFS
                     gerador = busca.bfs()
 
                 elif event.key == pygame.K_2:
-                    busca = Buscas(grid)
+                    busca = Buscas(grid, contexto=contexto)
                     busca.valor_caminho = 6  # DFS
                     gerador = busca.dfs()
 
                 elif event.key == pygame.K_3:
-                    busca = Buscas(grid)
+                    busca = Buscas(grid, contexto=contexto)
                     busca.valor_caminho = 7  # Dijkstra
                     gerador = busca.dijkstra()
 
                 elif event.key == pygame.K_4:
-                    busca = Buscas(grid)
+                    busca = Buscas(grid, contexto=contexto)
                     busca.valor_caminho = 8  # A*
                     gerador = busca.a_estrela()
 
+                elif event.key == pygame.K_5:
+                    busca = Buscas(grid, contexto=contexto)
+                    busca.valor_caminho = 9  # JPS
+                    gerador = busca.jps()
+
+                elif event.key == pygame.K_6:
+                    busca = Buscas(grid, contexto=contexto)
+                    busca.valor_caminho = 5  # BFS bidirecional
+                    gerador = busca.bfs_bidirecional()
+
+                elif event.key == pygame.K_7:
+                    busca = Buscas(grid, contexto=contexto)
+                    busca.valor_caminho = 8  # A* bidirecional
+                    gerador = busca.a_estrela_bidirecional()
+
+                agendador.reiniciar()
+
             # ALGORITMO GENETICO
-            if event.key == pygame.K_g and etapa_atual == ETAPA_GERADO:
+            if event.key == pygame.K_g and etapa_atual == ETAPA_GERADO and execucao_ag is None:
                 busca = None
                 gerador = None
 
-                ag = AlgoritmoGeneticoAStar(
+                execucao_ag = ExecucaoAG(
                     grid,
                     tamanho_pop=8,
                     geracoes=10
                 )
-                ag_gerador = ag.executar_visual()
+                execucao_ag.iniciar()
 
         #clique direito
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
@@ -194,17 +171,14 @@ while running:
                 etapa_atual = ETAPA_OBJETIVO
 
             elif etapa_atual == ETAPA_OBJETIVO:
-                if grid.celulas[lin][col] != 2:
+                if grid.get_celula(lin, col) != 2:
                     grid.add_objetivo(lin, col)
                     gerar_mapa()
                     etapa_atual = ETAPA_GERADO
 
     # ---------- EXECUCAO BUSCAS ----------
-    if gerador is not None:
-        try:
-            next(gerador)
-            pygame.time.delay(DELAY_PASSO_MS)
-        except StopIteration:
+    if gerador is not None and execucao_ag is None:
+        if not agendador.executar(gerador):
             busca.reconstruir_caminho()
             print("FINALIZADO")
             print("Passos:", busca.passos)
@@ -213,34 +187,32 @@ while running:
             gerador = None
 
     # ---------- EXECUCAO AG ----------
-    if ag_gerador is not None:
+    if execucao_ag is not None:
         # ainda executando A* de um individuo
         if gerador is not None:
-            try:
-                next(gerador)
-                pygame.time.delay(DELAY_PASSO_MS)
-            except StopIteration:
+            if not agendador.executar(gerador):
                 busca.reconstruir_caminho()
                 gerador = None
                 executando_individuo = False
 
-        # pega proximo evento do AG
+        # consome os eventos que o AG ja publicou, sem esperar pelos demais
         else:
-            try:
-                evento = next(ag_gerador)
-
+            evento = execucao_ag.proximo_evento()
+            while evento is not None:
                 if evento["tipo"] == "individuo":
                     ind = evento["individuo"]
 
                     limpar_visitados()
 
-                    busca = Buscas(grid)
+                    busca = Buscas(grid, contexto=contexto)
                     busca.valor_caminho = 7 if ind.get("mutou") else 8
                     busca.w_heuristica = ind["w"]
                     busca.custo_movimento = ind["custo"]
 
                     gerador = busca.a_estrela()
+                    agendador.reiniciar()
                     executando_individuo = True
+                    break  # o proximo evento espera a animacao terminar
 
                 elif evento["tipo"] == "melhor":
                     print(
@@ -250,13 +222,19 @@ while running:
                         f"fitness={evento['individuo']['fitness']:.2f}"
                     )
 
-            except StopIteration:
-                ag_gerador = None
-                print("AG FINALIZADO")
+                elif evento["tipo"] == "fim":
+                    execucao_ag = None
+                    print("AG FINALIZADO")
+                    break
+
+                evento = execucao_ag.proximo_evento()
 
     # pygame
     screen.fill((0, 0, 0))
-    grid.draw(screen, TAM_CELULA)
+    renderizador.draw_incremental(screen)
     pygame.display.flip()
 
+if execucao_ag is not None:
+    execucao_ag.encerrar(timeout=1.0)
+
 pygame.quit()
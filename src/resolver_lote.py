@@ -0,0 +1,277 @@
+"""
+Resolve mapas em lote, sem interface gráfica.
+
+Lê mapas de arquivos (ou gera mapas com semente), executa um algoritmo de
+busca ou o A* ajustado pelo Algoritmo Genético em cada um, distribuindo os
+mapas entre processos, e escreve um resultado por mapa em JSONL ou CSV à
+medida que ficam prontos.
+
+Exemplos:
+    python resolver_lote.py mapas/*.txt --algoritmo a_estrela --processos 4
+    python resolver_lote.py --gerar 100 --tamanho 300 --algoritmo ag --formato csv
+    python resolver_lote.py --cenarios arena.map.scen --algoritmo jps
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from game.algoritmo_genetico import AlgoritmoGeneticoAStar
+from game.arquivo_mapa import carregar_mapa, ler_cenarios_movingai, ler_movingai
+from game.busca import Buscas
+from game.mapas import gerar_mapa_aleatorio
+
+ALGORITMOS = list(Buscas.ALGORITMOS_RAPIDOS) + ["ag"]
+
+CAMPOS = [
+    "mapa", "linhas", "colunas", "algoritmo", "encontrado", "comprimento",
+    "custo", "passos", "visitados", "status", "tempo_s", "w", "custo_movimento",
+    "tempo_ajuste_s", "otimo", "erro",
+]
+
+# Mapa a resolver: caminho de arquivo, (linhas, colunas, densidade, semente)
+# ou cenário MovingAI (mapa, inicio, objetivo, otimo)
+Fonte = Union[str, Tuple[int, int, float, int], Dict]
+
+# Configuração enviada uma vez a cada processo trabalhador
+_config: dict = {}
+
+
+def _iniciar_trabalhador(config: dict) -> None:
+    global _config
+    _config = config
+
+
+def _nome(fonte: Fonte) -> str:
+    if isinstance(fonte, str):
+        return fonte
+    if isinstance(fonte, dict):
+        (li, ci), (lo, co) = fonte["inicio"], fonte["objetivo"]
+        return f"{fonte['mapa']}:{li},{ci}->{lo},{co}"
+    linhas, colunas, densidade, semente = fonte
+    return f"gerado:{linhas}x{colunas}:p={densidade}:semente={semente}"
+
+
+def _obter_grid(fonte: Fonte):
+    if isinstance(fonte, str):
+        return carregar_mapa(fonte)
+    if isinstance(fonte, dict):
+        return ler_movingai(fonte["mapa"], fonte["inicio"], fonte["objetivo"])
+    linhas, colunas, densidade, semente = fonte
+    return gerar_mapa_aleatorio(linhas, colunas, densidade, semente)
+
+
+def resolver_mapa(fonte: Fonte, config: Optional[dict] = None) -> dict:
+    """
+    Carrega (ou gera) um mapa e o resolve conforme a configuração.
+
+    :param fonte: Arquivo do mapa ou parâmetros de geração
+    :param config: Algoritmo, orçamento e parâmetros do AG; por padrão, a
+        configuração recebida pelo processo trabalhador
+    :return: Linha de resultado (chaves de CAMPOS)
+    """
+    config = config if config is not None else _config
+    algoritmo = config["algoritmo"]
+    resultado = {"mapa": _nome(fonte), "algoritmo": algoritmo}
+    if isinstance(fonte, dict):
+        resultado["otimo"] = fonte["otimo"]
+
+    try:
+        grid = _obter_grid(fonte)
+    except (OSError, ValueError) as erro:
+        resultado["erro"] = str(erro)
+        return resultado
+
+    resultado["linhas"] = grid.linhas
+    resultado["colunas"] = grid.colunas
+
+    busca = Buscas(grid)
+    if busca.inicio is None or busca.objetivo is None:
+        if isinstance(fonte, str) and fonte.lower().endswith(".map"):
+            # o .map do MovingAI nunca traz início e objetivo
+            resultado["erro"] = "mapa MovingAI sem início ou objetivo: use --cenarios com o .scen"
+        else:
+            resultado["erro"] = "mapa sem início ou objetivo"
+        return resultado
+
+    busca.limite_expansoes = config.get("limite_expansoes")
+    busca.limite_tempo = config.get("limite_tempo")
+
+    nome = algoritmo
+    if algoritmo == "ag":
+        inicio = time.perf_counter()
+        with AlgoritmoGeneticoAStar(
+            grid,
+            tamanho_pop=config["ag_populacao"],
+            geracoes=config["ag_geracoes"],
+            semente=config.get("semente"),
+            limite_expansoes=config.get("limite_expansoes"),
+            limite_tempo=config.get("limite_tempo"),
+        ) as ag:
+            melhor = ag.executar_rapido()
+        resultado["tempo_ajuste_s"] = time.perf_counter() - inicio
+
+        busca.w_heuristica = resultado["w"] = melhor["w"]
+        busca.custo_movimento = resultado["custo_movimento"] = melhor["custo"]
+        nome = "a_estrela"
+
+    inicio = time.perf_counter()
+    solucao = busca.resolver(nome)
+    resultado["tempo_s"] = time.perf_counter() - inicio
+
+    resultado.update(
+        encontrado=solucao["encontrado"],
+        comprimento=len(solucao["caminho"]),
+        custo=solucao["custo"] if solucao["encontrado"] else None,
+        passos=solucao["passos"],
+        visitados=solucao["visitados"],
+        status=solucao["status"],
+    )
+    return resultado
+
+
+def listar_cenarios(caminho: str) -> List[Fonte]:
+    """
+    Lê um arquivo .scen do MovingAI; cada cenário vira uma fonte com o seu
+    mapa, procurado a partir do diretório do .scen (pelo caminho informado
+    no cenário ou, se não existir, só pelo nome do arquivo).
+
+    :param caminho: Arquivo .scen
+    :return: Um cenário por linha do arquivo
+    """
+    diretorio = os.path.dirname(caminho)
+    mapas: Dict[str, str] = {}
+    fontes: List[Fonte] = []
+
+    for cenario in ler_cenarios_movingai(caminho):
+        nome = cenario["mapa"]
+        if nome not in mapas:
+            mapa = os.path.join(diretorio, nome)
+            if not os.path.isfile(mapa):
+                mapa = os.path.join(diretorio, os.path.basename(nome))
+            mapas[nome] = mapa
+        fontes.append(dict(cenario, mapa=mapas[nome]))
+    return fontes
+
+
+def listar_fontes(args) -> List[Fonte]:
+    """
+    Monta a lista de mapas a partir dos arquivos/diretórios e das opções
+    --cenarios e --gerar.
+    """
+    fontes: List[Fonte] = []
+    for caminho in args.mapas:
+        if os.path.isdir(caminho):
+            fontes.extend(
+                os.path.join(caminho, nome) for nome in sorted(os.listdir(caminho))
+                if os.path.isfile(os.path.join(caminho, nome))
+            )
+        else:
+            fontes.append(caminho)
+
+    for caminho in args.cenarios:
+        fontes.extend(listar_cenarios(caminho))
+
+    linhas, colunas = (args.tamanho * 2)[:2]
+    for i in range(args.gerar):
+        fontes.append((linhas, colunas, args.densidade, args.semente + i))
+    return fontes
+
+
+def resolver_todos(fontes: List[Fonte], config: dict, processos: int) -> Iterator[dict]:
+    """
+    Resolve os mapas em ordem, em paralelo quando processos > 1.
+
+    :yield: Um resultado por mapa, assim que fica pronto
+    """
+    if processos <= 1 or len(fontes) <= 1:
+        for fonte in fontes:
+            yield resolver_mapa(fonte, config)
+        return
+
+    with multiprocessing.Pool(
+        processos, initializer=_iniciar_trabalhador, initargs=(config,)
+    ) as pool:
+        yield from pool.imap(resolver_mapa, fontes)
+
+
+def escrever(resultados: Iterable[dict], saida, formato: str) -> int:
+    """
+    Escreve os resultados um a um (JSONL ou CSV), liberando o buffer a cada linha.
+
+    :return: Quantidade de resultados escritos
+    """
+    escritor = None
+    if formato == "csv":
+        escritor = csv.DictWriter(saida, fieldnames=CAMPOS, restval="")
+        escritor.writeheader()
+
+    total = 0
+    for resultado in resultados:
+        if escritor:
+            escritor.writerow(resultado)
+        else:
+            saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        saida.flush()
+        total += 1
+    return total
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("mapas", nargs="*", help="arquivos de mapa ou diretórios")
+    parser.add_argument("--algoritmo", default="a_estrela", choices=ALGORITMOS)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--formato", default="jsonl", choices=["jsonl", "csv"])
+    parser.add_argument("--saida", help="arquivo de saída (padrão: stdout)")
+    parser.add_argument("--cenarios", nargs="+", default=[], metavar="SCEN",
+                        help="cenários MovingAI (.scen): início e objetivo dos mapas .map")
+
+    parser.add_argument("--gerar", type=int, default=0, metavar="N",
+                        help="gera N mapas aleatórios além dos arquivos")
+    parser.add_argument("--tamanho", type=int, nargs="+", default=[100],
+                        metavar="L", help="linhas [colunas] dos mapas gerados")
+    parser.add_argument("--densidade", type=float, default=0.3)
+    parser.add_argument("--semente", type=int, default=0,
+                        help="semente do primeiro mapa gerado e do AG")
+
+    parser.add_argument("--limite-expansoes", type=int)
+    parser.add_argument("--limite-tempo", type=float, help="segundos por busca")
+    parser.add_argument("--ag-populacao", type=int, default=8)
+    parser.add_argument("--ag-geracoes", type=int, default=5)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    fontes = listar_fontes(args)
+    if not fontes:
+        parser.error("informe arquivos de mapa, --cenarios ou --gerar N")
+
+    config = {
+        "algoritmo": args.algoritmo,
+        "limite_expansoes": args.limite_expansoes,
+        "limite_tempo": args.limite_tempo,
+        "ag_populacao": args.ag_populacao,
+        "ag_geracoes": args.ag_geracoes,
+        "semente": args.semente,
+    }
+
+    resultados = resolver_todos(fontes, config, args.processos)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8", newline="") as saida:
+            escrever(resultados, saida, args.formato)
+    else:
+        escrever(resultados, sys.stdout, args.formato)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())